@@ -0,0 +1,25 @@
+"""task version for optimistic concurrency
+
+Revision ID: 2c6f8a0d3e57
+Revises: 9e4b7c2d1a68
+Create Date: 2026-10-19 19:11:52.604118
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "2c6f8a0d3e57"
+down_revision = "9e4b7c2d1a68"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("tasks", sa.Column("version", sa.Integer(), server_default="1", nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column("tasks", "version")
@@ -0,0 +1,28 @@
+"""audit timeline keyset index
+
+Revision ID: 3f9a1c7d2b64
+Revises: ce85f5e97508
+Create Date: 2026-10-19 09:12:31.204117
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3f9a1c7d2b64"
+down_revision = "ce85f5e97508"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_audit_events_actor_created_at_id",
+        "audit_events",
+        ["actor_user_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_audit_events_actor_created_at_id", table_name="audit_events")
@@ -0,0 +1,50 @@
+"""task open dependency count
+
+Revision ID: 4f2b9d6e8a13
+Revises: 7a1d4f9b2c80
+Create Date: 2026-10-19 21:37:08.415276
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "4f2b9d6e8a13"
+down_revision = "7a1d4f9b2c80"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "tasks",
+        sa.Column("open_dependency_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.execute(
+        """
+        UPDATE tasks
+        SET open_dependency_count = counts.n
+        FROM (
+            SELECT d.task_id, count(*) AS n
+            FROM task_dependencies d
+            JOIN tasks dep ON dep.id = d.depends_on_task_id
+            WHERE dep.status <> 'DONE'
+            GROUP BY d.task_id
+        ) AS counts
+        WHERE tasks.id = counts.task_id
+        """
+    )
+    op.create_index(
+        "ix_tasks_workspace_blocked_updated_at",
+        "tasks",
+        ["workspace_id", "updated_at"],
+        unique=False,
+        postgresql_where=sa.text("open_dependency_count > 0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tasks_workspace_blocked_updated_at", table_name="tasks")
+    op.drop_column("tasks", "open_dependency_count")
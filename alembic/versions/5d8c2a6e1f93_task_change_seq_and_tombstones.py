@@ -0,0 +1,65 @@
+"""task change_seq and tombstones
+
+Revision ID: 5d8c2a6e1f93
+Revises: c41d7e9f0a25
+Create Date: 2026-10-19 15:22:09.871546
+
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5d8c2a6e1f93"
+down_revision = "c41d7e9f0a25"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE SEQUENCE task_change_seq")
+    # existing rows are numbered by the column default as it is added
+    op.add_column(
+        "tasks",
+        sa.Column(
+            "change_seq",
+            sa.BigInteger(),
+            server_default=sa.text("nextval('task_change_seq')"),
+            nullable=False,
+        ),
+    )
+    op.create_index(op.f("ix_tasks_change_seq"), "tasks", ["change_seq"], unique=False)
+
+    op.create_table(
+        "task_tombstones",
+        sa.Column("task_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "change_seq",
+            sa.BigInteger(),
+            server_default=sa.text("nextval('task_change_seq')"),
+            nullable=False,
+        ),
+        sa.Column("deleted_by_user_id", sa.Integer(), nullable=True),
+        sa.Column("visible_user_ids", postgresql.ARRAY(sa.Integer()), nullable=False),
+        sa.Column(
+            "deleted_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["deleted_by_user_id"], ["users.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("task_id"),
+    )
+    op.create_index(
+        op.f("ix_task_tombstones_change_seq"), "task_tombstones", ["change_seq"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_task_tombstones_change_seq"), table_name="task_tombstones")
+    op.drop_table("task_tombstones")
+    op.drop_index(op.f("ix_tasks_change_seq"), table_name="tasks")
+    op.drop_column("tasks", "change_seq")
+    op.execute("DROP SEQUENCE task_change_seq")
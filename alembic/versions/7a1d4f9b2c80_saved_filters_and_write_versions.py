@@ -0,0 +1,57 @@
+"""saved filters and workspace write versions
+
+Revision ID: 7a1d4f9b2c80
+Revises: 2c6f8a0d3e57
+Create Date: 2026-10-19 20:02:18.447310
+
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "7a1d4f9b2c80"
+down_revision = "2c6f8a0d3e57"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "saved_filters",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("workspace_id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("definition", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("filter_hash", sa.String(length=64), nullable=False),
+        sa.Column("created_by_user_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["created_by_user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("workspace_id", "name", name="uq_saved_filters_workspace_name"),
+    )
+    op.create_index(
+        "ix_saved_filters_workspace_hash",
+        "saved_filters",
+        ["workspace_id", "filter_hash"],
+        unique=False,
+    )
+    op.create_table(
+        "workspace_write_versions",
+        sa.Column("workspace_id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("version", sa.BigInteger(), server_default="0", nullable=False),
+        sa.PrimaryKeyConstraint("workspace_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("workspace_write_versions")
+    op.drop_index("ix_saved_filters_workspace_hash", table_name="saved_filters")
+    op.drop_table("saved_filters")
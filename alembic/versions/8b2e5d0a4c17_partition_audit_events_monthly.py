@@ -0,0 +1,130 @@
+"""partition audit_events monthly
+
+Revision ID: 8b2e5d0a4c17
+Revises: 3f9a1c7d2b64
+Create Date: 2026-10-19 11:40:02.518934
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8b2e5d0a4c17"
+down_revision = "3f9a1c7d2b64"
+branch_labels = None
+depends_on = None
+
+# months created ahead of now(); the application keeps this window rolling
+MONTHS_AHEAD = 3
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE audit_events RENAME TO audit_events_legacy")
+    op.execute("ALTER INDEX audit_events_pkey RENAME TO audit_events_legacy_pkey")
+    op.drop_index("ix_audit_events_actor_created_at_id", table_name="audit_events_legacy")
+    op.drop_index("ix_audit_events_entity_type", table_name="audit_events_legacy")
+    op.drop_index("ix_audit_events_entity_id", table_name="audit_events_legacy")
+    op.drop_index("ix_audit_events_created_at", table_name="audit_events_legacy")
+    op.drop_index("ix_audit_events_actor_user_id", table_name="audit_events_legacy")
+    op.drop_index("ix_audit_events_action", table_name="audit_events_legacy")
+
+    op.execute(
+        """
+        CREATE TABLE audit_events (
+            id INTEGER NOT NULL DEFAULT nextval('audit_events_id_seq'),
+            actor_user_id INTEGER NOT NULL,
+            entity_type VARCHAR(50) NOT NULL,
+            entity_id INTEGER NOT NULL,
+            action VARCHAR(50) NOT NULL,
+            details TEXT,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            CONSTRAINT audit_events_pkey PRIMARY KEY (id, created_at),
+            CONSTRAINT audit_events_actor_user_id_fkey FOREIGN KEY (actor_user_id) REFERENCES users (id)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.execute("ALTER SEQUENCE audit_events_id_seq OWNED BY audit_events.id")
+    op.create_index(
+        "ix_audit_events_actor_created_at_id",
+        "audit_events",
+        ["actor_user_id", "created_at", "id"],
+        unique=False,
+    )
+    op.execute("CREATE TABLE audit_events_default PARTITION OF audit_events DEFAULT")
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+            m date;
+            last_month date := date_trunc('month', now() AT TIME ZONE 'UTC')::date
+                               + interval '{MONTHS_AHEAD} months';
+        BEGIN
+            SELECT coalesce(
+                date_trunc('month', min(created_at) AT TIME ZONE 'UTC')::date,
+                date_trunc('month', now() AT TIME ZONE 'UTC')::date
+            ) INTO m FROM audit_events_legacy;
+            WHILE m <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF audit_events FOR VALUES FROM (%L) TO (%L)',
+                    'audit_events_p' || to_char(m, 'YYYYMM'),
+                    m::text || ' 00:00:00+00',
+                    (m + interval '1 month')::date::text || ' 00:00:00+00'
+                );
+                m := (m + interval '1 month')::date;
+            END LOOP;
+        END $$
+        """
+    )
+    op.execute(
+        "INSERT INTO audit_events (id, actor_user_id, entity_type, entity_id, action, details, created_at) "
+        "SELECT id, actor_user_id, entity_type, entity_id, action, details, created_at "
+        "FROM audit_events_legacy"
+    )
+    op.drop_table("audit_events_legacy")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE audit_events RENAME TO audit_events_partitioned")
+    op.execute("ALTER INDEX audit_events_pkey RENAME TO audit_events_partitioned_pkey")
+    op.drop_index("ix_audit_events_actor_created_at_id", table_name="audit_events_partitioned")
+
+    op.execute(
+        """
+        CREATE TABLE audit_events (
+            id INTEGER NOT NULL DEFAULT nextval('audit_events_id_seq'),
+            actor_user_id INTEGER NOT NULL,
+            entity_type VARCHAR(50) NOT NULL,
+            entity_id INTEGER NOT NULL,
+            action VARCHAR(50) NOT NULL,
+            details TEXT,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            CONSTRAINT audit_events_pkey PRIMARY KEY (id),
+            CONSTRAINT audit_events_actor_user_id_fkey FOREIGN KEY (actor_user_id) REFERENCES users (id)
+        )
+        """
+    )
+    op.execute("ALTER SEQUENCE audit_events_id_seq OWNED BY audit_events.id")
+    op.execute(
+        "INSERT INTO audit_events (id, actor_user_id, entity_type, entity_id, action, details, created_at) "
+        "SELECT id, actor_user_id, entity_type, entity_id, action, details, created_at "
+        "FROM audit_events_partitioned"
+    )
+    op.drop_table("audit_events_partitioned")
+
+    op.create_index(op.f("ix_audit_events_action"), "audit_events", ["action"], unique=False)
+    op.create_index(
+        op.f("ix_audit_events_actor_user_id"), "audit_events", ["actor_user_id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_audit_events_created_at"), "audit_events", ["created_at"], unique=False
+    )
+    op.create_index(op.f("ix_audit_events_entity_id"), "audit_events", ["entity_id"], unique=False)
+    op.create_index(
+        op.f("ix_audit_events_entity_type"), "audit_events", ["entity_type"], unique=False
+    )
+    op.create_index(
+        "ix_audit_events_actor_created_at_id",
+        "audit_events",
+        ["actor_user_id", "created_at", "id"],
+        unique=False,
+    )
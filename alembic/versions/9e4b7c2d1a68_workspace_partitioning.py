@@ -0,0 +1,111 @@
+"""workspace partitioning
+
+Revision ID: 9e4b7c2d1a68
+Revises: 5d8c2a6e1f93
+Create Date: 2026-10-19 18:04:37.215903
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9e4b7c2d1a68"
+down_revision = "5d8c2a6e1f93"
+branch_labels = None
+depends_on = None
+
+_TABLES = ("users", "tags", "tasks", "task_tombstones", "audit_events")
+
+
+def upgrade() -> None:
+    # existing rows all belong to the default workspace
+    for table in _TABLES:
+        op.add_column(
+            table, sa.Column("workspace_id", sa.Integer(), server_default="1", nullable=False)
+        )
+        op.alter_column(table, "workspace_id", server_default=None)
+
+    op.drop_index("ix_users_email", table_name="users")
+    op.create_unique_constraint("uq_users_workspace_email", "users", ["workspace_id", "email"])
+    op.drop_index("ix_tags_name", table_name="tags")
+    op.create_unique_constraint("uq_tags_workspace_name", "tags", ["workspace_id", "name"])
+
+    op.drop_index("ix_tasks_status_priority", table_name="tasks")
+    op.drop_index("ix_tasks_updated_at", table_name="tasks")
+    op.drop_index("ix_tasks_change_seq", table_name="tasks")
+    op.create_index(
+        "ix_tasks_workspace_status_priority",
+        "tasks",
+        ["workspace_id", "status", "priority"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_tasks_workspace_updated_at", "tasks", ["workspace_id", "updated_at"], unique=False
+    )
+    op.create_index(
+        "ix_tasks_workspace_change_seq", "tasks", ["workspace_id", "change_seq"], unique=False
+    )
+
+    op.drop_index("ix_task_tombstones_change_seq", table_name="task_tombstones")
+    op.create_index(
+        "ix_task_tombstones_workspace_change_seq",
+        "task_tombstones",
+        ["workspace_id", "change_seq"],
+        unique=False,
+    )
+
+    # created on the partitioned parent, so every partition gets them too
+    op.drop_index("ix_audit_events_actor_created_at_id", table_name="audit_events")
+    op.drop_index("ix_audit_events_entity_created_at_id", table_name="audit_events")
+    op.create_index(
+        "ix_audit_events_workspace_actor_created_at_id",
+        "audit_events",
+        ["workspace_id", "actor_user_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_audit_events_workspace_entity_created_at_id",
+        "audit_events",
+        ["workspace_id", "entity_type", "entity_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_audit_events_workspace_entity_created_at_id", table_name="audit_events")
+    op.drop_index("ix_audit_events_workspace_actor_created_at_id", table_name="audit_events")
+    op.create_index(
+        "ix_audit_events_entity_created_at_id",
+        "audit_events",
+        ["entity_type", "entity_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_audit_events_actor_created_at_id",
+        "audit_events",
+        ["actor_user_id", "created_at", "id"],
+        unique=False,
+    )
+
+    op.drop_index("ix_task_tombstones_workspace_change_seq", table_name="task_tombstones")
+    op.create_index(
+        "ix_task_tombstones_change_seq", "task_tombstones", ["change_seq"], unique=False
+    )
+
+    op.drop_index("ix_tasks_workspace_change_seq", table_name="tasks")
+    op.drop_index("ix_tasks_workspace_updated_at", table_name="tasks")
+    op.drop_index("ix_tasks_workspace_status_priority", table_name="tasks")
+    op.create_index("ix_tasks_change_seq", "tasks", ["change_seq"], unique=False)
+    op.create_index("ix_tasks_updated_at", "tasks", ["updated_at"], unique=False)
+    op.create_index("ix_tasks_status_priority", "tasks", ["status", "priority"], unique=False)
+
+    # fails if the same name or email now exists in more than one workspace
+    op.drop_constraint("uq_tags_workspace_name", "tags", type_="unique")
+    op.create_index("ix_tags_name", "tags", ["name"], unique=True)
+    op.drop_constraint("uq_users_workspace_email", "users", type_="unique")
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    for table in reversed(_TABLES):
+        op.drop_column(table, "workspace_id")
@@ -0,0 +1,37 @@
+"""task change xid
+
+Revision ID: b7e3c1a9d5f2
+Revises: 4f2b9d6e8a13
+Create Date: 2026-10-19 23:12:41.630518
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b7e3c1a9d5f2"
+down_revision = "4f2b9d6e8a13"
+branch_labels = None
+depends_on = None
+
+_WRITER_XID = sa.text("pg_current_xact_id()::text::bigint")
+
+
+def upgrade() -> None:
+    # existing rows get this migration's xid, which no later snapshot sees as in flight
+    for table in ("tasks", "task_tombstones"):
+        op.add_column(
+            table,
+            sa.Column("change_xid", sa.BigInteger(), server_default=_WRITER_XID, nullable=False),
+        )
+        op.create_index(
+            f"ix_{table}_workspace_change_xid", table, ["workspace_id", "change_xid"], unique=False
+        )
+
+
+def downgrade() -> None:
+    for table in ("task_tombstones", "tasks"):
+        op.drop_index(f"ix_{table}_workspace_change_xid", table_name=table)
+        op.drop_column(table, "change_xid")
@@ -0,0 +1,28 @@
+"""audit entity history index
+
+Revision ID: c41d7e9f0a25
+Revises: 8b2e5d0a4c17
+Create Date: 2026-10-19 13:05:47.330182
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c41d7e9f0a25"
+down_revision = "8b2e5d0a4c17"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_audit_events_entity_created_at_id",
+        "audit_events",
+        ["entity_type", "entity_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_audit_events_entity_created_at_id", table_name="audit_events")
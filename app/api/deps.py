@@ -6,17 +6,14 @@ from jose import JWTError, jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.models.enums import UserRole
 from app.repositories.user_repo import UserRepository
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db),
-):
+async def _load_user(token: str, db: AsyncSession):
     try:
         payload = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
         sub = payload.get("sub")
@@ -25,16 +22,33 @@ async def get_current_user(
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
         user_id = int(sub)
         user_role = UserRole(role)
-    except (JWTError, ValueError):
+        workspace_id = int(payload.get("ws", settings.default_workspace_id))
+    except (JWTError, ValueError, TypeError):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
-    repo = UserRepository(db)
+    # the session is already bound to this workspace's database (see request_workspace_id)
+    repo = UserRepository(db, workspace_id)
     user = await repo.get_by_id(user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
     return user
 
 
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db),
+):
+    return await _load_user(token, db)
+
+
+async def get_current_reader(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_read_db),
+):
+    # same as get_current_user, on the read session so read-only routes use one connection
+    return await _load_user(token, db)
+
+
 def require_roles(*roles: UserRole):
     async def _dep(user=Depends(get_current_user)):
         if user.role not in roles:
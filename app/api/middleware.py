@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from http.cookies import SimpleCookie
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.db.session import READ_AFTER_COOKIE
+
+
+class ReadAfterWriteMiddleware:
+    """Hands clients that just committed a marker so their next reads avoid a stale replica."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_marker(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # set by get_db once the request's transaction has committed: the
+                # primary's WAL position after the commit
+                read_after = scope.get("state", {}).get("read_after")
+                if read_after is not None:
+                    cookie = SimpleCookie()
+                    cookie[READ_AFTER_COOKIE] = str(read_after)
+                    morsel = cookie[READ_AFTER_COOKIE]
+                    morsel["path"] = "/"
+                    morsel["max-age"] = settings.read_after_write_window_seconds
+                    morsel["httponly"] = True
+                    morsel["samesite"] = "lax"
+                    headers = list(message.get("headers", []))
+                    headers.append((b"set-cookie", morsel.OutputString().encode("latin-1")))
+                    message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_marker)
@@ -2,26 +2,81 @@ from __future__ import annotations
 
 from datetime import date
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, Response
 
-from app.api.deps import get_current_user
-from app.db.session import get_db
+from app.api.deps import get_current_reader
+from app.core.cache import SingleFlightCache
+from app.core.config import settings
+from app.db.session import ReadSessionFactory, get_read_sessionmaker
 from app.schemas.task import AnalyticsDistributionItem
 from app.services.task_service import TaskService
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
+analytics_cache = SingleFlightCache(
+    ttl=settings.analytics_cache_ttl_seconds,
+    stale_ttl=settings.analytics_cache_stale_seconds,
+)
+
+CACHE_CONTROL = (
+    f"private, max-age={settings.analytics_cache_ttl_seconds}, "
+    f"stale-while-revalidate={settings.analytics_cache_stale_seconds}"
+)
+
+
+def _loader(session_factory: ReadSessionFactory, workspace_id: int, today: date):
+    # runs on its own session: the result is shared by every waiting request
+    # and may be refreshed in the background after the caller has returned
+    async def load() -> list[AnalyticsDistributionItem]:
+        async with session_factory(workspace_id=workspace_id) as session:
+            rows = await TaskService(session, workspace_id).analytics_distribution(today=today)
+        return [AnalyticsDistributionItem(**r) for r in rows]
+
+    return load
+
+
+async def _cached_distribution(
+    session_factory: ReadSessionFactory,
+    workspace_id: int,
+) -> list[AnalyticsDistributionItem]:
+    # both endpoints serve the same aggregate, so they share one entry and one load
+    today = date.today()
+    return await analytics_cache.get_or_load(
+        (workspace_id, today), _loader(session_factory, workspace_id, today)
+    )
+
+
+async def refresh_analytics_cache(session_factory: ReadSessionFactory) -> None:
+    """Scheduled rebuild so requests keep hitting fresh entries instead of loading on a miss.
+
+    Only entries read while they could still be served are rebuilt; the others expire, so
+    a workspace nobody looks at stops costing a query per worker and tick.
+    """
+    today = date.today()
+    recently_read = analytics_cache.keys_read_within(
+        settings.analytics_cache_ttl_seconds + settings.analytics_cache_stale_seconds
+    )
+    for workspace_id in sorted({workspace_id for workspace_id, _ in recently_read}):
+        await analytics_cache.refresh(
+            (workspace_id, today), _loader(session_factory, workspace_id, today)
+        )
+
 
 @router.get("/task-distribution", response_model=list[AnalyticsDistributionItem])
-async def task_distribution(db: AsyncSession = Depends(get_db), me=Depends(get_current_user)):
-    service = TaskService(db)
-    rows = await service.analytics_distribution(today=date.today())
-    return [AnalyticsDistributionItem(**r) for r in rows]
+async def task_distribution(
+    response: Response,
+    session_factory: ReadSessionFactory = Depends(get_read_sessionmaker),
+    me=Depends(get_current_reader),
+):
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return await _cached_distribution(session_factory, me.workspace_id)
 
 
 @router.get("/overdue", response_model=list[AnalyticsDistributionItem])
-async def overdue(db: AsyncSession = Depends(get_db), me=Depends(get_current_user)):
-    service = TaskService(db)
-    rows = await service.analytics_distribution(today=date.today())
-    return [AnalyticsDistributionItem(**r) for r in rows]
+async def overdue(
+    response: Response,
+    session_factory: ReadSessionFactory = Depends(get_read_sessionmaker),
+    me=Depends(get_current_reader),
+):
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return await _cached_distribution(session_factory, me.workspace_id)
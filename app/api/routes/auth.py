@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.db.session import get_db, request_workspace_id
 from app.schemas.user import TokenOut, UserCreate, UserOut
 from app.services.auth_service import AuthService
 
@@ -12,8 +12,8 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/register", response_model=UserOut)
-async def register(payload: UserCreate, db: AsyncSession = Depends(get_db)):
-    service = AuthService(db)
+async def register(payload: UserCreate, request: Request, db: AsyncSession = Depends(get_db)):
+    service = AuthService(db, request_workspace_id(request))
     user = await service.register(
         email=payload.email,
         password=payload.password,
@@ -25,7 +25,11 @@ async def register(payload: UserCreate, db: AsyncSession = Depends(get_db)):
 
 
 @router.post("/token", response_model=TokenOut)
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
-    service = AuthService(db)
+async def login(
+    request: Request,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_db),
+):
+    service = AuthService(db, request_workspace_id(request))
     token = await service.authenticate(email=form_data.username, password=form_data.password)
     return TokenOut(access_token=token)
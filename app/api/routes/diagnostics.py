@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.api.deps import require_roles
+from app.core.config import settings
+from app.db.session import engine, replica_engine, shard_router
+from app.models.enums import UserRole
+from app.repositories.filter_shapes import filter_statements
+from app.schemas.diagnostics import (
+    FilterStatementCacheOut,
+    PoolDiagnosticsOut,
+    PoolSettingsOut,
+    PoolStatsOut,
+)
+
+router = APIRouter(prefix="/diagnostics", tags=["diagnostics"])
+
+
+def _pool_stats(name: str, pool_engine: AsyncEngine) -> PoolStatsOut:
+    pool = pool_engine.pool
+    stats = pool.stats
+    return PoolStatsOut(
+        name=name,
+        url=pool_engine.url.render_as_string(hide_password=True),
+        checked_out=pool.checkedout(),
+        checked_in=pool.checkedin(),
+        overflow=max(pool.overflow(), 0),
+        max_in_use=stats.max_in_use,
+        checkouts=stats.checkouts,
+        overflow_events=stats.overflow_events,
+        timeouts=stats.timeouts,
+        wait_seconds_total=stats.wait_seconds_total,
+        wait_seconds_max=stats.wait_seconds_max,
+        wait_seconds_p50=stats.wait_percentile(50),
+        wait_seconds_p95=stats.wait_percentile(95),
+        wait_seconds_p99=stats.wait_percentile(99),
+    )
+
+
+@router.get("/pool", response_model=PoolDiagnosticsOut)
+async def pool_diagnostics(me=Depends(require_roles(UserRole.ADMIN))):
+    pools = [_pool_stats("primary", engine)]
+    if replica_engine is not None:
+        pools.append(_pool_stats("replica", replica_engine))
+    # the first is the primary engine, which workspaces without their own database use
+    pools.extend(_pool_stats("shard", shard) for shard in shard_router.engines()[1:])
+    return PoolDiagnosticsOut(
+        settings=PoolSettingsOut(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout_seconds=settings.db_pool_timeout_seconds,
+            pool_recycle_seconds=settings.db_pool_recycle_seconds,
+            pool_pre_ping=settings.db_pool_pre_ping,
+            prepared_statement_cache_size=settings.db_prepared_statement_cache_size,
+            statement_cache_size=settings.db_statement_cache_size,
+        ),
+        pools=pools,
+    )
+
+
+@router.get("/filter-statements", response_model=FilterStatementCacheOut)
+async def filter_statement_cache(me=Depends(require_roles(UserRole.ADMIN))):
+    return FilterStatementCacheOut(
+        size=filter_statements.size,
+        max_size=filter_statements.max_size,
+        hits=filter_statements.hits,
+        misses=filter_statements.misses,
+        hit_ratio=filter_statements.hit_ratio,
+    )
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_reader, get_current_user
+from app.api.serialization import json_response, task_payload
+from app.core.cache import SingleFlightCache
+from app.core.config import settings
+from app.core.query_budget import query_budget
+from app.db.session import get_db, get_read_db
+from app.models.enums import UserRole
+from app.schemas.saved_filter import SavedFilterCreate, SavedFilterOut
+from app.schemas.task import TaskFilterResponse
+from app.services.saved_filter_service import SavedFilterService
+
+router = APIRouter(prefix="/filters", tags=["filters"])
+
+# first pages of saved filters, keyed by the workspace write version: any task write
+# moves the version on, so entries never need explicit invalidation
+saved_filter_cache = SingleFlightCache(ttl=settings.saved_filter_cache_ttl_seconds)
+
+
+@router.post("", response_model=SavedFilterOut)
+async def create_filter(
+    payload: SavedFilterCreate,
+    db: AsyncSession = Depends(get_db),
+    me=Depends(get_current_user),
+):
+    saved = await SavedFilterService(db, me.workspace_id).create(
+        name=payload.name, f=payload.filter, user_id=me.id
+    )
+    await db.commit()
+    return saved
+
+
+@router.get("", response_model=list[SavedFilterOut])
+async def list_filters(db: AsyncSession = Depends(get_read_db), me=Depends(get_current_reader)):
+    return await SavedFilterService(db, me.workspace_id).list()
+
+
+@router.delete("/{filter_id}")
+async def delete_filter(
+    filter_id: int,
+    db: AsyncSession = Depends(get_db),
+    me=Depends(get_current_user),
+):
+    await SavedFilterService(db, me.workspace_id).delete(
+        filter_id=filter_id, user_id=me.id, role=me.role
+    )
+    await db.commit()
+    return {"deleted": True}
+
+
+@router.get(
+    "/{filter_id}/tasks", response_model=TaskFilterResponse, dependencies=[Depends(query_budget(8))]
+)
+async def run_filter(
+    filter_id: int,
+    page: int = Query(default=1, ge=1),
+    page_size: int = Query(default=20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+    me=Depends(get_current_reader),
+):
+    service = SavedFilterService(db, me.workspace_id)
+    saved = await service.get(filter_id)
+
+    async def results() -> dict:
+        tasks, total = await service.run(
+            saved, page=page, page_size=page_size, user_id=me.id, role=me.role
+        )
+        return {
+            "items": [task_payload(t) for t in tasks],
+            "page": page,
+            "page_size": page_size,
+            "total": total,
+        }
+
+    if page != 1:
+        return json_response(await results(), headers={"X-Cache": "BYPASS"})
+
+    missed = False
+
+    async def load() -> dict:
+        nonlocal missed
+        missed = True
+        return await results()
+
+    # read before the results, on the same session: the cached page is never older than its key
+    version = await service.write_version()
+    scope = None if me.role == UserRole.ADMIN else me.id
+    key = (me.workspace_id, saved.filter_hash, scope, page_size, version)
+    content = await saved_filter_cache.get_or_load(key, load)
+    return json_response(content, headers={"X-Cache": "MISS" if missed else "HIT"})
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from datetime import date
+
+from fastapi import APIRouter, Depends, Query, Request
+
+from app.api.deps import get_current_reader
+from app.api.serialization import json_response, task_payload
+from app.core.query_budget import query_budget
+from app.db.session import ReadSessionFactory, get_read_sessionmaker, read_after_marker
+from app.schemas.audit import AuditEventOut
+from app.schemas.dashboard import DashboardOut
+from app.services.dashboard_service import DashboardService
+
+router = APIRouter(prefix="/me", tags=["me"])
+
+
+def _tasks_section(section) -> dict:
+    tasks, has_more = section
+    return {"items": [task_payload(t) for t in tasks], "has_more": has_more}
+
+
+@router.get("/dashboard", response_model=DashboardOut, dependencies=[Depends(query_budget(16))])
+async def my_dashboard(
+    request: Request,
+    limit: int = Query(default=10, ge=1, le=50),
+    session_factory: ReadSessionFactory = Depends(get_read_sessionmaker),
+    me=Depends(get_current_reader),
+):
+    service = DashboardService(
+        session_factory, me.workspace_id, read_after=read_after_marker(request)
+    )
+    sections = await service.for_user(user_id=me.id, limit=limit, today=date.today())
+
+    events, more_events = sections["recent"]
+    total, counts = sections["distribution"]
+    return json_response(
+        {
+            "assigned": _tasks_section(sections["assigned"]),
+            "overdue": _tasks_section(sections["overdue"]),
+            "blocked": _tasks_section(sections["blocked"]),
+            "recent": {
+                "items": [AuditEventOut.model_validate(e).model_dump() for e in events],
+                "has_more": more_events,
+            },
+            "distribution": {
+                "total": total,
+                **{
+                    facet: [{"value": value, "count": n} for value, n in values]
+                    for facet, values in counts.items()
+                },
+            },
+        }
+    )
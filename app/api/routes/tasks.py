@@ -1,151 +1,288 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import date
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
-from app.db.session import get_db
+from app.api.deps import get_current_reader, get_current_user
+from app.api.serialization import json_response, task_etag, task_payload
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.query_budget import query_budget
+from app.db.session import get_db, get_read_db
 from app.models.enums import UserRole
+from app.models.task import Task
+from app.repositories.task_repo import ChangeCursor
+from app.schemas.audit import AuditEventPage
 from app.schemas.task import (
     BulkTaskUpdateRequest,
     BulkTaskUpdateResult,
     DependencyUpsert,
+    TaskChangesResponse,
     TaskCreate,
+    TaskFacetsRequest,
+    TaskFacetsResponse,
     TaskFilter,
     TaskFilterResponse,
+    TaskMove,
     TaskOut,
     TaskUpdate,
 )
+from app.services.task_events import task_event_hubs
 from app.services.task_service import TaskService
+from app.services.timeline_service import TimelineService
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 
-def to_task_out(task) -> TaskOut:
-    assignees = [l.user_id for l in task.user_links if l.role.value == "ASSIGNEE"]
-    collabs = [l.user_id for l in task.user_links if l.role.value == "COLLABORATOR"]
-    tags = [tl.tag.name for tl in task.tags]
-    deps = [d.depends_on_task_id for d in task.dependencies]
-    return TaskOut(
-        id=task.id,
-        title=task.title,
-        description=task.description,
-        status=task.status,
-        priority=task.priority,
-        due_date=task.due_date,
-        is_archived=task.is_archived,
-        parent_task_id=task.parent_task_id,
-        created_by_user_id=task.created_by_user_id,
-        created_at=task.created_at,
-        updated_at=task.updated_at,
-        assignees=assignees,
-        collaborators=collabs,
-        tags=tags,
-        dependencies=deps,
-    )
+def if_match_version(if_match: str | None = Header(default=None)) -> int | None:
+    """The task version named by an If-Match header (as sent back from ETag); ``*`` matches any."""
+    if if_match is None or if_match.strip() == "*":
+        return None
+    tag = if_match.strip().removeprefix("W/").strip('"')
+    try:
+        return int(tag)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid If-Match header") from None
+
+
+def _task_response(task: Task) -> Response:
+    return json_response(task_payload(task), headers={"ETag": task_etag(task)})
+
 
-@router.patch("/bulk", response_model=BulkTaskUpdateResult)
+@router.patch("/bulk", response_model=BulkTaskUpdateResult, dependencies=[Depends(query_budget(11))])
 async def bulk_update(
     payload: BulkTaskUpdateRequest,
     db: AsyncSession = Depends(get_db),
     me=Depends(get_current_user),
 ):
-    service = TaskService(db)
-    updated_ids = await service.bulk_update(
-        updates=[(u.id, u.patch) for u in payload.updates],
+    service = TaskService(db, me.workspace_id)
+    versions = await service.bulk_update(
+        updates=[(u.id, u.patch, u.expected_version) for u in payload.updates],
         user_id=me.id,
         role=me.role,
     )
     await db.commit()
-    return BulkTaskUpdateResult(updated_ids=updated_ids)
+    return BulkTaskUpdateResult(updated_ids=list(versions), versions=versions)
 
 
-@router.post("/filter", response_model=TaskFilterResponse)
+@router.post("/filter", response_model=TaskFilterResponse, dependencies=[Depends(query_budget(8))])
 async def filter_tasks(
     f: TaskFilter,
-    db: AsyncSession = Depends(get_db),
-    me=Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    me=Depends(get_current_reader),
+):
+    service = TaskService(db, me.workspace_id)
+    tasks, total = await service.filter_tasks(f=f, user_id=me.id, role=me.role)
+    return json_response(
+        {
+            "items": [task_payload(t) for t in tasks],
+            "page": f.page,
+            "page_size": f.page_size,
+            "total": total,
+        }
+    )
+
+
+@router.post("/facets", response_model=TaskFacetsResponse, dependencies=[Depends(query_budget(8))])
+async def task_facets(
+    f: TaskFacetsRequest,
+    db: AsyncSession = Depends(get_read_db),
+    me=Depends(get_current_reader),
+):
+    service = TaskService(db, me.workspace_id)
+    total, counts, items = await service.facets(f=f, user_id=me.id, role=me.role)
+    return json_response(
+        {
+            "total": total,
+            "facets": {
+                name: [{"value": value, "count": n} for value, n in values]
+                for name, values in counts.items()
+            },
+            "items": None if items is None else [task_payload(t) for t in items],
+        }
+    )
+
+
+@router.get("/changes", response_model=TaskChangesResponse, dependencies=[Depends(query_budget(8))])
+async def task_changes(
+    since: str | None = None,
+    limit: int = Query(default=200, ge=1, le=1000),
+    db: AsyncSession = Depends(get_read_db),
+    me=Depends(get_current_reader),
 ):
-    service = TaskService(db)
-    tasks, total = await service.tasks.filter_tasks(
-        f=f,
-        accessible_task_ids_subq=(
-            await service.tasks.accessible_task_ids_for_user(me.id)
-            if me.role != UserRole.ADMIN
-            else __import__("sqlalchemy")
-            .select(__import__("app.models.task", fromlist=["Task"]).Task.id)
-            .subquery()
-        ),
+    cursor = ChangeCursor(seq=0)
+    if since is not None:
+        seq, xmax, in_flight = decode_cursor(since, size=3)
+        if not isinstance(in_flight, list) or not all(
+            isinstance(v, int) for v in (seq, xmax, *in_flight)
+        ):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        cursor = ChangeCursor(seq=seq, xmax=xmax, in_flight=tuple(in_flight))
+    service = TaskService(db, me.workspace_id)
+    tasks, tombstones, next_cursor, has_more = await service.changes_since(
+        since=cursor, limit=limit, user_id=me.id, role=me.role
     )
-    return TaskFilterResponse(
-        items=[to_task_out(t) for t in tasks],
-        page=f.page,
-        page_size=f.page_size,
-        total=total,
+    return json_response(
+        {
+            "items": [task_payload(t) for t in tasks],
+            "tombstones": [t.model_dump() for t in tombstones],
+            "next_cursor": encode_cursor(
+                next_cursor.seq, next_cursor.xmax, list(next_cursor.in_flight)
+            ),
+            "has_more": has_more,
+        }
     )
 
 
-@router.post("", response_model=TaskOut)
+SSE_KEEPALIVE_SECONDS = 15
+
+
+@router.get("/stream")
+async def stream_task_changes(request: Request, me=Depends(get_current_reader)):
+    # the request session is closed once this returns; the stream itself never touches the DB
+    user_id, is_admin, workspace_id = me.id, me.role == UserRole.ADMIN, me.workspace_id
+    hub = task_event_hubs.for_workspace(workspace_id)
+
+    async def events():
+        async with hub.subscribe(user_id=user_id, is_admin=is_admin, workspace_id=workspace_id) as queue:
+            yield b"retry: 3000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                yield b"event: task\ndata: " + message + b"\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("", response_model=TaskOut, dependencies=[Depends(query_budget(18))])
 async def create_task(
     payload: TaskCreate,
     db: AsyncSession = Depends(get_db),
     me=Depends(get_current_user),
 ):
-    service = TaskService(db)
+    service = TaskService(db, me.workspace_id)
     task = await service.create_task(data=payload, user_id=me.id)
     await db.commit()
-    return to_task_out(task)
+    return _task_response(task)
 
-@router.get("/{task_id}", response_model=TaskOut)
+@router.get("/{task_id}", response_model=TaskOut, dependencies=[Depends(query_budget(6))])
 async def get_task(
     task_id: int,
     db: AsyncSession = Depends(get_db),
     me=Depends(get_current_user),
 ):
-    service = TaskService(db)
+    service = TaskService(db, me.workspace_id)
     task = await service.get_task(task_id=task_id, user_id=me.id, role=me.role)
-    return to_task_out(task)
+    return _task_response(task)
+
+
+@router.get("/{task_id}/history", response_model=AuditEventPage, dependencies=[Depends(query_budget(8))])
+async def task_history(
+    task_id: int,
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_read_db),
+    me=Depends(get_current_reader),
+):
+    service = TaskService(db, me.workspace_id)
+    await service.get_task(task_id=task_id, user_id=me.id, role=me.role)
+    return await TimelineService(db, me.workspace_id).for_task(task_id=task_id, limit=limit, cursor=cursor)
 
 
-@router.patch("/{task_id}", response_model=TaskOut)
+@router.patch("/{task_id}", response_model=TaskOut, dependencies=[Depends(query_budget(16))])
 async def update_task(
     task_id: int,
     patch: TaskUpdate,
+    expected_version: int | None = Depends(if_match_version),
     db: AsyncSession = Depends(get_db),
     me=Depends(get_current_user),
 ):
-    service = TaskService(db)
-    task = await service.update_task(task_id=task_id, patch=patch, user_id=me.id, role=me.role)
+    service = TaskService(db, me.workspace_id)
+    task = await service.update_task(
+        task_id=task_id,
+        patch=patch,
+        user_id=me.id,
+        role=me.role,
+        expected_version=expected_version,
+    )
     await db.commit()
-    return to_task_out(task)
+    return _task_response(task)
 
 
-@router.patch("/{task_id}/archive", response_model=TaskOut)
+@router.patch("/{task_id}/archive", response_model=TaskOut, dependencies=[Depends(query_budget(14))])
 async def archive_task(
     task_id: int,
+    expected_version: int | None = Depends(if_match_version),
     db: AsyncSession = Depends(get_db),
     me=Depends(get_current_user),
 ):
-    service = TaskService(db)
+    service = TaskService(db, me.workspace_id)
     task = await service.archive_task(
         task_id=task_id,
         user_id=me.id,
         role=me.role,
+        expected_version=expected_version,
+    )
+    await db.commit()
+    return _task_response(task)
+
+
+@router.patch("/{task_id}/restore", response_model=TaskOut, dependencies=[Depends(query_budget(14))])
+async def restore_task(
+    task_id: int,
+    expected_version: int | None = Depends(if_match_version),
+    db: AsyncSession = Depends(get_db),
+    me=Depends(get_current_user),
+):
+    service = TaskService(db, me.workspace_id)
+    task = await service.restore_task(
+        task_id=task_id,
+        user_id=me.id,
+        role=me.role,
+        expected_version=expected_version,
+    )
+    await db.commit()
+    return _task_response(task)
+
+
+@router.patch("/{task_id}/move", response_model=TaskOut, dependencies=[Depends(query_budget(14))])
+async def move_task(
+    task_id: int,
+    payload: TaskMove,
+    expected_version: int | None = Depends(if_match_version),
+    db: AsyncSession = Depends(get_db),
+    me=Depends(get_current_user),
+):
+    service = TaskService(db, me.workspace_id)
+    task = await service.move_task(
+        task_id=task_id,
+        parent_task_id=payload.parent_task_id,
+        user_id=me.id,
+        role=me.role,
+        expected_version=expected_version,
     )
     await db.commit()
-    return to_task_out(task)
+    return _task_response(task)
 
 
-@router.post("/{task_id}/dependencies", response_model=TaskOut)
+@router.post("/{task_id}/dependencies", response_model=TaskOut, dependencies=[Depends(query_budget(19))])
 async def set_dependencies(
     task_id: int,
     payload: DependencyUpsert,
     db: AsyncSession = Depends(get_db),
     me=Depends(get_current_user),
 ):
-    service = TaskService(db)
+    service = TaskService(db, me.workspace_id)
     task = await service.set_dependencies(
         task_id=task_id,
         depends_on_ids=payload.depends_on_task_ids,
@@ -153,16 +290,16 @@ async def set_dependencies(
         role=me.role,
     )
     await db.commit()
-    return to_task_out(task)
+    return _task_response(task)
 
 
-@router.delete("/{task_id}")
+@router.delete("/{task_id}", dependencies=[Depends(query_budget(14))])
 async def delete_task(
     task_id: int,
     db: AsyncSession = Depends(get_db),
     me=Depends(get_current_user),
 ):
-    service = TaskService(db)
+    service = TaskService(db, me.workspace_id)
     await service.delete_task(task_id=task_id, user_id=me.id, role=me.role)
     await db.commit()
     return {"deleted": True}
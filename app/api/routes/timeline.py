@@ -3,20 +3,31 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
-from app.db.session import get_db
-from app.schemas.audit import AuditEventOut
+from app.api.deps import get_current_reader
+from app.core.query_budget import query_budget
+from app.db.session import get_read_db
+from app.schemas.audit import AuditEventPage
 from app.services.timeline_service import TimelineService
 
 router = APIRouter(prefix="/timeline", tags=["timeline"])
 
 
-@router.get("", response_model=list[AuditEventOut])
+@router.get("", response_model=AuditEventPage, dependencies=[Depends(query_budget(4))])
 async def my_timeline(
     days: int = Query(default=7, ge=1, le=90),
-    db: AsyncSession = Depends(get_db),
-    me=Depends(get_current_user),
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = None,
+    entity_type: str | None = Query(default=None, max_length=50),
+    action: str | None = Query(default=None, max_length=50),
+    db: AsyncSession = Depends(get_read_db),
+    me=Depends(get_current_reader),
 ):
-    svc = TimelineService(db)
-    events = await svc.for_user(user_id=me.id, days=days)
-    return events
+    svc = TimelineService(db, me.workspace_id)
+    return await svc.for_user(
+        user_id=me.id,
+        days=days,
+        limit=limit,
+        cursor=cursor,
+        entity_type=entity_type,
+        action=action,
+    )
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+from fastapi import Response
+
+from app.models.enums import TaskUserRole
+from app.models.task import Task
+from app.schemas.task import TaskOut
+
+# matches Pydantic's JSON output for aware UTC datetimes ("...Z")
+_ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+_TASK_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "status",
+    "priority",
+    "due_date",
+    "is_archived",
+    "parent_task_id",
+    "created_by_user_id",
+    "created_at",
+    "updated_at",
+    "version",
+    "open_dependency_count",
+    "is_blocked",
+    "assignees",
+    "collaborators",
+    "tags",
+    "dependencies",
+)
+
+
+def _check_task_schema() -> None:
+    # task_payload bypasses TaskOut validation, so the two must not drift apart
+    if set(_TASK_FIELDS) != set(TaskOut.model_fields):
+        raise RuntimeError(
+            "task_payload is out of sync with TaskOut: "
+            f"{sorted(set(_TASK_FIELDS) ^ set(TaskOut.model_fields))}"
+        )
+
+
+_check_task_schema()
+
+
+def task_payload(task: Task) -> dict[str, Any]:
+    """A loaded task as an orjson-encodable dict shaped exactly like ``TaskOut``."""
+    assignees: list[int] = []
+    collaborators: list[int] = []
+    for link in task.user_links:
+        (assignees if link.role == TaskUserRole.ASSIGNEE else collaborators).append(link.user_id)
+    return {
+        "id": task.id,
+        "title": task.title,
+        "description": task.description,
+        "status": task.status.value,
+        "priority": task.priority.value,
+        "due_date": task.due_date,
+        "is_archived": task.is_archived,
+        "parent_task_id": task.parent_task_id,
+        "created_by_user_id": task.created_by_user_id,
+        "created_at": task.created_at,
+        "updated_at": task.updated_at,
+        "version": task.version,
+        "open_dependency_count": task.open_dependency_count,
+        "is_blocked": task.is_blocked,
+        "assignees": assignees,
+        "collaborators": collaborators,
+        "tags": [link.tag.name for link in task.tags],
+        "dependencies": [d.depends_on_task_id for d in task.dependencies],
+    }
+
+
+def task_etag(task: Task) -> str:
+    return f'"{task.version}"'
+
+
+def json_response(
+    content: Any, *, status_code: int = 200, headers: dict[str, str] | None = None
+) -> Response:
+    """Pre-encoded JSON. FastAPI skips response_model validation for Response objects,
+    while the route's response_model still documents the shape in OpenAPI."""
+    return Response(
+        orjson.dumps(content, option=_ORJSON_OPTIONS),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
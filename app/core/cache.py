@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(slots=True)
+class _Entry:
+    value: Any
+    fresh_until: float
+    stale_until: float
+    # last time a reader asked for it; refreshes do not count
+    read_at: float
+
+
+class SingleFlightCache:
+    """In-process TTL cache with single-flight loading and stale-while-revalidate.
+
+    Concurrent misses for the same key share one loader call. Once an entry is
+    past its TTL it is still served for ``stale_ttl`` seconds while a single
+    background refresh replaces it.
+    """
+
+    def __init__(
+        self, *, ttl: float, stale_ttl: float = 0.0, clock: Callable[[], float] = time.monotonic
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.clock = clock
+        self._entries: dict[Hashable, _Entry] = {}
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        now = self.clock()
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.read_at = now
+            if now < entry.fresh_until:
+                return entry.value
+            if now < entry.stale_until:
+                self._start_load(key, loader)
+                return entry.value
+
+        # shield so a cancelled caller does not abort the load for the others
+        value = await asyncio.shield(self._start_load(key, loader))
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.read_at = now
+        return value
+
+    async def refresh(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Reloads ``key`` now; readers keep getting the current entry until it lands."""
+        return await asyncio.shield(self._start_load(key, loader))
+
+    def keys(self) -> list[Hashable]:
+        return list(self._entries)
+
+    def keys_read_within(self, seconds: float) -> list[Hashable]:
+        """Keys some reader asked for in the last ``seconds``: the ones worth refreshing."""
+        since = self.clock() - seconds
+        return [key for key, entry in self._entries.items() if entry.read_at >= since]
+
+    def invalidate(self, key: Hashable | None = None) -> None:
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def _start_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, loader))
+            task.add_done_callback(_consume_exception)
+            self._inflight[key] = task
+        return task
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await loader()
+            now = self.clock()
+            self._prune(now)
+            previous = self._entries.get(key)
+            self._entries[key] = _Entry(
+                value=value,
+                fresh_until=now + self.ttl,
+                stale_until=now + self.ttl + self.stale_ttl,
+                # readers stamp their own reads; a refresh keeps the last one
+                read_at=previous.read_at if previous is not None else float("-inf"),
+            )
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def _prune(self, now: float) -> None:
+        expired = [k for k, e in self._entries.items() if e.stale_until <= now]
+        for k in expired:
+            del self._entries[k]
+
+
+def _consume_exception(task: asyncio.Task) -> None:
+    # background refreshes may fail with nobody awaiting them; the next miss retries
+    if not task.cancelled():
+        task.exception()
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db.query_stats import track_queries
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route template and status code.",
+    ["method", "route", "status"],
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving the request to sending the last response byte.",
+    ["method", "route"],
+    buckets=_LATENCY_BUCKETS,
+)
+IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requests currently being handled.",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+DB_STATEMENTS = Histogram(
+    "http_request_db_statements",
+    "SQL statements executed per request.",
+    ["method", "route"],
+    buckets=_STATEMENT_BUCKETS,
+)
+DB_TIME = Histogram(
+    "http_request_db_seconds",
+    "Time per request spent waiting on the database.",
+    ["method", "route"],
+    buckets=_LATENCY_BUCKETS,
+)
+APP_TIME = Histogram(
+    "http_request_app_seconds",
+    "Time per request spent outside the database (validation, serialization, I/O).",
+    ["method", "route"],
+    buckets=_LATENCY_BUCKETS,
+)
+
+FILTER_SHAPE_CACHE = Counter(
+    "task_filter_statement_cache_total",
+    "Task filter statement lookups by filter shape, by result (hit, miss).",
+    ["result"],
+)
+
+JOB_RUNS = Counter(
+    "scheduler_job_runs_total",
+    "Scheduled job runs by outcome (success, error, timeout, not_leader).",
+    ["job", "outcome"],
+)
+JOB_DURATION = Histogram(
+    "scheduler_job_duration_seconds",
+    "Scheduled job run time.",
+    ["job"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0),
+)
+JOB_LEADER = Gauge(
+    "scheduler_job_leader",
+    "1 while this worker holds the job's leadership lock.",
+    ["job"],
+    multiprocess_mode="liveall",
+)
+JOB_LAST_SUCCESS = Gauge(
+    "scheduler_job_last_success_timestamp_seconds",
+    "Unix time of the job's last successful run on this worker.",
+    ["job"],
+    multiprocess_mode="max",
+)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _route_template(scope: Scope) -> str:
+    # the router stores the matched route on the scope; label by its template to keep cardinality bounded
+    route = scope.get("route")
+    return getattr(route, "path", UNMATCHED_ROUTE)
+
+
+class PrometheusMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_progress = IN_PROGRESS.labels(method)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            with track_queries() as queries:
+                await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            in_progress.dec()
+            route = _route_template(scope)
+            REQUESTS.labels(method, route, str(status)).inc()
+            REQUEST_LATENCY.labels(method, route).observe(elapsed)
+            DB_STATEMENTS.labels(method, route).observe(queries.statements)
+            DB_TIME.labels(method, route).observe(queries.seconds)
+            APP_TIME.labels(method, route).observe(max(elapsed - queries.seconds, 0.0))
+
+
+def metrics_response() -> Response:
+    registry = REGISTRY
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        # several worker processes: aggregate the per-process files instead of this process only
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.db.query_stats import QueryStats, current_query_stats
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceededError(AssertionError):
+    pass
+
+
+def query_budget(max_statements: int) -> Callable[[], None]:
+    """Route dependency declaring how many SQL statements one request may issue."""
+
+    def declare() -> None:
+        stats = current_query_stats()
+        if stats is not None:
+            stats.budget = max_statements
+
+    return declare
+
+
+def check_query_budget(stats: QueryStats) -> list[str]:
+    problems: list[str] = []
+    if stats.budget is not None and stats.statements > stats.budget:
+        problems.append(f"{stats.statements} statements exceed the budget of {stats.budget}")
+    for shape, count in stats.repeated_shapes(settings.query_repeat_threshold):
+        problems.append(f"statement repeated {count} times (possible N+1): {shape}")
+    return problems
+
+
+class QueryBudgetMiddleware:
+    """Checks the statements recorded for a request against its declared budget.
+
+    The check runs when the response starts, so in "raise" mode an overrun replaces the
+    response with a 500 instead of failing after the client already got its 200.
+    Statements issued while a response streams can only be logged.
+
+    Must run inside the middleware that starts query tracking.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or settings.query_budget_mode == "off":
+            await self.app(scope, receive, send)
+            return
+
+        checked_at: int | None = None
+
+        async def send_checked(message: Message) -> None:
+            nonlocal checked_at
+            if message["type"] == "http.response.start":
+                stats = current_query_stats()
+                if stats is not None:
+                    checked_at = stats.statements
+                    _report(scope, stats, may_raise=True)
+            await send(message)
+
+        await self.app(scope, receive, send_checked)
+        stats = current_query_stats()
+        if stats is not None and stats.statements != checked_at:
+            _report(scope, stats, may_raise=False)
+
+
+def _report(scope: Scope, stats: QueryStats, *, may_raise: bool) -> None:
+    problems = check_query_budget(stats)
+    if not problems:
+        return
+    route = getattr(scope.get("route"), "path", scope["path"])
+    message = f"{scope['method']} {route}: " + "; ".join(problems)
+    if may_raise and settings.query_budget_mode == "raise":
+        raise QueryBudgetExceededError(message)
+    logger.warning("query budget: %s", message)
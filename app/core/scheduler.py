@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.metrics import JOB_DURATION, JOB_LAST_SUCCESS, JOB_LEADER, JOB_RUNS
+
+logger = logging.getLogger(__name__)
+
+
+def advisory_lock_key(name: str) -> int:
+    """Stable signed 64-bit key: the same job name maps to the same lock on every node."""
+    digest = hashlib.blake2b(f"taskapi:job:{name}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+@dataclass
+class Job:
+    name: str
+    func: Callable[[], Awaitable[None]]
+    interval: float
+    # each wait is interval * (1 ± jitter) so workers started together drift apart
+    jitter: float = 0.1
+    timeout: float | None = None
+    # False for per-worker work such as rebuilding an in-process cache
+    leader_only: bool = True
+    # first run after this many seconds; None means a random point within one jittered interval
+    initial_delay: float | None = None
+
+
+class LeaderElection:
+    """Per-job leadership through session-level advisory locks on one dedicated connection.
+
+    Whoever holds a job's lock keeps running it; if that worker dies, its connection
+    closes, Postgres releases the lock and another worker takes over on its next tick.
+    """
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self._conn: AsyncConnection | None = None
+        self._held: set[str] = set()
+        self._lock = asyncio.Lock()
+
+    async def is_leader(self, name: str) -> bool:
+        async with self._lock:
+            if name in self._held:
+                return True
+            try:
+                conn = await self._connection()
+                acquired = (
+                    await conn.execute(select(func.pg_try_advisory_lock(advisory_lock_key(name))))
+                ).scalar_one()
+                # autocommit-style: never leave the dedicated connection idle in a transaction
+                await conn.commit()
+            except Exception:
+                logger.warning("leader election connection failed", exc_info=True)
+                await self._reset()
+                return False
+            if acquired:
+                self._held.add(name)
+                JOB_LEADER.labels(name).set(1)
+            return bool(acquired)
+
+    async def check(self) -> None:
+        """Drops every claimed leadership if the lock connection has gone away."""
+        async with self._lock:
+            if self._conn is None:
+                return
+            try:
+                await self._conn.execute(select(1))
+                await self._conn.commit()
+            except Exception:
+                logger.warning("leader election connection lost", exc_info=True)
+                await self._reset()
+
+    async def close(self) -> None:
+        async with self._lock:
+            # closing the session releases every advisory lock it holds
+            await self._reset()
+
+    async def _connection(self) -> AsyncConnection:
+        if self._conn is None:
+            self._conn = await self.engine.connect()
+        return self._conn
+
+    async def _reset(self) -> None:
+        for name in self._held:
+            JOB_LEADER.labels(name).set(0)
+        self._held.clear()
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            with contextlib.suppress(Exception):
+                await conn.invalidate()
+            with contextlib.suppress(Exception):
+                await conn.close()
+
+
+class Scheduler:
+    """Runs registered periodic jobs on the event loop, off the request path."""
+
+    def __init__(self, engine: AsyncEngine):
+        self.jobs: dict[str, Job] = {}
+        self.leadership = LeaderElection(engine)
+        self._tasks: list[asyncio.Task] = []
+
+    def add_job(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[None]],
+        *,
+        interval: float,
+        jitter: float = 0.1,
+        timeout: float | None = None,
+        leader_only: bool = True,
+        initial_delay: float | None = None,
+    ) -> Job:
+        if name in self.jobs:
+            raise ValueError(f"job already registered: {name}")
+        job = Job(name, func, interval, jitter, timeout, leader_only, initial_delay)
+        self.jobs[name] = job
+        return job
+
+    def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._loop(job)) for job in self.jobs.values()]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+        await self.leadership.close()
+
+    async def run_once(self, name: str) -> str:
+        """Runs one tick of ``name`` now; returns its outcome."""
+        job = self.jobs[name]
+        if job.leader_only:
+            await self.leadership.check()
+            if not await self.leadership.is_leader(job.name):
+                JOB_RUNS.labels(job.name, "not_leader").inc()
+                return "not_leader"
+
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(job.func(), timeout=job.timeout)
+        except TimeoutError:
+            outcome = "timeout"
+            logger.error("scheduled job %s timed out after %ss", job.name, job.timeout)
+        except Exception:
+            outcome = "error"
+            logger.exception("scheduled job %s failed", job.name)
+        else:
+            outcome = "success"
+            JOB_LAST_SUCCESS.labels(job.name).set(time.time())
+        JOB_DURATION.labels(job.name).observe(time.perf_counter() - started)
+        JOB_RUNS.labels(job.name, outcome).inc()
+        return outcome
+
+    def _next_delay(self, job: Job) -> float:
+        return max(job.interval * (1 + random.uniform(-job.jitter, job.jitter)), 0.0)
+
+    async def _loop(self, job: Job) -> None:
+        delay = job.initial_delay
+        if delay is None:
+            delay = random.uniform(0, job.interval * (1 + job.jitter))
+        await asyncio.sleep(delay)
+        while True:
+            await self.run_once(job.name)
+            await asyncio.sleep(self._next_delay(job))
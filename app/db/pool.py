@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# recent checkout waits kept for percentile reporting
+_WAIT_SAMPLES = 1024
+
+
+class PoolStats:
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.timeouts = 0
+        self.overflow_events = 0
+        self.max_in_use = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self._recent_waits: deque[float] = deque(maxlen=_WAIT_SAMPLES)
+
+    def record_checkout(self, *, wait: float, in_use: int) -> None:
+        self.checkouts += 1
+        self.wait_seconds_total += wait
+        self.wait_seconds_max = max(self.wait_seconds_max, wait)
+        self._recent_waits.append(wait)
+        self.max_in_use = max(self.max_in_use, in_use)
+
+    def wait_percentile(self, pct: float) -> float:
+        if not self._recent_waits:
+            return 0.0
+        ordered = sorted(self._recent_waits)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait and when it has to overflow."""
+
+    def __init__(self, *args, **kw):
+        super().__init__(*args, **kw)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        self.stats.record_checkout(wait=time.perf_counter() - start, in_use=self.checkedout())
+        return conn
+
+    def _create_connection(self):
+        # the overflow counter is already incremented for the connection being opened,
+        # so it is positive exactly when this one goes beyond pool_size
+        if self.overflow() > 0:
+            self.stats.overflow_events += 1
+        return super()._create_connection()
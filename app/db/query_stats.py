@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import contextlib
+import re
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\$\d+(?:\s*,\s*\$\d+)*\s*\)")
+_PLACEHOLDER = re.compile(r"\$\d+")
+
+
+def statement_shape(statement: str) -> str:
+    """SQL with placeholders and expanded IN lists collapsed, so repeats compare equal."""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _PLACEHOLDER_LIST.sub("(...)", shape)
+    return _PLACEHOLDER.sub("?", shape)
+
+
+@dataclass
+class QueryStats:
+    statements: int = 0
+    seconds: float = 0.0
+    shapes: Counter[str] = field(default_factory=Counter)
+    # statement limit declared by the route, if any (see app.core.query_budget)
+    budget: int | None = None
+    # the tracking this one is nested in, which counts the same statements
+    outer: QueryStats | None = field(default=None, repr=False)
+
+    def repeated_shapes(self, threshold: int) -> list[tuple[str, int]]:
+        return [(shape, n) for shape, n in self.shapes.most_common() if n > threshold]
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextlib.contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collects the statements executed by the current task (and tasks it spawns); an
+    enclosing tracking, if any, still sees them."""
+    stats = QueryStats(outer=_current.get())
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def current_query_stats() -> QueryStats | None:
+    return _current.get()
+
+
+# registered on the Engine class so every engine (primary, replica, tests) is covered
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current.get() is not None and context is not None:
+        # kept on the statement's execution context, not the pooled connection: a statement
+        # that fails never reaches after_cursor_execute, and its start dies with the context
+        context._query_start = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current.get()
+    start = getattr(context, "_query_start", None)
+    if stats is None or start is None:
+        return
+    seconds = time.perf_counter() - start
+    shape = statement_shape(statement)
+    while stats is not None:
+        stats.statements += 1
+        stats.seconds += seconds
+        stats.shapes[shape] += 1
+        stats = stats.outer
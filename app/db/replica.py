@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# WAL positions are compared as byte offsets (pg_lsn minus 0/0): they come from the same WAL
+# on the primary and the replica, so unlike timestamps they are immune to clock skew.
+_PRIMARY_LSN_SQL = text("SELECT pg_wal_lsn_diff(pg_current_wal_lsn(), '0/0')::bigint")
+
+# A server that is not a standby has "replayed" everything it wrote.
+_REPLICA_SQL = text(
+    """
+    SELECT
+        pg_wal_lsn_diff(
+            CASE
+                WHEN pg_is_in_recovery() THEN coalesce(pg_last_wal_replay_lsn(), '0/0')
+                ELSE pg_current_wal_lsn()
+            END,
+            '0/0'
+        )::bigint AS replayed_lsn,
+        EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) AS replay_age
+    """
+)
+
+
+async def primary_wal_lsn(session: AsyncSession) -> int:
+    """The primary's current WAL position; run after a commit to get a read-after marker."""
+    return (await session.execute(_PRIMARY_LSN_SQL)).scalar_one()
+
+
+class ReplicaRouter:
+    """Decides per read whether the replica is healthy and fresh enough to serve it."""
+
+    def __init__(
+        self,
+        replica_engine: AsyncEngine,
+        *,
+        primary_engine: AsyncEngine,
+        max_lag_seconds: float,
+        check_interval_seconds: float,
+        retry_after_seconds: float,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.replica_engine = replica_engine
+        self.primary_engine = primary_engine
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self.retry_after_seconds = retry_after_seconds
+        self.clock = clock
+        self.lag_seconds: float | None = None
+        # WAL position the replica had replayed at the last check; it only moves forward
+        self.replayed_lsn = 0
+        self._checked_at = float("-inf")
+        self._down_until = 0.0
+        self._refresh_lock = asyncio.Lock()
+
+    async def use_replica(self, *, read_after: int | None = None) -> bool:
+        now = self.clock()
+        if now < self._down_until:
+            return False
+        if now - self._checked_at >= self.check_interval_seconds:
+            await self._refresh()
+            if self.clock() < self._down_until:
+                return False
+        if self.lag_seconds is None or self.lag_seconds > self.max_lag_seconds:
+            return False
+        # read-your-writes: the caller's last commit (a primary WAL position) must be replayed
+        return read_after is None or self.replayed_lsn >= read_after
+
+    def mark_down(self) -> None:
+        self._down_until = self.clock() + self.retry_after_seconds
+        self.lag_seconds = None
+
+    def record_lag(self, *, lag: float, replayed_lsn: int) -> None:
+        self.lag_seconds = lag
+        self.replayed_lsn = replayed_lsn
+        self._checked_at = self.clock()
+
+    async def _refresh(self) -> None:
+        async with self._refresh_lock:
+            if self.clock() - self._checked_at < self.check_interval_seconds:
+                return  # another request refreshed while we waited
+            try:
+                # the primary first: a replica that replayed this far is caught up
+                async with self.primary_engine.connect() as conn:
+                    primary_lsn = (await conn.execute(_PRIMARY_LSN_SQL)).scalar_one()
+                async with self.replica_engine.connect() as conn:
+                    row = (await conn.execute(_REPLICA_SQL)).one()
+            except Exception:
+                logger.warning(
+                    "read replica unavailable; routing reads to the primary", exc_info=True
+                )
+                self._checked_at = self.clock()
+                self.mark_down()
+                return
+            if row.replayed_lsn >= primary_lsn:
+                lag = 0.0
+            elif row.replay_age is None:
+                lag = float("inf")  # behind, and nothing replayed since it started
+            else:
+                # behind (possibly still receiving): as stale as its last replayed commit
+                lag = float(row.replay_age)
+            self.record_lag(lag=lag, replayed_lsn=row.replayed_lsn)
@@ -1,15 +1,48 @@
 from __future__ import annotations
 
+import contextlib
+import logging
 from collections.abc import AsyncIterator
+from typing import Any
 
+from fastapi import HTTPException, Request
+from sqlalchemy import event, exc, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.security import workspace_from_token
+from app.db.pool import InstrumentedAsyncQueuePool
+from app.db.replica import ReplicaRouter, primary_wal_lsn
+from app.db.shards import ShardRouter
+
+logger = logging.getLogger(__name__)
+
+READ_AFTER_COOKIE = "read_after"
+READ_AFTER_HEADER = "x-read-after"
+# selects the workspace for unauthenticated requests (register, login); tokens carry their own
+WORKSPACE_HEADER = "x-workspace-id"
+
+
+def engine_options() -> dict[str, Any]:
+    return {
+        "poolclass": InstrumentedAsyncQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "connect_args": {
+            "prepared_statement_cache_size": settings.db_prepared_statement_cache_size,
+            "statement_cache_size": settings.db_statement_cache_size,
+        },
+    }
+
 
 engine = create_async_engine(
     settings.database_url,
-    pool_pre_ping=True,
     future=True,
+    **engine_options(),
 )
 
 AsyncSessionLocal = async_sessionmaker(
@@ -18,7 +51,143 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
+shard_router = ShardRouter(
+    engine,
+    AsyncSessionLocal,
+    settings.workspace_database_urls,
+    engine_factory=lambda url: create_async_engine(url, future=True, **engine_options()),
+)
+
+replica_engine = (
+    create_async_engine(settings.database_replica_url, future=True, **engine_options())
+    if settings.database_replica_url
+    else None
+)
+
+ReplicaSessionLocal = (
+    async_sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False)
+    if replica_engine is not None
+    else None
+)
+
+replica_router = (
+    ReplicaRouter(
+        replica_engine,
+        primary_engine=engine,
+        max_lag_seconds=settings.replica_max_lag_seconds,
+        check_interval_seconds=settings.replica_lag_check_interval_seconds,
+        retry_after_seconds=settings.replica_retry_after_seconds,
+    )
+    if replica_engine is not None
+    else None
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_committed(session: Session) -> None:
+    session.info["committed"] = True
+
+
+class ReadSessionFactory:
+    """Opens READ ONLY sessions on the replica when it is fresh enough, else on the primary.
 
-async def get_db() -> AsyncIterator[AsyncSession]:
-    async with AsyncSessionLocal() as session:
+    Workspaces mapped to their own database always read from that database.
+    """
+
+    def __init__(
+        self,
+        replica_sessionmaker: async_sessionmaker[AsyncSession] | None,
+        router: ReplicaRouter | None,
+    ):
+        self.replica_sessionmaker = replica_sessionmaker
+        self.router = router
+
+    @contextlib.asynccontextmanager
+    async def __call__(
+        self,
+        *,
+        read_after: int | None = None,
+        workspace_id: int | None = None,
+    ) -> AsyncIterator[AsyncSession]:
+        if workspace_id is None:
+            workspace_id = settings.default_workspace_id
+        session = await self._open(read_after, workspace_id)
+        async with session:
+            yield session
+
+    async def _open(self, read_after: int | None, workspace_id: int) -> AsyncSession:
+        on_default = shard_router.is_default(workspace_id)
+        if (
+            on_default
+            and self.replica_sessionmaker is not None
+            and await self.router.use_replica(read_after=read_after)
+        ):
+            session = self.replica_sessionmaker()
+            try:
+                await session.execute(text("SET TRANSACTION READ ONLY"))
+                return session
+            except (exc.DBAPIError, OSError):
+                logger.warning("read replica connection failed; falling back to the primary")
+                self.router.mark_down()
+                await session.close()
+
+        session = shard_router.sessionmaker_for(workspace_id)()
+        try:
+            await session.execute(text("SET TRANSACTION READ ONLY"))
+        except BaseException:
+            await session.close()
+            raise
+        return session
+
+
+read_sessions = ReadSessionFactory(ReplicaSessionLocal, replica_router)
+
+
+def read_after_marker(request: Request) -> int | None:
+    raw = request.headers.get(READ_AFTER_HEADER) or request.cookies.get(READ_AFTER_COOKIE)
+    if not raw:
+        return None
+    try:
+        return int(raw)
+    except ValueError:
+        return None
+
+
+def request_workspace_id(request: Request) -> int:
+    authorization = request.headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        workspace_id = workspace_from_token(token)
+        if workspace_id is not None:
+            return workspace_id
+    header = request.headers.get(WORKSPACE_HEADER)
+    if header is None:
+        return settings.default_workspace_id
+    try:
+        return int(header)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid X-Workspace-Id header") from None
+
+
+async def get_db(request: Request) -> AsyncIterator[AsyncSession]:
+    workspace_id = request_workspace_id(request)
+    async with shard_router.sessionmaker_for(workspace_id)() as session:
+        yield session
+        # only default-database reads go to the replica, so only they need a marker
+        on_replicated = replica_router is not None and shard_router.is_default(workspace_id)
+        if session.info.get("committed") and on_replicated:
+            # the replica serves this client's reads once it has replayed this far
+            request.state.read_after = await primary_wal_lsn(session)
+
+
+async def get_read_db(request: Request) -> AsyncIterator[AsyncSession]:
+    async with read_sessions(
+        read_after=read_after_marker(request),
+        workspace_id=request_workspace_id(request),
+    ) as session:
         yield session
+
+
+def get_read_sessionmaker() -> ReadSessionFactory:
+    # for reads that must outlive or be shared across requests (caches, background refreshes)
+    return read_sessions
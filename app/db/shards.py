@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+
+class ShardRouter:
+    """Maps workspaces to the database holding their data.
+
+    Unmapped workspaces use the default engine. Engines for the other databases
+    are created on first use and shared by every workspace mapped to the same URL.
+    """
+
+    def __init__(
+        self,
+        default_engine: AsyncEngine,
+        default_sessionmaker: async_sessionmaker[AsyncSession],
+        workspace_urls: dict[int, str],
+        *,
+        engine_factory: Callable[[str], AsyncEngine],
+    ):
+        self.default_engine = default_engine
+        self.default_sessionmaker = default_sessionmaker
+        self.workspace_urls = workspace_urls
+        self.engine_factory = engine_factory
+        self._engines: dict[str, AsyncEngine] = {}
+        self._sessionmakers: dict[str, async_sessionmaker[AsyncSession]] = {}
+
+    def is_default(self, workspace_id: int) -> bool:
+        return workspace_id not in self.workspace_urls
+
+    def engine_for(self, workspace_id: int) -> AsyncEngine:
+        url = self.workspace_urls.get(workspace_id)
+        if url is None:
+            return self.default_engine
+        engine = self._engines.get(url)
+        if engine is None:
+            engine = self._engines[url] = self.engine_factory(url)
+        return engine
+
+    def sessionmaker_for(self, workspace_id: int) -> async_sessionmaker[AsyncSession]:
+        url = self.workspace_urls.get(workspace_id)
+        if url is None:
+            return self.default_sessionmaker
+        factory = self._sessionmakers.get(url)
+        if factory is None:
+            factory = self._sessionmakers[url] = async_sessionmaker(
+                self.engine_for(workspace_id), class_=AsyncSession, expire_on_commit=False
+            )
+        return factory
+
+    def sessionmakers(self) -> list[async_sessionmaker[AsyncSession]]:
+        """One session factory per distinct database, default first."""
+        factories = [self.default_sessionmaker]
+        seen: set[str] = set()
+        for workspace_id, url in self.workspace_urls.items():
+            if url not in seen:
+                seen.add(url)
+                factories.append(self.sessionmaker_for(workspace_id))
+        return factories
+
+    def engines(self) -> list[AsyncEngine]:
+        return [factory.kw["bind"] for factory in self.sessionmakers()]
+
+    async def dispose_shards(self) -> None:
+        for engine in self._engines.values():
+            await engine.dispose()
+        self._engines.clear()
+        self._sessionmakers.clear()
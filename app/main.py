@@ -1,21 +1,125 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import logging
+from collections.abc import AsyncIterator
+
 from fastapi import FastAPI
 from fastapi.responses import ORJSONResponse
 
-from app.api.routes import analytics, auth, tasks, timeline
+from app.api.middleware import ReadAfterWriteMiddleware
+from app.api.routes import analytics, auth, diagnostics, filters, me, tasks, timeline
+from app.api.routes.analytics import refresh_analytics_cache
+from app.core.config import settings
+from app.core.metrics import PrometheusMiddleware, metrics_response
+from app.core.query_budget import QueryBudgetMiddleware
+from app.core.scheduler import Scheduler
+from app.db.session import engine, read_sessions, replica_engine, shard_router
+from app.services.audit_maintenance_service import run_audit_maintenance
+from app.services.task_events import task_event_hubs
+from app.services.warmup_service import warm_up_engine
+
+logger = logging.getLogger(__name__)
+
+
+async def _audit_maintenance_all_databases() -> None:
+    for session_factory in shard_router.sessionmakers():
+        await run_audit_maintenance(session_factory)
+
+
+def build_scheduler() -> Scheduler:
+    scheduler = Scheduler(engine)
+    scheduler.add_job(
+        "audit_partition_maintenance",
+        _audit_maintenance_all_databases,
+        interval=settings.audit_maintenance_interval_seconds,
+        timeout=settings.audit_maintenance_timeout_seconds,
+        # partitions for the current month must exist before audit rows arrive
+        initial_delay=0,
+    )
+    scheduler.add_job(
+        "analytics_cache_refresh",
+        lambda: refresh_analytics_cache(read_sessions),
+        interval=settings.analytics_refresh_interval_seconds,
+        timeout=settings.analytics_refresh_interval_seconds,
+        leader_only=False,
+    )
+    return scheduler
+
+
+async def _warm_up(app: FastAPI) -> None:
+    try:
+        # pooled connections beyond pool_size would be closed again on release
+        connections = min(settings.db_warmup_connections, settings.db_pool_size)
+        if connections > 0:
+            engines = shard_router.engines()
+            if replica_engine is not None:
+                engines.append(replica_engine)
+            await asyncio.gather(*(warm_up_engine(e, connections=connections) for e in engines))
+        app.openapi()
+    except Exception:
+        # a cold worker still serves correctly; never hold readiness back on a failed warm-up
+        logger.exception("startup warm-up failed")
+    app.state.ready = True
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    app.state.ready = False
+    warm_up = asyncio.create_task(_warm_up(app))
+    scheduler = build_scheduler() if settings.scheduler_enabled else None
+    if scheduler is not None:
+        scheduler.start()
+    try:
+        yield
+    finally:
+        await task_event_hubs.close()
+        if scheduler is not None:
+            await scheduler.stop()
+        await shard_router.dispose_shards()
+        warm_up.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await warm_up
+
+
+def create_app() -> FastAPI:
+    app = FastAPI(
+        title="Task Management API",
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan,
+    )
+    app.state.ready = False
+
+    app.add_middleware(ReadAfterWriteMiddleware)
+    # inside PrometheusMiddleware, which starts the per-request query tracking
+    app.add_middleware(QueryBudgetMiddleware)
+    app.add_middleware(PrometheusMiddleware)
+
+    app.include_router(auth.router)
+    app.include_router(tasks.router)
+    app.include_router(filters.router)
+    app.include_router(analytics.router)
+    app.include_router(timeline.router)
+    app.include_router(me.router)
+    app.include_router(diagnostics.router)
+
+    @app.get("/health")
+    async def health():
+        return {"ok": True}
+
+    @app.get("/ready")
+    async def ready():
+        # becomes true once the lifespan warm-up (connections, statement caches, OpenAPI) is done
+        if not app.state.ready:
+            return ORJSONResponse({"ready": False}, status_code=503)
+        return {"ready": True}
 
-app = FastAPI(
-    title="Task Management API",
-    default_response_class=ORJSONResponse,
-)
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return metrics_response()
 
-app.include_router(auth.router)
-app.include_router(tasks.router)
-app.include_router(analytics.router)
-app.include_router(timeline.router)
+    return app
 
 
-@app.get("/health")
-async def health():
-    return {"ok": True}
+app = create_app()
@@ -1,4 +1,19 @@
 # Import models to ensure they are registered with SQLAlchemy metadata
-from app.models.audit import AuditEvent 
-from app.models.task import Tag, Task, TaskDependency, TaskTagLink, TaskUserLink  
+from app.models.audit import AuditEvent
+from app.models.saved_filter import SavedFilter
+from app.models.task import Tag, Task, TaskDependency, TaskTagLink, TaskTombstone, TaskUserLink
 from app.models.user import User
+from app.models.workspace import WorkspaceWriteVersion
+
+__all__ = [
+    "AuditEvent",
+    "SavedFilter",
+    "Tag",
+    "Task",
+    "TaskDependency",
+    "TaskTagLink",
+    "TaskTombstone",
+    "TaskUserLink",
+    "User",
+    "WorkspaceWriteVersion",
+]
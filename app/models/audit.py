@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, func
+from sqlalchemy import DDL, DateTime, ForeignKey, Index, Integer, String, Text, event, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -11,16 +11,50 @@ from app.db.base import Base
 class AuditEvent(Base):
     __tablename__ = "audit_events"
 
-    id: Mapped[int] = mapped_column(primary_key=True)
+    # the partition key must be part of the primary key
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    workspace_id: Mapped[int] = mapped_column(Integer, nullable=False)
 
-    actor_user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True, nullable=False)
-    entity_type: Mapped[str] = mapped_column(String(50), index=True, nullable=False)  # e.g., TASK
-    entity_id: Mapped[int] = mapped_column(index=True, nullable=False)
-    action: Mapped[str] = mapped_column(String(50), index=True, nullable=False) 
+    actor_user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    entity_type: Mapped[str] = mapped_column(String(50), nullable=False)  # e.g., TASK
+    entity_id: Mapped[int] = mapped_column(nullable=False)
+    action: Mapped[str] = mapped_column(String(50), nullable=False)
     details: Mapped[str | None] = mapped_column(Text)
 
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False, index=True
+        DateTime(timezone=True), primary_key=True, server_default=func.now(), nullable=False
     )
 
     actor = relationship("User", back_populates="audit_events")
+
+    __table_args__ = (
+        # keyset pagination of a user's timeline:
+        # WHERE workspace = ? AND actor = ? ORDER BY created_at DESC, id DESC
+        Index(
+            "ix_audit_events_workspace_actor_created_at_id",
+            "workspace_id",
+            "actor_user_id",
+            "created_at",
+            "id",
+        ),
+        # per-entity history:
+        # WHERE workspace = ? AND entity_type = ? AND entity_id = ? ORDER BY created_at DESC, id DESC
+        Index(
+            "ix_audit_events_workspace_entity_created_at_id",
+            "workspace_id",
+            "entity_type",
+            "entity_id",
+            "created_at",
+            "id",
+        ),
+        # monthly partitions are managed by AuditPartitionRepository
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+
+# catch-all so inserts never fail when no monthly partition covers a row yet
+event.listen(
+    AuditEvent.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS audit_events_default PARTITION OF audit_events DEFAULT"),
+)
@@ -3,6 +3,7 @@ from __future__ import annotations
 from datetime import datetime, date
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     Date,
     DateTime,
@@ -10,21 +11,36 @@ from sqlalchemy import (
     ForeignKey,
     Index,
     Integer,
+    Sequence,
     String,
     Text,
     UniqueConstraint,
     func,
+    text,
 )
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
 from app.models.enums import TaskPriority, TaskStatus, TaskUserRole
 
 
+# Global, monotonically increasing change counter shared by tasks and tombstones;
+# it is the cursor for delta sync (GET /tasks/changes).
+task_change_seq = Sequence("task_change_seq")
+
+# 64-bit id of the transaction writing a row (assigned on first use). change_seq is drawn
+# at write time, not commit time, so delta sync also needs to know which writers were
+# still in flight when it last read.
+_writer_xid = text("pg_current_xact_id()::text::bigint")
+
+
 class Task(Base):
     __tablename__ = "tasks"
 
     id: Mapped[int] = mapped_column(primary_key=True)
+    # tenant key: every query is scoped to one workspace
+    workspace_id: Mapped[int] = mapped_column(Integer, nullable=False)
 
     title: Mapped[str] = mapped_column(String(200), nullable=False, index=True)
     description: Mapped[str | None] = mapped_column(Text)
@@ -69,8 +85,22 @@ class Task(Base):
         server_default=func.now(),
         onupdate=func.now(),
         nullable=False,
-        index=True,
     )
+    change_seq: Mapped[int] = mapped_column(
+        BigInteger,
+        task_change_seq,
+        server_default=task_change_seq.next_value(),
+        onupdate=task_change_seq.next_value(),
+        nullable=False,
+    )
+    change_xid: Mapped[int] = mapped_column(
+        BigInteger, server_default=_writer_xid, onupdate=_writer_xid, nullable=False
+    )
+    # optimistic concurrency: every ORM UPDATE/DELETE of the row is conditional on it
+    # (see __mapper_args__), and clients send it back as If-Match / expected_version
+    version: Mapped[int] = mapped_column(Integer, server_default="1", nullable=False)
+    # dependencies not yet DONE, kept current by TaskService so "blocked" needs no joins
+    open_dependency_count: Mapped[int] = mapped_column(Integer, server_default="0", nullable=False)
 
     # ---- Relationships ----
     creator = relationship("User", foreign_keys=[created_by_user_id], lazy="joined")
@@ -103,7 +133,50 @@ class Task(Base):
     )
 
     __table_args__ = (
-        Index("ix_tasks_status_priority", "status", "priority"),
+        Index("ix_tasks_workspace_status_priority", "workspace_id", "status", "priority"),
+        # filter pages are ordered by updated_at within a workspace
+        Index("ix_tasks_workspace_updated_at", "workspace_id", "updated_at"),
+        Index("ix_tasks_workspace_change_seq", "workspace_id", "change_seq"),
+        Index("ix_tasks_workspace_change_xid", "workspace_id", "change_xid"),
+        # the is_blocked filter; the predicate must match the one the filter compiles to
+        Index(
+            "ix_tasks_workspace_blocked_updated_at",
+            "workspace_id",
+            "updated_at",
+            postgresql_where=text("open_dependency_count > 0"),
+        ),
+    )
+    __mapper_args__ = {"version_id_col": version}
+
+    @property
+    def is_blocked(self) -> bool:
+        return self.open_dependency_count > 0
+
+
+class TaskTombstone(Base):
+    """Left behind by hard deletes so delta-sync clients learn about them."""
+
+    __tablename__ = "task_tombstones"
+
+    task_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    workspace_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    change_seq: Mapped[int] = mapped_column(
+        BigInteger,
+        task_change_seq,
+        server_default=task_change_seq.next_value(),
+        nullable=False,
+    )
+    change_xid: Mapped[int] = mapped_column(BigInteger, server_default=_writer_xid, nullable=False)
+    deleted_by_user_id: Mapped[int | None] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"))
+    # users who could see the task when it was deleted
+    visible_user_ids: Mapped[list[int]] = mapped_column(ARRAY(Integer), nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    __table_args__ = (
+        Index("ix_task_tombstones_workspace_change_seq", "workspace_id", "change_seq"),
+        Index("ix_task_tombstones_workspace_change_xid", "workspace_id", "change_xid"),
     )
 
 
@@ -122,9 +195,11 @@ class TaskUserLink(Base):
 
 class Tag(Base):
     __tablename__ = "tags"
+    __table_args__ = (UniqueConstraint("workspace_id", "name", name="uq_tags_workspace_name"),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    name: Mapped[str] = mapped_column(String(64), unique=True, index=True, nullable=False)
+    workspace_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    name: Mapped[str] = mapped_column(String(64), nullable=False)
 
 
 class TaskTagLink(Base):
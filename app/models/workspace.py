@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class WorkspaceWriteVersion(Base):
+    """Bumped once by every transaction that changes a workspace's tasks.
+
+    Cached task query results are keyed by it, so a cache entry is valid exactly
+    until the next task write in its workspace.
+    """
+
+    __tablename__ = "workspace_write_versions"
+
+    workspace_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import re
+from datetime import UTC, date, datetime
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+PARENT_TABLE = "audit_events"
+DEFAULT_PARTITION = "audit_events_default"
+_PARTITION_NAME = re.compile(r"^audit_events_p(\d{4})(\d{2})$")
+
+
+def month_start(d: date) -> date:
+    return d.replace(day=1)
+
+
+def add_months(d: date, months: int) -> date:
+    index = d.year * 12 + (d.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_bound(month: date) -> datetime:
+    return datetime(month.year, month.month, 1, tzinfo=UTC)
+
+
+def partition_name(month: date) -> str:
+    return f"audit_events_p{month.year:04d}{month.month:02d}"
+
+
+class AuditPartitionRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def list_monthly_partitions(self) -> dict[date, str]:
+        res = await self.db.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = CAST(:parent AS regclass)"
+            ),
+            {"parent": PARENT_TABLE},
+        )
+        partitions: dict[date, str] = {}
+        for (name,) in res.all():
+            m = _PARTITION_NAME.match(name)
+            if m:
+                partitions[date(int(m.group(1)), int(m.group(2)), 1)] = name
+        return partitions
+
+    async def create_monthly_partition(self, month: date) -> str:
+        name = partition_name(month)
+        lower = month_bound(month)
+        upper = month_bound(add_months(month, 1))
+
+        # Built detached and then attached so rows that already landed in the
+        # default partition for this month can be moved over first.
+        await self.db.execute(
+            text(
+                f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+            )
+        )
+        moved = (
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            "WHERE created_at >= :lower AND created_at < :upper "
+            f"RETURNING *) INSERT INTO {name} SELECT * FROM moved"
+        )
+        if await self._has_default_partition():
+            await self.db.execute(text(moved), {"lower": lower, "upper": upper})
+        await self.db.execute(
+            text(
+                f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} "
+                f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+            )
+        )
+        return name
+
+    async def ensure_monthly_partitions(self, *, start: date, months_ahead: int) -> list[str]:
+        existing = await self.list_monthly_partitions()
+        created: list[str] = []
+        first = month_start(start)
+        for offset in range(months_ahead + 1):
+            month = add_months(first, offset)
+            if month not in existing:
+                created.append(await self.create_monthly_partition(month))
+        return created
+
+    async def remove_partitions_before(self, cutoff: date, *, detach_only: bool) -> list[str]:
+        cutoff = month_start(cutoff)
+        removed: list[str] = []
+        for month, name in sorted((await self.list_monthly_partitions()).items()):
+            if month >= cutoff:
+                break
+            await self.db.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+            if not detach_only:
+                await self.db.execute(text(f"DROP TABLE {name}"))
+            removed.append(name)
+
+        if await self._has_default_partition():
+            await self.db.execute(
+                text(f"DELETE FROM {DEFAULT_PARTITION} WHERE created_at < :cutoff"),
+                {"cutoff": month_bound(cutoff)},
+            )
+        return removed
+
+    async def _has_default_partition(self) -> bool:
+        res = await self.db.execute(
+            text("SELECT to_regclass(:name) IS NOT NULL"), {"name": DEFAULT_PARTITION}
+        )
+        return bool(res.scalar_one())
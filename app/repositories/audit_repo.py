@@ -1,28 +1,112 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
 from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import and_, select
+from sqlalchemy import and_, event, insert, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
 
 from app.models.audit import AuditEvent
 
+_PENDING_KEY = "pending_audit_events"
+# 6 bound parameters per row keeps each INSERT well under the 32767 parameter limit
+_INSERT_BATCH_SIZE = 1000
+
 
 class AuditRepository:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, workspace_id: int):
         self.db = db
+        self.workspace_id = workspace_id
+
+    def add(self, event: AuditEvent) -> None:
+        self.add_many([event])
 
-    async def add(self, event: AuditEvent) -> AuditEvent:
-        self.db.add(event)
-        await self.db.flush()
-        return event
+    def add_many(self, events: Iterable[AuditEvent]) -> None:
+        # buffered on the session and written in one statement just before commit
+        pending = self.db.info.setdefault(_PENDING_KEY, [])
+        pending.extend(
+            {
+                "workspace_id": self.workspace_id,
+                "actor_user_id": e.actor_user_id,
+                "entity_type": e.entity_type,
+                "entity_id": e.entity_id,
+                "action": e.action,
+                "details": e.details,
+            }
+            for e in events
+        )
 
-    async def timeline_for_user(self, *, user_id: int, days: int) -> list[AuditEvent]:
+    async def timeline_for_user(
+        self,
+        *,
+        user_id: int,
+        days: int,
+        limit: int,
+        before: tuple[datetime, int] | None = None,
+        entity_type: str | None = None,
+        action: str | None = None,
+    ) -> list[AuditEvent]:
         since = datetime.now(timezone.utc) - timedelta(days=days)
+        conditions = [
+            AuditEvent.workspace_id == self.workspace_id,
+            AuditEvent.actor_user_id == user_id,
+            AuditEvent.created_at >= since,
+        ]
+        if before is not None:
+            # keyset: (created_at, id) strictly older than the last row of the previous page
+            conditions.append(tuple_(AuditEvent.created_at, AuditEvent.id) < tuple_(*before))
+        if entity_type:
+            conditions.append(AuditEvent.entity_type == entity_type)
+        if action:
+            conditions.append(AuditEvent.action == action)
+
         q = (
             select(AuditEvent)
-            .where(and_(AuditEvent.actor_user_id == user_id, AuditEvent.created_at >= since))
-            .order_by(AuditEvent.created_at.desc())
+            .where(and_(*conditions))
+            .order_by(AuditEvent.created_at.desc(), AuditEvent.id.desc())
+            .limit(limit)
         )
         res = await self.db.execute(q)
         return list(res.scalars().all())
+
+    async def history_for_entity(
+        self,
+        *,
+        entity_type: str,
+        entity_id: int,
+        limit: int,
+        before: tuple[datetime, int] | None = None,
+    ) -> list[AuditEvent]:
+        conditions = [
+            AuditEvent.workspace_id == self.workspace_id,
+            AuditEvent.entity_type == entity_type,
+            AuditEvent.entity_id == entity_id,
+        ]
+        if before is not None:
+            conditions.append(tuple_(AuditEvent.created_at, AuditEvent.id) < tuple_(*before))
+
+        q = (
+            select(AuditEvent)
+            .where(and_(*conditions))
+            .order_by(AuditEvent.created_at.desc(), AuditEvent.id.desc())
+            .limit(limit)
+        )
+        res = await self.db.execute(q)
+        return list(res.scalars().all())
+
+
+@event.listens_for(Session, "before_commit")
+def _write_pending_audit_events(session: Session) -> None:
+    rows = session.info.pop(_PENDING_KEY, None)
+    if not rows:
+        return
+    for start in range(0, len(rows), _INSERT_BATCH_SIZE):
+        session.execute(insert(AuditEvent).values(rows[start : start + _INSERT_BATCH_SIZE]))
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_pending_audit_events(session: Session, transaction: SessionTransaction) -> None:
+    # rolled back or closed without commit: buffered events die with the transaction
+    if transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import math
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import (
+    Date,
+    DateTime,
+    Integer,
+    String,
+    and_,
+    any_,
+    bindparam,
+    exists,
+    literal_column,
+    or_,
+    true,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from app.core.config import settings
+from app.core.metrics import FILTER_SHAPE_CACHE
+from app.models.enums import TaskUserRole
+from app.models.task import Tag, Task, TaskTagLink, TaskUserLink
+from app.schemas.task import FilterGroup, FilterPredicate, TaskFilter, TaskPredicates
+
+# rough share of a workspace's tasks each predicate keeps; only used to order predicates,
+# so estimates depend on the field alone and the order (hence the shape) not on the values
+SELECTIVITY = {
+    "assignee": 0.02,
+    "collaborator": 0.02,
+    "tag": 0.05,
+    "blocked": 0.1,
+    "due_from": 0.3,
+    "due_to": 0.3,
+    "created_from": 0.3,
+    "created_to": 0.3,
+    "status": 0.4,
+    "priority": 0.4,
+    "active": 0.9,
+    "unblocked": 0.9,
+}
+
+# canonical predicate order: most selective first
+PREDICATES = tuple(sorted(SELECTIVITY, key=lambda name: (SELECTIVITY[name], name)))
+
+
+@dataclass(frozen=True, slots=True)
+class FilterShape:
+    """What a filter's SQL looks like, without its values: two filters with the same
+    shape run the same statement text with different bind parameters."""
+
+    logic: str
+    predicates: tuple[str, ...]
+    # restricted to the tasks one user can access (everyone but admins)
+    scoped: bool
+    # canonical form of TaskFilter.where: ("AND" | "OR", children) for groups and
+    # ("leaf", param_prefix, predicates) for predicates
+    where: tuple | None = None
+
+
+def _predicate_params(p: TaskPredicates, prefix: str = "") -> dict[str, Any]:
+    """The predicates ``p`` sets, with their bind values (None for those without one)."""
+    params: dict[str, Any] = {}
+    if p.status_in:
+        params["status"] = sorted(set(p.status_in))
+    if p.priority_in:
+        params["priority"] = sorted(set(p.priority_in))
+    if p.due_date_from:
+        params["due_from"] = p.due_date_from
+    if p.due_date_to:
+        params["due_to"] = p.due_date_to
+    if p.created_from:
+        params["created_from"] = p.created_from
+    if p.created_to:
+        params["created_to"] = p.created_to
+    if p.assignee_user_ids:
+        params["assignee"] = sorted(set(p.assignee_user_ids))
+    if p.collaborator_user_ids:
+        params["collaborator"] = sorted(set(p.collaborator_user_ids))
+    tag_names = sorted({t.strip().lower() for t in p.tag_names or () if t.strip()})
+    if tag_names:
+        params["tag"] = tag_names
+    if p.is_blocked is not None:
+        params["blocked" if p.is_blocked else "unblocked"] = None
+    return {prefix + name: value for name, value in params.items()}
+
+
+def _ordered(names, logic: str) -> tuple[str, ...]:
+    # AND tests the predicate most likely to fail first, OR the one most likely to pass
+    ordered = [name for name in PREDICATES if name in names]
+    return tuple(ordered if logic == "AND" else reversed(ordered))
+
+
+def _estimate(node: tuple) -> float:
+    if node[0] == "leaf":
+        estimate = 1.0
+        for name in node[2]:
+            estimate *= SELECTIVITY[name]
+        return estimate
+    estimates = [_estimate(child) for child in node[1]]
+    if node[0] == "AND":
+        return math.prod(estimates)
+    return 1.0 - math.prod(1.0 - e for e in estimates)
+
+
+def _tree_shape(node: FilterGroup | FilterPredicate) -> tuple:
+    """Canonical tree without parameter prefixes: single-item groups are unwrapped,
+    nested groups with the same operator merged and children ordered by selectivity."""
+    if isinstance(node, FilterPredicate):
+        return ("leaf", node, _ordered(_predicate_params(node).keys(), "AND"))
+    children: list[tuple] = []
+    for item in node.items:
+        child = _tree_shape(item)
+        if child[0] == node.op:
+            children.extend(child[1])
+        else:
+            children.append(child)
+    if len(children) == 1:
+        return children[0]
+    most_selective_first = node.op == "AND"
+    children.sort(
+        key=lambda c: (_estimate(c) if most_selective_first else -_estimate(c), _sort_key(c))
+    )
+    return (node.op, tuple(children))
+
+
+def _sort_key(node: tuple) -> str:
+    # tie-breaker between equally selective children: their predicate layout
+    if node[0] == "leaf":
+        return ",".join(node[2])
+    return node[0] + "(" + ";".join(_sort_key(c) for c in node[1]) + ")"
+
+
+def _number_leaves(node: tuple, params: dict[str, Any], counter: list[int]) -> tuple:
+    # leaves are numbered in canonical order, so their parameter names are part of the shape
+    if node[0] != "leaf":
+        return (node[0], tuple(_number_leaves(c, params, counter) for c in node[1]))
+    prefix = f"w{counter[0]}_"
+    counter[0] += 1
+    params.update(_predicate_params(node[1], prefix))
+    return ("leaf", prefix, node[2])
+
+
+def canonical_shape(f: TaskFilter, *, visible_to: int | None) -> tuple[FilterShape, dict[str, Any]]:
+    """Normalizes ``f`` into its shape and the bind parameters that fill it in.
+
+    List values are de-duplicated and sorted, empty lists dropped and predicates put in
+    canonical order, so equivalent filters share a shape and a parameter set.
+    """
+    params = _predicate_params(f)
+    present = params.keys() | ({"active"} if not f.include_archived else set())
+    # with a single predicate AND and OR are the same statement
+    logic = f.logic if len(present) > 1 else "AND"
+    where = None
+    if f.where is not None:
+        where = _number_leaves(_tree_shape(f.where), params, [0])
+    # predicates without a value are all shape
+    params = {name: value for name, value in params.items() if value is not None}
+    if visible_to is not None:
+        params["visible_to"] = visible_to
+    shape = FilterShape(
+        logic=logic,
+        predicates=_ordered(present, logic),
+        scoped=visible_to is not None,
+        where=where,
+    )
+    return shape, params
+
+
+def _array(name: str, item_type) -> Any:
+    # one array parameter instead of an expanding IN list: the SQL text does not
+    # depend on how many values are passed, so the prepared statement is reused
+    return any_(bindparam(name, type_=ARRAY(item_type)))
+
+
+def _linked_users(param: str, role: TaskUserRole):
+    # semi-join: stops at the first matching link instead of materializing the task ids
+    return exists().where(
+        TaskUserLink.task_id == Task.id,
+        TaskUserLink.role == role,
+        TaskUserLink.user_id == _array(param, Integer),
+    )
+
+
+_PREDICATE_BUILDERS: dict[str, Callable[[str], Any]] = {
+    "active": lambda param: Task.is_archived.is_(False),
+    # literal 0, not a parameter: the planner must see it to use the partial index
+    "blocked": lambda param: Task.open_dependency_count > literal_column("0"),
+    "unblocked": lambda param: Task.open_dependency_count == literal_column("0"),
+    "status": lambda param: Task.status == _array(param, Task.status.type),
+    "priority": lambda param: Task.priority == _array(param, Task.priority.type),
+    "due_from": lambda param: Task.due_date >= bindparam(param, type_=Date),
+    "due_to": lambda param: Task.due_date <= bindparam(param, type_=Date),
+    "created_from": lambda param: (
+        Task.created_at >= bindparam(param, type_=DateTime(timezone=True))
+    ),
+    "created_to": lambda param: Task.created_at <= bindparam(param, type_=DateTime(timezone=True)),
+    "assignee": lambda param: _linked_users(param, TaskUserRole.ASSIGNEE),
+    "collaborator": lambda param: _linked_users(param, TaskUserRole.COLLABORATOR),
+    "tag": lambda param: exists().where(
+        TaskTagLink.task_id == Task.id,
+        Tag.id == TaskTagLink.tag_id,
+        Tag.workspace_id == bindparam("workspace_id"),
+        Tag.name == _array(param, String),
+    ),
+}
+
+
+def _tree_clause(node: tuple):
+    if node[0] == "leaf":
+        _, prefix, names = node
+        return and_(true(), *(_PREDICATE_BUILDERS[name](prefix + name) for name in names))
+    combine = and_ if node[0] == "AND" else or_
+    return combine(*(_tree_clause(child) for child in node[1]))
+
+
+def shape_clauses(shape: FilterShape) -> list:
+    """The WHERE clauses of ``shape``; values, the workspace included, are bind parameters."""
+    conditions = [_PREDICATE_BUILDERS[name](name) for name in shape.predicates]
+    combine = and_ if shape.logic == "AND" else or_
+    clauses = [Task.workspace_id == bindparam("workspace_id")]
+    if conditions:
+        clauses.append(combine(*conditions))
+    if shape.where is not None:
+        clauses.append(_tree_clause(shape.where))
+    if shape.scoped:
+        visible_to = bindparam("visible_to", type_=Integer)
+        clauses.append(
+            or_(
+                Task.created_by_user_id == visible_to,
+                exists().where(TaskUserLink.task_id == Task.id, TaskUserLink.user_id == visible_to),
+            )
+        )
+    return clauses
+
+
+class StatementCache:
+    """LRU of statements built per filter shape.
+
+    Reusing the statement object skips rebuilding the expression tree, and its stable
+    SQL text keeps SQLAlchemy's compiled cache and asyncpg's prepared statements warm.
+    """
+
+    def __init__(self, *, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+
+    def get(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        stmt = self._entries.get(key)
+        if stmt is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            FILTER_SHAPE_CACHE.labels("hit").inc()
+            return stmt
+        self.misses += 1
+        FILTER_SHAPE_CACHE.labels("miss").inc()
+        stmt = self._entries[key] = build()
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return stmt
+
+    @property
+    def size(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+
+filter_statements = StatementCache(max_size=settings.filter_statement_cache_size)
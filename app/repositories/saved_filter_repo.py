@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.saved_filter import SavedFilter
+
+
+class SavedFilterRepository:
+    def __init__(self, db: AsyncSession, workspace_id: int):
+        self.db = db
+        self.workspace_id = workspace_id
+
+    def _select(self):
+        return select(SavedFilter).where(SavedFilter.workspace_id == self.workspace_id)
+
+    async def list(self) -> list[SavedFilter]:
+        res = await self.db.execute(self._select().order_by(SavedFilter.name))
+        return list(res.scalars().all())
+
+    async def get(self, filter_id: int) -> SavedFilter | None:
+        res = await self.db.execute(self._select().where(SavedFilter.id == filter_id))
+        return res.scalar_one_or_none()
+
+    async def get_by_name(self, name: str) -> SavedFilter | None:
+        res = await self.db.execute(self._select().where(SavedFilter.name == name))
+        return res.scalar_one_or_none()
+
+    async def create(self, saved: SavedFilter) -> SavedFilter:
+        saved.workspace_id = self.workspace_id
+        self.db.add(saved)
+        await self.db.flush()
+        return saved
+
+    async def delete(self, saved: SavedFilter) -> None:
+        await self.db.delete(saved)
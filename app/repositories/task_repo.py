@@ -1,26 +1,99 @@
 from __future__ import annotations
 
-from collections.abc import Sequence
+from collections.abc import Collection, Sequence
+from dataclasses import dataclass
 from datetime import date, datetime
+from typing import Any
 
-from sqlalchemy import and_, func, or_, select
+from sqlalchemy import (
+    Integer,
+    String,
+    and_,
+    bindparam,
+    case,
+    cast,
+    column,
+    exists,
+    false,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    text,
+    tuple_,
+    union,
+    union_all,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, selectinload
 from sqlalchemy import delete
 
-from app.models.enums import TaskUserRole
-from app.models.task import Tag, Task, TaskDependency, TaskTagLink, TaskUserLink
+from app.models.enums import TaskStatus, TaskUserRole
+from app.models.task import (
+    Tag,
+    Task,
+    TaskDependency,
+    TaskTagLink,
+    TaskTombstone,
+    TaskUserLink,
+    task_change_seq,
+)
+from app.repositories.filter_shapes import (
+    FilterShape,
+    canonical_shape,
+    filter_statements,
+    shape_clauses,
+)
 from app.schemas.task import TaskFilter
 
 
+@dataclass(frozen=True, slots=True)
+class ChangeCursor:
+    """Where a delta-sync client stopped: the last change_seq it received, plus the
+    snapshot (``xmax`` and in-flight xids) it read under.
+
+    A change_seq is drawn at write time but only becomes visible at commit, so a writer
+    in flight during the read can commit a lower change_seq than the cursor; its rows
+    are recognized by their change_xid on the next read instead.
+    """
+
+    seq: int
+    # None before the first sync: every row is new then
+    xmax: int | None = None
+    in_flight: tuple[int, ...] = ()
+
+
+_SNAPSHOT_SQL = text(
+    "SELECT pg_snapshot_xmax(s)::text::bigint, "
+    "ARRAY(SELECT pg_snapshot_xip(s)::text::bigint) "
+    "FROM pg_current_snapshot() AS s"
+)
+
+
+def _changed_after(since: ChangeCursor, seq_col, xid_col):
+    if since.xmax is None:
+        return seq_col > since.seq
+    # writers still in flight at the last read, or that had not started writing yet
+    return or_(seq_col > since.seq, xid_col.in_(since.in_flight), xid_col >= since.xmax)
+
+
 class TaskRepository:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, workspace_id: int):
         self.db = db
+        self.workspace_id = workspace_id
+
+    def _in_workspace(self):
+        return Task.workspace_id == self.workspace_id
 
     async def get(self, task_id: int) -> Task | None:
         q = (
             select(Task)
-            .where(Task.id == task_id)
+            .where(self._in_workspace(), Task.id == task_id)
             .options(
                 selectinload(Task.user_links),
                 selectinload(Task.tags).selectinload(TaskTagLink.tag),
@@ -30,25 +103,182 @@ class TaskRepository:
         res = await self.db.execute(q)
         return res.scalar_one_or_none()
 
+    async def get_many(self, task_ids: Collection[int]) -> dict[int, Task]:
+        if not task_ids:
+            return {}
+        q = (
+            select(Task)
+            .where(self._in_workspace(), Task.id.in_(set(task_ids)))
+            .options(
+                selectinload(Task.user_links),
+                selectinload(Task.tags).selectinload(TaskTagLink.tag),
+                selectinload(Task.dependencies),
+            )
+        )
+        res = await self.db.execute(q)
+        return {task.id: task for task in res.scalars().all()}
+
+    async def existing_ids(self, task_ids: Collection[int]) -> set[int]:
+        if not task_ids:
+            return set()
+        res = await self.db.execute(
+            select(Task.id).where(self._in_workspace(), Task.id.in_(set(task_ids)))
+        )
+        return set(res.scalars().all())
+
+    async def dependents_among(self, task_id: int, candidate_ids: Collection[int]) -> set[int]:
+        """Which of ``candidate_ids`` directly depend on ``task_id``."""
+        if not candidate_ids:
+            return set()
+        res = await self.db.execute(
+            select(TaskDependency.task_id).where(
+                TaskDependency.depends_on_task_id == task_id,
+                TaskDependency.task_id.in_(set(candidate_ids)),
+            )
+        )
+        return set(res.scalars().all())
+
     async def create(self, task: Task) -> Task:
+        task.workspace_id = self.workspace_id
         self.db.add(task)
         await self.db.flush()
         return task
 
-    async def delete(self, task: Task) -> None:
-        await self.db.delete(task)
+    async def delete_subtree(self, root_id: int) -> list[int]:
+        """Deletes ``root_id`` and every task below it in one statement; returns their ids.
+
+        Links, tags and dependency rows go with them through their ON DELETE CASCADE
+        foreign keys instead of the ORM cascade, which loads and deletes them task by task.
+        """
+        stmt = (
+            delete(Task)
+            .where(self._in_workspace(), Task.id.in_(select(self._subtree(root_id).c.id)))
+            .returning(Task.id)
+            # tasks loaded in this session are marked deleted
+            .execution_options(synchronize_session="fetch")
+        )
+        res = await self.db.execute(stmt)
+        return list(res.scalars().all())
+
+    def touch(self, task: Task) -> None:
+        # link-only changes (tags, users, dependencies) must still advance the delta-sync cursor
+        task.change_seq = task_change_seq.next_value()
+
+    async def update_if_version(
+        self, changes: Sequence[tuple[int, int, dict[str, Any]]]
+    ) -> dict[int, int]:
+        """Applies ``(task_id, expected_version, values)`` rows without loading or locking them.
+
+        One ``UPDATE ... FROM (VALUES ...)`` per distinct set of patched columns, matching
+        only rows still at their expected version. Returns the new version of every row
+        that matched; callers compare it with ``changes`` to detect conflicts.
+        """
+        groups: dict[tuple[str, ...], list[tuple[int, int, dict[str, Any]]]] = {}
+        for change in changes:
+            groups.setdefault(tuple(sorted(change[2])), []).append(change)
+
+        columns = Task.__table__.c
+        new_versions: dict[int, int] = {}
+        for fields, rows in groups.items():
+            patch = values(
+                column("id", Integer),
+                column("expected_version", Integer),
+                *(column(f, columns[f].type) for f in fields),
+                name="patch",
+            ).data([(task_id, version, *(vals[f] for f in fields)) for task_id, version, vals in rows])
+            stmt = (
+                update(Task)
+                .where(
+                    self._in_workspace(),
+                    Task.id == patch.c.id,
+                    Task.version == patch.c.expected_version,
+                )
+                .values({**{f: patch.c[f] for f in fields}, "version": Task.version + 1})
+                .returning(Task.id, Task.version)
+                .execution_options(synchronize_session=False)
+            )
+            new_versions.update((await self.db.execute(stmt)).tuples().all())
+        return new_versions
+
+    async def add_subtree_tombstones(self, root_id: int, *, deleted_by_user_id: int) -> None:
+        """Tombstones ``root_id`` and every task below it in one INSERT ... SELECT; call it
+        before deleting them. Each records the users who could see its task."""
+        users = union(
+            select(Task.created_by_user_id).correlate(Task),
+            select(TaskUserLink.user_id).where(TaskUserLink.task_id == Task.id).correlate(Task),
+        ).order_by(literal_column("1"))
+        rows = select(
+            Task.id,
+            Task.workspace_id,
+            literal(deleted_by_user_id, Integer),
+            func.array(users.scalar_subquery()),
+        ).where(self._in_workspace(), Task.id.in_(select(self._subtree(root_id).c.id)))
+        await self.db.execute(
+            insert(TaskTombstone).from_select(
+                ["task_id", "workspace_id", "deleted_by_user_id", "visible_user_ids"], rows
+            )
+        )
+
+    async def change_snapshot(self) -> tuple[int, tuple[int, ...]]:
+        """``xmax`` and in-flight xids of a snapshot taken now; read it before the rows."""
+        xmax, in_flight = (await self.db.execute(_SNAPSHOT_SQL)).one()
+        return xmax, tuple(in_flight)
+
+    async def changed_since(
+        self,
+        *,
+        since: ChangeCursor,
+        limit: int,
+        accessible_task_ids_subq=None,
+    ) -> list[Task]:
+        q = select(Task).where(
+            self._in_workspace(), _changed_after(since, Task.change_seq, Task.change_xid)
+        )
+        if accessible_task_ids_subq is not None:
+            q = q.where(Task.id.in_(select(accessible_task_ids_subq.c.id)))
+        q = (
+            q.options(
+                selectinload(Task.user_links),
+                selectinload(Task.tags).selectinload(TaskTagLink.tag),
+                selectinload(Task.dependencies),
+            )
+            .order_by(Task.change_seq)
+            .limit(limit)
+        )
+        res = await self.db.execute(q)
+        return list(res.scalars().all())
+
+    async def tombstones_since(
+        self,
+        *,
+        since: ChangeCursor,
+        limit: int,
+        user_id: int | None = None,
+    ) -> list[TaskTombstone]:
+        q = select(TaskTombstone).where(
+            TaskTombstone.workspace_id == self.workspace_id,
+            _changed_after(since, TaskTombstone.change_seq, TaskTombstone.change_xid),
+        )
+        if user_id is not None:
+            q = q.where(TaskTombstone.visible_user_ids.any(user_id))
+        q = q.order_by(TaskTombstone.change_seq).limit(limit)
+        res = await self.db.execute(q)
+        return list(res.scalars().all())
 
     async def upsert_tags(self, tag_names: Sequence[str]) -> list[Tag]:
-        tags: list[Tag] = []
-        for name in {t.strip().lower() for t in tag_names if t.strip()}:
-            res = await self.db.execute(select(Tag).where(Tag.name == name))
-            tag = res.scalar_one_or_none()
-            if tag is None:
-                tag = Tag(name=name)
-                self.db.add(tag)
-                await self.db.flush()
-            tags.append(tag)
-        return tags
+        names = sorted({t.strip().lower() for t in tag_names if t.strip()})
+        if not names:
+            return []
+        # one insert for the missing names, one select for all of them
+        await self.db.execute(
+            pg_insert(Tag)
+            .values([{"workspace_id": self.workspace_id, "name": name} for name in names])
+            .on_conflict_do_nothing(index_elements=[Tag.workspace_id, Tag.name])
+        )
+        res = await self.db.execute(
+            select(Tag).where(Tag.workspace_id == self.workspace_id, Tag.name.in_(names))
+        )
+        return list(res.scalars().all())
 
     async def replace_task_users(
         self,
@@ -92,94 +322,271 @@ class TaskRepository:
                 continue
             task.dependencies.append(TaskDependency(depends_on_task_id=dep_id))
 
-    async def filter_tasks(
+    async def count_open(self, task_ids: Collection[int]) -> int:
+        """How many of ``task_ids`` are not DONE.
+
+        The rows stay share-locked until commit: a concurrent move to or from DONE either
+        commits first (and is counted) or waits, then sees the caller's dependency rows.
+        """
+        if not task_ids:
+            return 0
+        # FOR SHARE cannot be combined with count(), and every row is locked, DONE or not
+        res = await self.db.execute(
+            select(Task.status)
+            .where(self._in_workspace(), Task.id.in_(set(task_ids)))
+            .with_for_update(read=True)
+        )
+        return sum(1 for s in res.scalars() if s != TaskStatus.DONE)
+
+    async def shift_open_dependency_counts(self, deltas: dict[int, int]) -> list[int]:
+        """Adds ``deltas[dep_id]`` to the open dependency count of every direct dependent
+        of ``dep_id``, in one statement; returns the ids of the dependents updated.
+
+        Dependents are touched (change_seq) so delta sync picks up their blocked state,
+        but their version is left alone: a derived change is not an edit to conflict with.
+        """
+        deltas = {task_id: delta for task_id, delta in deltas.items() if delta}
+        if not deltas:
+            return []
+        shift = values(
+            column("depends_on_task_id", Integer), column("delta", Integer), name="shift"
+        ).data(list(deltas.items()))
+        per_task = (
+            select(TaskDependency.task_id, func.sum(shift.c.delta).label("delta"))
+            .join(shift, shift.c.depends_on_task_id == TaskDependency.depends_on_task_id)
+            .group_by(TaskDependency.task_id)
+            .subquery()
+        )
+        stmt = (
+            update(Task)
+            .where(self._in_workspace(), Task.id == per_task.c.task_id)
+            .values(
+                open_dependency_count=Task.open_dependency_count + per_task.c.delta,
+                change_seq=task_change_seq.next_value(),
+            )
+            .returning(Task.id)
+            # dependents already loaded in this session are expired and reload on next get
+            .execution_options(synchronize_session="fetch")
+        )
+        res = await self.db.execute(stmt)
+        return list(res.scalars().all())
+
+    def _subtree(self, root_id: int):
+        """Recursive CTE of ``root_id`` and every task below it in the workspace."""
+        subtree = (
+            select(Task.id)
+            .where(self._in_workspace(), Task.id == root_id)
+            .cte("subtree", recursive=True)
+        )
+        # UNION rather than UNION ALL: stops even if parent links ever form a cycle
+        return subtree.union(
+            select(Task.id).where(self._in_workspace(), Task.parent_task_id == subtree.c.id)
+        )
+
+    @staticmethod
+    def _subtree_conflicts(in_subtree, *, created_by: int | None):
+        """(tasks outside the subtree depend on tasks in it, a task in it was created by
+        someone other than ``created_by``) as SQL conditions; None skips the second."""
+        outside_dependents = exists().where(
+            TaskDependency.depends_on_task_id.in_(in_subtree),
+            TaskDependency.task_id.not_in(in_subtree),
+        )
+        member = aliased(Task)
+        foreign = (
+            exists().where(member.id.in_(in_subtree), member.created_by_user_id != created_by)
+            if created_by is not None
+            else false()
+        )
+        return outside_dependents, foreign
+
+    def _root_at_version(self, root_id: int, version: int | None) -> list:
+        """Keeps an UPDATE of ``root_id``'s subtree to when the root is at ``version``."""
+        if version is None:
+            return []
+        root = aliased(Task)
+        return [
+            # the whole statement, as of its snapshot
+            exists().where(root.id == root_id, root.version == version),
+            # the root row itself, re-checked if a concurrent update of it commits first
+            or_(Task.id != root_id, Task.version == version),
+        ]
+
+    async def subtree_guard(self, root_id: int, *, created_by: int | None) -> tuple[bool, bool]:
+        """Whether tasks outside the subtree of ``root_id`` depend on tasks inside it, and
+        whether any task in it was created by someone other than ``created_by`` (None skips
+        that check); one statement."""
+        outside_dependents, foreign = self._subtree_conflicts(
+            select(self._subtree(root_id).c.id), created_by=created_by
+        )
+        row = (await self.db.execute(select(outside_dependents, foreign))).one()
+        return bool(row[0]), bool(row[1])
+
+    async def lock_subtree(self, root_id: int) -> list[Task]:
+        """``root_id`` and every task below it, with their user links. The rows stay locked
+        until commit, so no task can be added to or moved into the subtree meanwhile."""
+        q = (
+            select(Task)
+            .where(self._in_workspace(), Task.id.in_(select(self._subtree(root_id).c.id)))
+            .options(selectinload(Task.user_links))
+            .with_for_update(of=Task)
+        )
+        res = await self.db.execute(q)
+        return list(res.scalars().all())
+
+    async def version_of(self, task_id: int) -> int | None:
+        """The committed version of ``task_id``, bypassing the identity map."""
+        res = await self.db.execute(
+            select(Task.version).where(self._in_workspace(), Task.id == task_id)
+        )
+        return res.scalar_one_or_none()
+
+    async def set_subtree_archived(
         self,
+        root_id: int,
         *,
-        f: TaskFilter,
-        accessible_task_ids_subq,
-    ) -> tuple[list[Task], int]:
-        conditions = []
-        if not f.include_archived:
-            conditions.append(Task.is_archived.is_(False))
-        if f.status_in:
-            conditions.append(Task.status.in_(f.status_in))
-        if f.priority_in:
-            conditions.append(Task.priority.in_(f.priority_in))
-        if f.due_date_from:
-            conditions.append(Task.due_date >= f.due_date_from)
-        if f.due_date_to:
-            conditions.append(Task.due_date <= f.due_date_to)
-        if f.created_from:
-            conditions.append(Task.created_at >= f.created_from)
-        if f.created_to:
-            conditions.append(Task.created_at <= f.created_to)
-
-        # Assignee / collaborator filters via TaskUserLink
-        if f.assignee_user_ids:
-            conditions.append(
-                Task.id.in_(
-                    select(TaskUserLink.task_id).where(
-                        and_(
-                            TaskUserLink.role == TaskUserRole.ASSIGNEE,
-                            TaskUserLink.user_id.in_(f.assignee_user_ids),
-                        )
-                    )
-                )
+        archived: bool,
+        user_id: int,
+        root_version: int | None = None,
+        created_by: int | None = None,
+    ) -> list[int]:
+        """Archives (or restores) ``root_id`` and its descendants in one recursive-CTE UPDATE;
+        returns the ids that changed. Tasks already in the target state keep their archive
+        stamp, version and change_seq.
+
+        Nothing changes when the root is not at ``root_version``, when ``created_by`` did not
+        create every task in the subtree, or, when archiving, when tasks outside the subtree
+        depend on it: the checks are part of the UPDATE, so no write can slip in between.
+        """
+        in_subtree = select(self._subtree(root_id).c.id)
+        outside_dependents, foreign = self._subtree_conflicts(in_subtree, created_by=created_by)
+        conditions = [
+            self._in_workspace(),
+            Task.id.in_(in_subtree),
+            Task.is_archived.is_(not archived),
+            ~foreign,
+            *self._root_at_version(root_id, root_version),
+        ]
+        if archived:
+            conditions.append(~outside_dependents)
+        stmt = (
+            update(Task)
+            .where(*conditions)
+            .values(
+                is_archived=archived,
+                archived_at=func.now() if archived else None,
+                archived_by_user_id=user_id if archived else None,
+                version=Task.version + 1,
+                change_seq=task_change_seq.next_value(),
             )
-        if f.collaborator_user_ids:
-            conditions.append(
-                Task.id.in_(
-                    select(TaskUserLink.task_id).where(
-                        and_(
-                            TaskUserLink.role == TaskUserRole.COLLABORATOR,
-                            TaskUserLink.user_id.in_(f.collaborator_user_ids),
-                        )
-                    )
-                )
+            .returning(Task.id)
+            .execution_options(synchronize_session="fetch")
+        )
+        res = await self.db.execute(stmt)
+        return list(res.scalars().all())
+
+    async def move_subtree(
+        self, root_id: int, parent_id: int | None, *, root_version: int | None = None
+    ) -> bool:
+        """Re-parents ``root_id`` (its subtree moves with it) unless ``parent_id`` lies inside
+        that subtree or the root is not at ``root_version``; False when refused."""
+        conditions = [self._in_workspace(), Task.id == root_id]
+        if root_version is not None:
+            conditions.append(Task.version == root_version)
+        if parent_id is not None:
+            conditions.append(literal(parent_id).not_in(select(self._subtree(root_id).c.id)))
+        stmt = (
+            update(Task)
+            .where(*conditions)
+            .values(
+                parent_task_id=parent_id,
+                version=Task.version + 1,
+                change_seq=task_change_seq.next_value(),
             )
-        if f.tag_names:
-            tag_names = [t.strip().lower() for t in f.tag_names if t.strip()]
-            if tag_names:
-                conditions.append(
-                    Task.id.in_(
-                        select(TaskTagLink.task_id)
-                        .join(Tag, Tag.id == TaskTagLink.tag_id)
-                        .where(Tag.name.in_(tag_names))
-                    )
-                )
+            .returning(Task.id)
+            .execution_options(synchronize_session="fetch")
+        )
+        return (await self.db.execute(stmt)).first() is not None
 
-        combine = and_ if f.logic == "AND" else or_
-        where_clause = combine(*conditions) if conditions else True
+    def _filter_shape(self, f: TaskFilter, visible_to: int | None) -> tuple[FilterShape, dict[str, Any]]:
+        shape, params = canonical_shape(f, visible_to=visible_to)
+        params["workspace_id"] = self.workspace_id
+        return shape, params
 
-        base_q = (
-            select(Task)
-            .where(Task.id.in_(accessible_task_ids_subq))
-            .where(where_clause)
+    async def filter_page(self, *, f: TaskFilter, visible_to: int | None = None) -> list[Task]:
+        """One page of the tasks matching ``f``; ``visible_to`` limits them to that
+        user's accessible tasks, None means every task in the workspace (admins)."""
+        shape, params = self._filter_shape(f, visible_to)
+        q = filter_statements.get(
+            ("page", shape),
+            lambda: select(Task)
+            .where(*shape_clauses(shape))
             .options(
                 selectinload(Task.user_links),
                 selectinload(Task.tags).selectinload(TaskTagLink.tag),
                 selectinload(Task.dependencies),
             )
             .order_by(Task.updated_at.desc())
+            .offset(bindparam("offset", type_=Integer))
+            .limit(bindparam("limit", type_=Integer)),
         )
+        params.update(offset=(f.page - 1) * f.page_size, limit=f.page_size)
+        res = await self.db.execute(q, params)
+        return list(res.scalars().all())
 
-        count_q = select(func.count()).select_from(
-            select(Task.id)
-            .where(Task.id.in_(accessible_task_ids_subq))
-            .where(where_clause)
-            .subquery()
+    async def filter_tasks(
+        self,
+        *,
+        f: TaskFilter,
+        visible_to: int | None = None,
+    ) -> tuple[list[Task], int]:
+        shape, params = self._filter_shape(f, visible_to)
+        count_q = filter_statements.get(
+            ("count", shape),
+            lambda: select(func.count()).select_from(
+                select(Task.id).where(*shape_clauses(shape)).subquery()
+            ),
         )
+        total = (await self.db.execute(count_q, params)).scalar_one()
+        tasks = await self.filter_page(f=f, visible_to=visible_to)
+        return tasks, int(total)
+
+    async def facet_counts(
+        self,
+        *,
+        f: TaskFilter,
+        facets: Collection[str],
+        limit: int,
+        visible_to: int | None = None,
+    ) -> tuple[int, dict[str, list[tuple[str, int]]]]:
+        """The total and per-facet counts of the tasks matching ``f``, in one statement.
+
+        Total, status and priority come from one GROUPING SETS scan of the matching
+        rows; tags and assignees are joined in as UNION ALL branches, each cut to its
+        ``limit`` largest values.
+        """
+        shape, params = self._filter_shape(f, visible_to)
+        requested = tuple(name for name in ("status", "priority", "tag", "assignee") if name in facets)
+        q = filter_statements.get(("facets", shape, requested), lambda: _facet_statement(shape, requested))
+        params["facet_limit"] = limit
 
-        total = (await self.db.execute(count_q)).scalar_one()
-        offset = (f.page - 1) * f.page_size
-        res = await self.db.execute(base_q.offset(offset).limit(f.page_size))
-        return list(res.scalars().all()), int(total)
+        rows = (await self.db.execute(q, params)).all()
+        total = 0
+        counts: dict[str, list[tuple[str, int]]] = {name: [] for name in facets}
+        for name, value, n in rows:
+            if name == "total":
+                total = n
+            else:
+                counts[name].append((value, n))
+        for ranked in counts.values():
+            ranked.sort(key=lambda item: (-item[1], item[0]))
+        return total, counts
 
     async def accessible_task_ids_for_user(self, user_id: int):
         # tasks created by user or where user is linked
         return (
             select(Task.id)
             .where(
+                self._in_workspace(),
                 or_(
                     Task.created_by_user_id == user_id,
                     Task.id.in_(select(TaskUserLink.task_id).where(TaskUserLink.user_id == user_id)),
@@ -199,8 +606,69 @@ class TaskRepository:
                 .label("overdue_tasks"),
             )
             .join(Task, Task.id == TaskUserLink.task_id)
-            .where(TaskUserLink.role == TaskUserRole.ASSIGNEE)
+            .where(self._in_workspace(), TaskUserLink.role == TaskUserRole.ASSIGNEE)
             .group_by(TaskUserLink.user_id)
         )
         res = await self.db.execute(q)
         return [dict(r._mapping) for r in res.all()]
+
+
+def _facet_statement(shape: FilterShape, facets: tuple[str, ...]):
+    matched = select(Task.id, Task.status, Task.priority).where(*shape_clauses(shape)).cte("matched")
+    count = func.count().label("n")
+
+    grouped = [matched.c[name] for name in ("status", "priority") if name in facets]
+    if grouped:
+        # GROUPING(col) = 0 marks the rows of col's grouping set; () gives the total
+        facet = case(
+            *((func.grouping(col) == 0, literal(col.name)) for col in grouped),
+            else_=literal("total"),
+        )
+        value = func.coalesce(*(cast(col, String) for col in grouped))
+        first = select(facet.label("facet"), value.label("value"), count).group_by(
+            func.grouping_sets(tuple_(), *(tuple_(col) for col in grouped))
+        )
+    else:
+        first = select(
+            literal("total").label("facet"), literal(None, String).label("value"), count
+        ).select_from(matched)
+    branches = [first]
+
+    def top(stmt):
+        ranked = (
+            stmt.order_by(count.desc(), literal_column("value"))
+            .limit(bindparam("facet_limit", type_=Integer))
+            .subquery()
+        )
+        return select(ranked)
+
+    if "tag" in facets:
+        branches.append(
+            top(
+                select(literal("tag").label("facet"), Tag.name.label("value"), count)
+                .select_from(matched)
+                .join(TaskTagLink, TaskTagLink.task_id == matched.c.id)
+                .join(Tag, Tag.id == TaskTagLink.tag_id)
+                .group_by(Tag.name)
+            )
+        )
+    if "assignee" in facets:
+        branches.append(
+            top(
+                select(
+                    literal("assignee").label("facet"),
+                    cast(TaskUserLink.user_id, String).label("value"),
+                    count,
+                )
+                .select_from(matched)
+                .join(
+                    TaskUserLink,
+                    and_(
+                        TaskUserLink.task_id == matched.c.id,
+                        TaskUserLink.role == TaskUserRole.ASSIGNEE,
+                    ),
+                )
+                .group_by(TaskUserLink.user_id)
+            )
+        )
+    return union_all(*branches)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from collections.abc import Collection
+
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -7,18 +9,29 @@ from app.models.user import User
 
 
 class UserRepository:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, workspace_id: int):
         self.db = db
+        self.workspace_id = workspace_id
+
+    def _select(self, *entities):
+        return select(*entities).where(User.workspace_id == self.workspace_id)
 
     async def get_by_email(self, email: str) -> User | None:
-        res = await self.db.execute(select(User).where(User.email == email))
+        res = await self.db.execute(self._select(User).where(User.email == email))
         return res.scalar_one_or_none()
 
     async def get_by_id(self, user_id: int) -> User | None:
-        res = await self.db.execute(select(User).where(User.id == user_id))
+        res = await self.db.execute(self._select(User).where(User.id == user_id))
         return res.scalar_one_or_none()
 
+    async def existing_ids(self, user_ids: Collection[int]) -> set[int]:
+        if not user_ids:
+            return set()
+        res = await self.db.execute(self._select(User.id).where(User.id.in_(set(user_ids))))
+        return set(res.scalars().all())
+
     async def create(self, user: User) -> User:
+        user.workspace_id = self.workspace_id
         self.db.add(user)
         await self.db.flush()
         return user
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from sqlalchemy import event, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
+
+from app.models.workspace import WorkspaceWriteVersion
+
+_PENDING_KEY = "pending_write_version_bumps"
+
+
+class WriteVersionRepository:
+    def __init__(self, db: AsyncSession, workspace_id: int):
+        self.db = db
+        self.workspace_id = workspace_id
+
+    def bump(self) -> None:
+        # applied once per transaction just before commit, however many writes it made
+        self.db.info.setdefault(_PENDING_KEY, set()).add(self.workspace_id)
+
+    async def current(self) -> int:
+        res = await self.db.execute(
+            select(WorkspaceWriteVersion.version).where(
+                WorkspaceWriteVersion.workspace_id == self.workspace_id
+            )
+        )
+        return res.scalar_one_or_none() or 0
+
+
+@event.listens_for(Session, "before_commit")
+def _apply_write_version_bumps(session: Session) -> None:
+    workspaces = session.info.pop(_PENDING_KEY, None)
+    if not workspaces:
+        return
+    # the row lock is only held from here to the commit right after
+    stmt = pg_insert(WorkspaceWriteVersion).values(
+        [{"workspace_id": ws, "version": 1} for ws in sorted(workspaces)]
+    )
+    session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[WorkspaceWriteVersion.workspace_id],
+            set_={"version": WorkspaceWriteVersion.version + 1},
+        )
+    )
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_write_version_bumps(session: Session, transaction: SessionTransaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
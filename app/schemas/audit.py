@@ -13,3 +13,8 @@ class AuditEventOut(APIModel):
     action: str
     details: str | None
     created_at: datetime
+
+
+class AuditEventPage(APIModel):
+    items: list[AuditEventOut]
+    next_cursor: str | None = None
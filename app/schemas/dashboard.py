@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from app.schemas.audit import AuditEventOut
+from app.schemas.common import APIModel
+from app.schemas.task import FacetCount, TaskOut
+
+
+class DashboardTasks(APIModel):
+    items: list[TaskOut]
+    # more tasks match than the section's limit
+    has_more: bool
+
+
+class DashboardEvents(APIModel):
+    items: list[AuditEventOut]
+    has_more: bool
+
+
+class DashboardDistribution(APIModel):
+    total: int
+    status: list[FacetCount]
+    priority: list[FacetCount]
+
+
+class DashboardOut(APIModel):
+    assigned: DashboardTasks
+    overdue: DashboardTasks
+    blocked: DashboardTasks
+    recent: DashboardEvents
+    distribution: DashboardDistribution
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from app.schemas.common import APIModel
+
+
+class PoolSettingsOut(APIModel):
+    pool_size: int
+    max_overflow: int
+    pool_timeout_seconds: float
+    pool_recycle_seconds: int
+    pool_pre_ping: bool
+    prepared_statement_cache_size: int
+    statement_cache_size: int
+
+
+class PoolStatsOut(APIModel):
+    # primary, replica or shard
+    name: str
+    # the database the pool connects to, without its password
+    url: str
+    checked_out: int
+    checked_in: int
+    overflow: int
+    max_in_use: int
+    checkouts: int
+    overflow_events: int
+    timeouts: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+    wait_seconds_p50: float
+    wait_seconds_p95: float
+    wait_seconds_p99: float
+
+
+class PoolDiagnosticsOut(APIModel):
+    # every engine shares the same pool settings
+    settings: PoolSettingsOut
+    pools: list[PoolStatsOut]
+
+
+class FilterStatementCacheOut(APIModel):
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    hit_ratio: float
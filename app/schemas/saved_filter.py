@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from pydantic import Field
+
+from app.schemas.common import APIModel
+from app.schemas.task import TaskFilter
+
+
+class SavedFilterCreate(APIModel):
+    name: str = Field(min_length=1, max_length=100)
+    # page and page_size are ignored; they are chosen when the filter is run
+    filter: TaskFilter
+
+
+class SavedFilterOut(APIModel):
+    id: int
+    name: str
+    definition: dict
+    filter_hash: str
+    created_by_user_id: int
+    created_at: datetime
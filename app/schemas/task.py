@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+from collections import Counter
 from datetime import date, datetime
-from typing import Literal
+from typing import Annotated, Any, Literal
 
-from pydantic import Field
+from pydantic import Discriminator, Field, Tag, field_validator, model_validator
 
 from app.models.enums import TaskPriority, TaskStatus, TaskUserRole
 from app.schemas.common import APIModel
@@ -47,6 +48,11 @@ class TaskOut(APIModel):
     created_by_user_id: int
     created_at: datetime
     updated_at: datetime
+    # optimistic concurrency token; also sent as the ETag header
+    version: int
+    # dependencies not yet DONE; blocked while any remain
+    open_dependency_count: int = 0
+    is_blocked: bool = False
 
     assignees: list[int] = Field(default_factory=list)
     collaborators: list[int] = Field(default_factory=list)
@@ -57,14 +63,27 @@ class TaskOut(APIModel):
 class BulkTaskUpdateItem(APIModel):
     id: int
     patch: TaskUpdate
+    # rejects the whole batch with 409 if the task has moved past this version
+    expected_version: int | None = None
 
 
 class BulkTaskUpdateRequest(APIModel):
     updates: list[BulkTaskUpdateItem]
 
+    @field_validator("updates")
+    @classmethod
+    def _one_update_per_task(cls, updates: list[BulkTaskUpdateItem]) -> list[BulkTaskUpdateItem]:
+        # each row is applied once, conditional on the version read before the batch
+        counts = Counter(item.id for item in updates)
+        duplicates = sorted(task_id for task_id, n in counts.items() if n > 1)
+        if duplicates:
+            raise ValueError(f"tasks updated more than once: {duplicates}")
+        return updates
+
 
 class BulkTaskUpdateResult(APIModel):
     updated_ids: list[int]
+    versions: dict[int, int] = Field(default_factory=dict)
 
 
 class FilterLogic(str):
@@ -72,8 +91,7 @@ class FilterLogic(str):
     OR = "OR"
 
 
-class TaskFilter(APIModel):
-    logic: Literal["AND", "OR"] = "AND"
+class TaskPredicates(APIModel):
     status_in: list[TaskStatus] | None = None
     priority_in: list[TaskPriority] | None = None
     assignee_user_ids: list[int] | None = None
@@ -83,11 +101,80 @@ class TaskFilter(APIModel):
     due_date_to: date | None = None
     created_from: datetime | None = None
     created_to: datetime | None = None
+    # has dependencies that are not DONE yet (unrelated to the manual BLOCKED status)
+    is_blocked: bool | None = None
+
+    @field_validator("tag_names")
+    @classmethod
+    def _normalize_tags(cls, tag_names: list[str] | None) -> list[str] | None:
+        # tags are stored stripped and lowercased; blank names match nothing and are dropped
+        if tag_names is None:
+            return None
+        return [name for name in (t.strip().lower() for t in tag_names) if name]
+
+
+# guardrails on TaskFilter.where: nesting levels and groups plus predicates in the tree
+MAX_FILTER_DEPTH = 4
+MAX_FILTER_NODES = 32
+
+
+class FilterPredicate(TaskPredicates):
+    """A leaf of a filter tree; every field it sets must match."""
+
+    @model_validator(mode="after")
+    def _sets_a_field(self) -> FilterPredicate:
+        if not any(value not in (None, []) for value in self.__dict__.values()):
+            raise ValueError("a filter predicate must set at least one field")
+        return self
+
+
+class FilterGroup(APIModel):
+    op: Literal["AND", "OR"]
+    items: list[FilterNode] = Field(min_length=1)
+
+
+def _node_kind(value: Any) -> str:
+    if isinstance(value, dict):
+        return "group" if "items" in value else "predicate"
+    return "group" if isinstance(value, FilterGroup) else "predicate"
+
+
+FilterNode = Annotated[
+    Annotated[FilterGroup, Tag("group")] | Annotated[FilterPredicate, Tag("predicate")],
+    Discriminator(_node_kind),
+]
+FilterGroup.model_rebuild()
+
+
+def _tree_size(node: FilterGroup | FilterPredicate) -> tuple[int, int]:
+    """(depth, node count) of a filter tree."""
+    if isinstance(node, FilterPredicate):
+        return 1, 1
+    sizes = [_tree_size(item) for item in node.items]
+    return 1 + max(depth for depth, _ in sizes), 1 + sum(count for _, count in sizes)
+
+
+class TaskFilter(TaskPredicates):
+    logic: Literal["AND", "OR"] = "AND"
+    # nested AND/OR expression, ANDed with the flat fields above, e.g.
+    # {"op": "OR", "items": [{"op": "AND", "items": [{"status_in": ["TODO"]},
+    #   {"priority_in": ["HIGH"]}]}, {"tag_names": ["urgent"]}]}
+    where: FilterNode | None = None
     include_archived: bool = False
 
     page: int = 1
     page_size: int = Field(default=20, ge=1, le=100)
 
+    @model_validator(mode="after")
+    def _bounded_tree(self) -> TaskFilter:
+        if self.where is not None:
+            depth, nodes = _tree_size(self.where)
+            if depth > MAX_FILTER_DEPTH:
+                raise ValueError(f"filter tree is nested deeper than {MAX_FILTER_DEPTH} levels")
+            if nodes > MAX_FILTER_NODES:
+                raise ValueError(f"filter tree has more than {MAX_FILTER_NODES} nodes")
+        return self
+
 
 class TaskFilterResponse(APIModel):
     items: list[TaskOut]
@@ -96,10 +183,50 @@ class TaskFilterResponse(APIModel):
     total: int
 
 
+TaskFacet = Literal["status", "priority", "tag", "assignee"]
+
+
+class TaskFacetsRequest(TaskFilter):
+    facets: list[TaskFacet] = Field(default_factory=lambda: ["status", "priority", "tag", "assignee"])
+    # most frequent values kept per tag / assignee facet
+    facet_limit: int = Field(default=20, ge=1, le=100)
+    # also return the filter page (page, page_size), so a board needs one request
+    include_items: bool = False
+
+
+class FacetCount(APIModel):
+    value: str
+    count: int
+
+
+class TaskFacetsResponse(APIModel):
+    total: int
+    facets: dict[str, list[FacetCount]]
+    items: list[TaskOut] | None = None
+
+
+class TaskTombstoneOut(APIModel):
+    task_id: int
+    reason: Literal["DELETED", "ARCHIVED"]
+    at: datetime
+
+
+class TaskChangesResponse(APIModel):
+    items: list[TaskOut]
+    tombstones: list[TaskTombstoneOut]
+    next_cursor: str
+    has_more: bool
+
+
 class DependencyUpsert(APIModel):
     depends_on_task_ids: list[int]
 
 
+class TaskMove(APIModel):
+    # None makes the task a top-level task
+    parent_task_id: int | None
+
+
 class AnalyticsDistributionItem(APIModel):
     user_id: int
     open_tasks: int
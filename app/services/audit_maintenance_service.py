@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from datetime import UTC, date, datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.repositories.audit_partition_repo import AuditPartitionRepository, add_months
+
+# serializes partition DDL across workers running maintenance at the same time
+_PARTITION_LOCK_KEY = 0x61756469  # "audi"
+
+
+class AuditMaintenanceService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.partitions = AuditPartitionRepository(db)
+
+    async def _lock(self) -> None:
+        await self.db.execute(select(func.pg_advisory_xact_lock(_PARTITION_LOCK_KEY)))
+
+    async def ensure_partitions(self, *, today: date) -> list[str]:
+        await self._lock()
+        return await self.partitions.ensure_monthly_partitions(
+            start=today, months_ahead=settings.audit_partition_months_ahead
+        )
+
+    async def apply_retention(self, *, today: date) -> list[str]:
+        await self._lock()
+        cutoff = add_months(today.replace(day=1), -settings.audit_retention_months)
+        return await self.partitions.remove_partitions_before(
+            cutoff, detach_only=settings.audit_retention_detach_only
+        )
+
+
+async def run_audit_maintenance(session_factory: async_sessionmaker[AsyncSession]) -> None:
+    today = datetime.now(UTC).date()
+    async with session_factory() as session:
+        svc = AuditMaintenanceService(session)
+        await svc.ensure_partitions(today=today)
+        await svc.apply_retention(today=today)
+        await session.commit()
@@ -10,8 +10,9 @@ from app.repositories.user_repo import UserRepository
 
 
 class AuthService:
-    def __init__(self, db: AsyncSession):
-        self.users = UserRepository(db)
+    def __init__(self, db: AsyncSession, workspace_id: int):
+        self.workspace_id = workspace_id
+        self.users = UserRepository(db, workspace_id)
 
     async def register(self, *, email: str, password: str, role: UserRole, full_name: str | None) -> User:
         existing = await self.users.get_by_email(email)
@@ -25,4 +26,6 @@ class AuthService:
         user = await self.users.get_by_email(email)
         if not user or not verify_password(password, user.password_hash):
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
-        return create_access_token(subject=str(user.id), role=user.role.value)
+        return create_access_token(
+            subject=str(user.id), role=user.role.value, workspace_id=user.workspace_id
+        )
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import date, timedelta
+from typing import Any, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import ReadSessionFactory
+from app.models.audit import AuditEvent
+from app.models.enums import TaskStatus
+from app.models.task import Task
+from app.repositories.audit_repo import AuditRepository
+from app.repositories.task_repo import TaskRepository
+from app.schemas.task import FilterGroup, FilterPredicate, TaskFilter
+
+T = TypeVar("T")
+
+OPEN_STATUSES = [TaskStatus.TODO, TaskStatus.IN_PROGRESS, TaskStatus.BLOCKED]
+RECENT_DAYS = 7
+
+
+class DashboardService:
+    """The caller's home screen: every section is read concurrently on its own read session."""
+
+    def __init__(
+        self, session_factory: ReadSessionFactory, workspace_id: int, *, read_after: int | None
+    ):
+        self.session_factory = session_factory
+        self.workspace_id = workspace_id
+        self.read_after = read_after
+
+    async def _read(self, load: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        session = self.session_factory(read_after=self.read_after, workspace_id=self.workspace_id)
+        async with session as db:
+            return await load(db)
+
+    async def _tasks(self, f: TaskFilter, limit: int) -> tuple[list[Task], bool]:
+        # one extra row tells whether the section was cut off
+        f = f.model_copy(update={"page_size": limit + 1})
+        tasks = await self._read(lambda s: TaskRepository(s, self.workspace_id).filter_page(f=f))
+        return tasks[:limit], len(tasks) > limit
+
+    async def _recent(self, user_id: int, limit: int) -> tuple[list[AuditEvent], bool]:
+        events = await self._read(
+            lambda s: AuditRepository(s, self.workspace_id).timeline_for_user(
+                user_id=user_id, days=RECENT_DAYS, limit=limit + 1
+            )
+        )
+        return events[:limit], len(events) > limit
+
+    async def _distribution(self, user_id: int) -> tuple[int, dict[str, list[tuple[str, int]]]]:
+        f = TaskFilter(assignee_user_ids=[user_id])
+        return await self._read(
+            lambda s: TaskRepository(s, self.workspace_id).facet_counts(
+                f=f, facets=("status", "priority"), limit=len(TaskStatus)
+            )
+        )
+
+    async def for_user(self, *, user_id: int, limit: int, today: date) -> dict[str, Any]:
+        # the sections are all about tasks assigned to the caller, which they can always see
+        assigned, overdue, blocked, recent, distribution = await asyncio.gather(
+            self._tasks(TaskFilter(assignee_user_ids=[user_id], status_in=OPEN_STATUSES), limit),
+            self._tasks(
+                TaskFilter(
+                    assignee_user_ids=[user_id],
+                    status_in=OPEN_STATUSES,
+                    due_date_to=today - timedelta(days=1),
+                ),
+                limit,
+            ),
+            self._tasks(
+                TaskFilter(
+                    assignee_user_ids=[user_id],
+                    status_in=OPEN_STATUSES,
+                    # marked BLOCKED by hand, or waiting on an unfinished dependency
+                    where=FilterGroup(
+                        op="OR",
+                        items=[
+                            FilterPredicate(status_in=[TaskStatus.BLOCKED]),
+                            FilterPredicate(is_blocked=True),
+                        ],
+                    ),
+                ),
+                limit,
+            ),
+            self._recent(user_id, limit),
+            self._distribution(user_id),
+        )
+        return {
+            "assigned": assigned,
+            "overdue": overdue,
+            "blocked": blocked,
+            "recent": recent,
+            "distribution": distribution,
+        }
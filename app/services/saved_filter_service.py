@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import hashlib
+
+import orjson
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.enums import UserRole
+from app.models.saved_filter import SavedFilter
+from app.models.task import Task
+from app.repositories.saved_filter_repo import SavedFilterRepository
+from app.repositories.write_version_repo import WriteVersionRepository
+from app.schemas.task import TaskFilter
+from app.services.task_service import TaskService
+
+_SET_FIELDS = ("status_in", "priority_in", "assignee_user_ids", "collaborator_user_ids")
+
+
+def canonical_filter(f: TaskFilter) -> dict:
+    """``f`` without paging, defaults or empty lists, with list fields sorted and deduplicated.
+
+    Filters that select the same tasks therefore serialize (and hash) identically.
+    """
+    data = f.model_dump(mode="json", exclude={"page", "page_size"}, exclude_defaults=True)
+    for key in _SET_FIELDS:
+        if key in data:
+            data[key] = sorted(set(data[key]))
+    if "tag_names" in data:
+        data["tag_names"] = sorted({t.strip().lower() for t in data["tag_names"] if t.strip()})
+    return {k: v for k, v in data.items() if v != []}
+
+
+def filter_hash(definition: dict) -> str:
+    return hashlib.sha256(orjson.dumps(definition, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+class SavedFilterService:
+    def __init__(self, db: AsyncSession, workspace_id: int):
+        self.filters = SavedFilterRepository(db, workspace_id)
+        self.write_versions = WriteVersionRepository(db, workspace_id)
+        self.tasks = TaskService(db, workspace_id)
+
+    async def create(self, *, name: str, f: TaskFilter, user_id: int) -> SavedFilter:
+        if await self.filters.get_by_name(name):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT, detail="Filter name already used"
+            )
+        definition = canonical_filter(f)
+        saved = SavedFilter(
+            name=name,
+            definition=definition,
+            filter_hash=filter_hash(definition),
+            created_by_user_id=user_id,
+        )
+        return await self.filters.create(saved)
+
+    async def list(self) -> list[SavedFilter]:
+        return await self.filters.list()
+
+    async def get(self, filter_id: int) -> SavedFilter:
+        saved = await self.filters.get(filter_id)
+        if saved is None:
+            raise HTTPException(status_code=404, detail="Filter not found")
+        return saved
+
+    async def delete(self, *, filter_id: int, user_id: int, role: UserRole) -> None:
+        saved = await self.get(filter_id)
+        if role != UserRole.ADMIN and saved.created_by_user_id != user_id:
+            raise HTTPException(status_code=403, detail="Not allowed")
+        await self.filters.delete(saved)
+
+    async def write_version(self) -> int:
+        return await self.write_versions.current()
+
+    async def run(
+        self, saved: SavedFilter, *, page: int, page_size: int, user_id: int, role: UserRole
+    ) -> tuple[list[Task], int]:
+        f = TaskFilter(**saved.definition, page=page, page_size=page_size)
+        return await self.tasks.filter_tasks(f=f, user_id=user_id, role=role)
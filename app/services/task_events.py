@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass, field
+
+import orjson
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, SessionTransaction
+
+from app.db.session import shard_router
+from app.db.shards import ShardRouter
+from app.models.task import Task
+from app.repositories.task_repo import TaskRepository
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "task_changes"
+_PENDING_KEY = "pending_task_events"
+# NOTIFY payloads are capped at 8000 bytes; larger visibility lists are resolved by the hub
+_MAX_PAYLOAD_BYTES = 7900
+# sent when events may have been missed; clients should refetch their views
+RESYNC = orjson.dumps({"op": "RESYNC"})
+
+
+def visible_user_ids(task: Task) -> list[int]:
+    ids = {task.created_by_user_id}
+    ids.update(link.user_id for link in task.user_links)
+    return sorted(ids)
+
+
+class TaskEventPublisher:
+    """Queues task change notifications; they are sent with NOTIFY when the session commits."""
+
+    def __init__(self, db: AsyncSession, workspace_id: int):
+        self.db = db
+        self.workspace_id = workspace_id
+
+    def publish(self, *, op: str, task: Task, actor_user_id: int) -> None:
+        self.publish_many(op=op, tasks=[task], actor_user_id=actor_user_id)
+
+    def publish_many(self, *, op: str, tasks: Iterable[Task], actor_user_id: int) -> None:
+        pending = self.db.info.setdefault(_PENDING_KEY, [])
+        for task in tasks:
+            payload = {
+                "op": op,
+                "workspace_id": self.workspace_id,
+                "task_id": task.id,
+                "actor_user_id": actor_user_id,
+                "visible_to": visible_user_ids(task),
+            }
+            encoded = orjson.dumps(payload)
+            if len(encoded) > _MAX_PAYLOAD_BYTES:
+                payload["visible_to"] = None
+                encoded = orjson.dumps(payload)
+            pending.append(encoded.decode())
+
+
+@event.listens_for(Session, "before_commit")
+def _send_pending_task_events(session: Session) -> None:
+    payloads = session.info.pop(_PENDING_KEY, None)
+    if not payloads:
+        return
+    # NOTIFY is transactional: listeners only see these once the commit succeeds
+    session.execute(
+        text(
+            "SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload"
+        ),
+        {"channel": CHANNEL, "payloads": payloads},
+    )
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_pending_task_events(session: Session, transaction: SessionTransaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
+
+
+@dataclass(eq=False)
+class Subscriber:
+    user_id: int
+    is_admin: bool
+    workspace_id: int
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(maxsize=256))
+
+    def can_see(self, workspace_id: int, visible_to: list[int]) -> bool:
+        if workspace_id != self.workspace_id:
+            return False
+        return self.is_admin or self.user_id in visible_to
+
+    def offer(self, message: bytes) -> None:
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # too slow to keep up: drop the backlog and ask the client to refetch
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+
+class TaskEventHub:
+    """One LISTEN connection per worker and database, fanned out to in-process subscribers."""
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        channel: str = CHANNEL,
+        reconnect_delay: float = 1.0,
+    ):
+        self.engine = engine
+        self.session_factory = session_factory
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self.subscribers: set[Subscriber] = set()
+        self._listener: asyncio.Task | None = None
+        self._dispatching: set[asyncio.Task] = set()
+
+    @contextlib.asynccontextmanager
+    async def subscribe(
+        self, *, user_id: int, is_admin: bool, workspace_id: int
+    ) -> AsyncIterator[asyncio.Queue]:
+        sub = Subscriber(user_id=user_id, is_admin=is_admin, workspace_id=workspace_id)
+        self.subscribers.add(sub)
+        self._ensure_listening()
+        try:
+            yield sub.queue
+        finally:
+            self.subscribers.discard(sub)
+
+    async def dispatch(self, payload: str) -> None:
+        try:
+            data = orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            logger.warning("ignoring malformed task event payload")
+            return
+        if not self.subscribers:
+            return
+
+        workspace_id = data.pop("workspace_id")
+        visible_to = data.pop("visible_to", None)
+        if visible_to is None:
+            visible_to = await self._lookup_visible_to(workspace_id, data["task_id"])
+        message = orjson.dumps(data)
+        for sub in list(self.subscribers):
+            if sub.can_see(workspace_id, visible_to):
+                sub.offer(message)
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+
+    async def _lookup_visible_to(self, workspace_id: int, task_id: int) -> list[int]:
+        async with self.session_factory() as session:
+            task = await TaskRepository(session, workspace_id).get(task_id)
+        # deleted since: only admins may still learn about it
+        return visible_user_ids(task) if task is not None else []
+
+    def _ensure_listening(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen_forever())
+
+    async def _listen_forever(self) -> None:
+        reconnecting = False
+        while True:
+            try:
+                await self._listen_once(resync=reconnecting)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("task event listener failed; reconnecting")
+            reconnecting = True
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def _listen_once(self, *, resync: bool) -> None:
+        closed = asyncio.Event()
+
+        def on_notify(_conn, _pid, _channel, payload: str) -> None:
+            task = asyncio.create_task(self.dispatch(payload))
+            self._dispatching.add(task)
+            task.add_done_callback(self._dispatching.discard)
+
+        async with self.engine.connect() as conn:
+            raw = await conn.get_raw_connection()
+            driver = raw.driver_connection
+            driver.add_termination_listener(lambda _conn: closed.set())
+            await driver.add_listener(self.channel, on_notify)
+            if resync:
+                for sub in list(self.subscribers):
+                    sub.offer(RESYNC)
+            try:
+                await closed.wait()
+            finally:
+                if not driver.is_closed():
+                    await driver.remove_listener(self.channel, on_notify)
+            # connection is gone; make sure the pool does not hand it out again
+            await conn.invalidate()
+
+
+class TaskEventHubs:
+    """A hub per database, so workspaces on their own database get their own LISTEN."""
+
+    def __init__(self, shards: ShardRouter):
+        self.shards = shards
+        self._hubs: dict[AsyncEngine, TaskEventHub] = {}
+
+    def for_workspace(self, workspace_id: int) -> TaskEventHub:
+        engine = self.shards.engine_for(workspace_id)
+        hub = self._hubs.get(engine)
+        if hub is None:
+            hub = self._hubs[engine] = TaskEventHub(
+                engine, self.shards.sessionmaker_for(workspace_id)
+            )
+        return hub
+
+    async def close(self) -> None:
+        for hub in self._hubs.values():
+            await hub.close()
+        self._hubs.clear()
+
+
+task_event_hubs = TaskEventHubs(shard_router)
@@ -5,22 +5,30 @@ from typing import Iterable
 
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
 
 from app.models.audit import AuditEvent
-from app.models.enums import TaskUserRole, UserRole
+from app.models.enums import TaskStatus, TaskUserRole, UserRole
 from app.models.task import Task
 from app.repositories.audit_repo import AuditRepository
-from app.repositories.task_repo import TaskRepository
+from app.repositories.task_repo import ChangeCursor, TaskRepository
 from app.repositories.user_repo import UserRepository
-from app.schemas.task import TaskCreate, TaskFilter, TaskUpdate
+from app.repositories.write_version_repo import WriteVersionRepository
+from app.schemas.task import TaskCreate, TaskFacetsRequest, TaskFilter, TaskTombstoneOut, TaskUpdate
+from app.services.task_events import TaskEventPublisher
+
+VERSION_CONFLICT = "Task was modified by someone else; reload it and retry"
 
 
 class TaskService:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, workspace_id: int):
         self.db = db
-        self.tasks = TaskRepository(db)
-        self.users = UserRepository(db)
-        self.audit = AuditRepository(db)
+        self.workspace_id = workspace_id
+        self.tasks = TaskRepository(db, workspace_id)
+        self.users = UserRepository(db, workspace_id)
+        self.audit = AuditRepository(db, workspace_id)
+        self.events = TaskEventPublisher(db, workspace_id)
+        self.write_versions = WriteVersionRepository(db, workspace_id)
 
     async def _require_task(self, task_id: int) -> Task:
         task = await self.tasks.get(task_id)
@@ -28,6 +36,31 @@ class TaskService:
             raise HTTPException(status_code=404, detail="Task not found")
         return task
 
+    async def _flush(self) -> None:
+        # Task UPDATE/DELETE statements carry "AND version = <loaded version>"
+        try:
+            await self.db.flush()
+        except StaleDataError:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=VERSION_CONFLICT) from None
+
+    @staticmethod
+    def _check_version(task: Task, expected_version: int | None) -> None:
+        if expected_version is not None and task.version != expected_version:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Task {task.id} is at version {task.version}, not {expected_version}",
+            )
+
+    async def _propagate_done(self, transitions: Iterable[tuple[int, TaskStatus, TaskStatus]]) -> None:
+        """Updates the open dependency counts of the direct dependents of tasks that moved
+        to or from DONE (``(task_id, old_status, new_status)``); other moves change nothing."""
+        deltas = {
+            task_id: -1 if new == TaskStatus.DONE else 1
+            for task_id, old, new in transitions
+            if (old == TaskStatus.DONE) != (new == TaskStatus.DONE)
+        }
+        await self.tasks.shift_open_dependency_counts(deltas)
+
     @staticmethod
     def _is_admin(role: UserRole) -> bool:
         return role == UserRole.ADMIN
@@ -58,8 +91,8 @@ class TaskService:
 
     async def create_task(self, *, data: TaskCreate, user_id: int) -> Task:
         # validate parent task if any
-        if data.parent_task_id is not None:
-            _ = await self._require_task(data.parent_task_id)
+        if data.parent_task_id is not None and not await self.tasks.existing_ids([data.parent_task_id]):
+            raise HTTPException(status_code=404, detail="Task not found")
 
         task = Task(
             title=data.title,
@@ -75,16 +108,17 @@ class TaskService:
         # user links
         links: list[tuple[int, TaskUserRole]] = [(u.user_id, u.role) for u in data.users]
         # validate user ids exist
-        for uid, _r in links:
-            if not await self.users.get_by_id(uid):
-                raise HTTPException(status_code=400, detail=f"User not found: {uid}")
+        user_ids = {uid for uid, _r in links}
+        missing = sorted(user_ids - await self.users.existing_ids(user_ids))
+        if missing:
+            raise HTTPException(status_code=400, detail=f"User not found: {missing[0]}")
         await self.tasks.replace_task_users(task, links)
 
         # tags
         tags = await self.tasks.upsert_tags(data.tags)
         await self.tasks.replace_task_tags(task, tags)
 
-        await self.audit.add(
+        self.audit.add(
             AuditEvent(
                 actor_user_id=user_id,
                 entity_type="TASK",
@@ -93,14 +127,27 @@ class TaskService:
                 details=f"title={task.title}",
             )
         )
-        return await self.tasks.get(task.id)  # reload with relations
+        task = await self.tasks.get(task.id)  # reload with relations
+        self.events.publish(op="CREATED", task=task, actor_user_id=user_id)
+        self.write_versions.bump()
+        return task
 
-    async def update_task(self, *, task_id: int, patch: TaskUpdate, user_id: int, role: UserRole) -> Task:
+    async def update_task(
+        self,
+        *,
+        task_id: int,
+        patch: TaskUpdate,
+        user_id: int,
+        role: UserRole,
+        expected_version: int | None = None,
+    ) -> Task:
         task = await self._require_task(task_id)
         if not await self._can_modify(task=task, user_id=user_id, role=role):
             raise HTTPException(status_code=403, detail="Not allowed")
+        self._check_version(task, expected_version)
 
         changed = False
+        old_status = task.status
         for field, value in patch.model_dump(exclude_unset=True).items():
             setattr(task, field, value)
             changed = True
@@ -108,51 +155,99 @@ class TaskService:
         if not changed:
             return task
 
-        await self.audit.add(
+        self.audit.add(
             AuditEvent(actor_user_id=user_id, entity_type="TASK", entity_id=task.id, action="UPDATED")
         )
-        await self.db.flush()
-        return await self.tasks.get(task.id)
+        new_status = task.status
+        await self._flush()
+        await self._propagate_done([(task.id, old_status, new_status)])
+        task = await self.tasks.get(task.id)
+        self.events.publish(op="UPDATED", task=task, actor_user_id=user_id)
+        self.write_versions.bump()
+        return task
 
     async def delete_task(self, *, task_id: int, user_id: int, role: UserRole) -> None:
         task = await self._require_task(task_id)
         if role != UserRole.ADMIN:
             raise HTTPException(status_code=403, detail="Only ADMIN can delete tasks")
 
-        await self.tasks.delete(task)
-        await self.audit.add(
+        # subtasks are deleted with it
+        subtree = await self.tasks.lock_subtree(task.id)
+        self.events.publish_many(op="DELETED", tasks=subtree, actor_user_id=user_id)
+        self.write_versions.bump()
+        # the dependency rows of the whole subtree go with it, so dependents stop
+        # counting any task in it as open
+        await self._propagate_done([(t.id, t.status, TaskStatus.DONE) for t in subtree])
+        await self.tasks.add_subtree_tombstones(task.id, deleted_by_user_id=user_id)
+        await self.tasks.delete_subtree(task.id)
+        self.audit.add(
             AuditEvent(actor_user_id=user_id, entity_type="TASK", entity_id=task_id, action="DELETED")
         )
-
-    async def bulk_update(self, *, updates: Iterable[tuple[int, TaskUpdate]], user_id: int, role: UserRole) -> list[int]:
-        updated_ids: list[int] = []
-        for task_id, patch in updates:
-            task = await self._require_task(task_id)
+        await self._flush()
+
+    async def bulk_update(
+        self,
+        *,
+        updates: Iterable[tuple[int, TaskUpdate, int | None]],
+        user_id: int,
+        role: UserRole,
+    ) -> dict[int, int]:
+        """Applies every patch or none; returns the new version of each updated task."""
+        updates = list(updates)
+        tasks = await self.tasks.get_many([task_id for task_id, _, _ in updates])
+        updated: list[Task] = []
+        changes: list[tuple[int, int, dict]] = []
+        transitions: list[tuple[int, TaskStatus, TaskStatus]] = []
+        for task_id, patch, expected_version in updates:
+            task = tasks.get(task_id)
+            if task is None:
+                raise HTTPException(status_code=404, detail="Task not found")
             if not await self._can_modify(task=task, user_id=user_id, role=role):
                 raise HTTPException(status_code=403, detail=f"Not allowed to update task {task_id}")
-            for field, value in patch.model_dump(exclude_unset=True).items():
-                setattr(task, field, value)
-            updated_ids.append(task_id)
-
-        await self.audit.add(
-            AuditEvent(actor_user_id=user_id, entity_type="TASK", entity_id=0, action="BULK_UPDATED",
-                      details=f"count={len(updated_ids)}")
+            self._check_version(task, expected_version)
+            updated.append(task)
+            fields = patch.model_dump(exclude_unset=True)
+            if fields:
+                changes.append((task.id, task.version, fields))
+                transitions.append((task.id, task.status, fields.get("status", task.status)))
+
+        # conditional on the versions just read, so a concurrent edit in between is a conflict
+        versions = await self.tasks.update_if_version(changes)
+        if len(versions) != len(changes):
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=VERSION_CONFLICT)
+        await self._propagate_done(transitions)
+        versions = {task.id: versions.get(task.id, task.version) for task in updated}
+        updated_ids = list(versions)
+
+        self.audit.add_many(
+            AuditEvent(
+                actor_user_id=user_id,
+                entity_type="TASK",
+                entity_id=task_id,
+                action="BULK_UPDATED",
+                details=f"count={len(updated_ids)}",
+            )
+            for task_id in updated_ids
         )
-        return updated_ids
+        self.events.publish_many(op="UPDATED", tasks=updated, actor_user_id=user_id)
+        self.write_versions.bump()
+        return versions
 
     async def filter_tasks(self, *, f: TaskFilter, user_id: int, role: UserRole):
-        # Admin can access all tasks, others only accessible ones
-        if self._is_admin(role):
-            accessible = (await self.db.execute(
-                # subquery of all task ids
-                __import__("sqlalchemy").select(__import__("app.models.task", fromlist=["Task"]).Task.id).subquery()
-            )).scalar_one_or_none()
-        accessible_subq = (
-            (await self.tasks.accessible_task_ids_for_user(user_id))
-            if not self._is_admin(role)
-            else __import__("sqlalchemy").select(__import__("app.models.task", fromlist=["Task"]).Task.id).subquery()
+        # admins see every task in the workspace, others only the ones they can access
+        visible_to = None if self._is_admin(role) else user_id
+        return await self.tasks.filter_tasks(f=f, visible_to=visible_to)
+
+    async def facets(self, *, f: TaskFacetsRequest, user_id: int, role: UserRole):
+        visible_to = None if self._is_admin(role) else user_id
+        total, counts = await self.tasks.facet_counts(
+            f=f, facets=f.facets, limit=f.facet_limit, visible_to=visible_to
         )
-        return await self.tasks.filter_tasks(f=f, accessible_task_ids_subq=accessible_subq)
+        items = None
+        if f.include_items:
+            # the facet query already counted the matches, so only the page itself is fetched
+            items = await self.tasks.filter_page(f=f, visible_to=visible_to)
+        return total, counts, items
 
     async def set_dependencies(self, *, task_id: int, depends_on_ids: list[int], user_id: int, role: UserRole) -> Task:
         task = await self._require_task(task_id)
@@ -160,16 +255,17 @@ class TaskService:
             raise HTTPException(status_code=403, detail="Not allowed")
 
         # validate dependency tasks exist
-        for dep_id in depends_on_ids:
-            _ = await self._require_task(dep_id)
+        dep_ids = set(depends_on_ids)
+        if dep_ids - await self.tasks.existing_ids(dep_ids):
+            raise HTTPException(status_code=404, detail="Task not found")
 
-        for dep_id in depends_on_ids:
-            dep_task = await self._require_task(dep_id)
-            if any(d.depends_on_task_id == task_id for d in dep_task.dependencies):
-                raise HTTPException(status_code=400, detail="Dependency cycle detected (1-hop)")
+        if await self.tasks.dependents_among(task_id, dep_ids):
+            raise HTTPException(status_code=400, detail="Dependency cycle detected (1-hop)")
 
         await self.tasks.replace_dependencies(task, depends_on_ids)
-        await self.audit.add(
+        task.open_dependency_count = await self.tasks.count_open(dep_ids - {task.id})
+        self.tasks.touch(task)
+        self.audit.add(
             AuditEvent(
                 actor_user_id=user_id,
                 entity_type="TASK",
@@ -178,40 +274,177 @@ class TaskService:
                 details=f"depends_on={depends_on_ids}",
             )
         )
-        await self.db.flush()
-        return await self.tasks.get(task.id)
+        await self._flush()
+        task = await self.tasks.get(task.id)
+        self.events.publish(op="DEPENDENCIES_UPDATED", task=task, actor_user_id=user_id)
+        self.write_versions.bump()
+        return task
+
+    async def changes_since(
+        self, *, since: ChangeCursor, limit: int, user_id: int, role: UserRole
+    ) -> tuple[list[Task], list[TaskTombstoneOut], ChangeCursor, bool]:
+        """Live tasks and tombstones changed after ``since``, in change order."""
+        admin = self._is_admin(role)
+        # before the rows: whatever commits in between is sent again next time, not lost
+        xmax, in_flight = await self.tasks.change_snapshot()
+        tasks = await self.tasks.changed_since(
+            since=since,
+            limit=limit + 1,
+            accessible_task_ids_subq=(
+                None if admin else await self.tasks.accessible_task_ids_for_user(user_id)
+            ),
+        )
+        deleted = await self.tasks.tombstones_since(
+            since=since, limit=limit + 1, user_id=None if admin else user_id
+        )
+
+        changes: list[tuple[int, Task | TaskTombstoneOut]] = []
+        for task in tasks:
+            if task.is_archived:
+                tombstone = TaskTombstoneOut(
+                    task_id=task.id, reason="ARCHIVED", at=task.archived_at or task.updated_at
+                )
+                changes.append((task.change_seq, tombstone))
+            else:
+                changes.append((task.change_seq, task))
+        for t in deleted:
+            changes.append(
+                (t.change_seq, TaskTombstoneOut(task_id=t.task_id, reason="DELETED", at=t.deleted_at))
+            )
+        changes.sort(key=lambda c: c[0])
+
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        # late commits come before ``since.seq``; a cut-off page resumes right after the last
+        # change sent, a complete one never moves the cursor back
+        next_seq = changes[-1][0] if has_more else max([since.seq, *(seq for seq, _ in changes)])
+        next_cursor = ChangeCursor(seq=next_seq, xmax=xmax, in_flight=in_flight)
+        live = [c for _, c in changes if isinstance(c, Task)]
+        tombstones = [c for _, c in changes if isinstance(c, TaskTombstoneOut)]
+        return live, tombstones, next_cursor, has_more
 
     async def analytics_distribution(self, *, today: date):
         return await self.tasks.overdue_open_counts_per_user(today=today)
-    
-    from datetime import datetime, timezone
-
-async def archive_task(self, *, task_id: int, user_id: int, role: UserRole) -> Task:
-    task = await self._require_task(task_id)
 
-    if not await self._can_modify(task=task, user_id=user_id, role=role):
-        raise HTTPException(status_code=403, detail="Not allowed")
+    async def _require_modifiable(
+        self, *, task_id: int, user_id: int, role: UserRole, expected_version: int | None
+    ) -> Task:
+        task = await self._require_task(task_id)
+        if not await self._can_modify(task=task, user_id=user_id, role=role):
+            raise HTTPException(status_code=403, detail="Not allowed")
+        self._check_version(task, expected_version)
+        return task
 
-    # Enforce dependency rule
-    if task.blocked_by:
-        raise HTTPException(
-            status_code=400,
-            detail="Cannot archive task while other tasks depend on it",
+    async def _set_subtree_archived(
+        self,
+        *,
+        task_id: int,
+        archived: bool,
+        user_id: int,
+        role: UserRole,
+        expected_version: int | None,
+    ) -> Task:
+        task = await self._require_modifiable(
+            task_id=task_id, user_id=user_id, role=role, expected_version=expected_version
+        )
+        # managers may change any subtree, everyone else only subtrees they created entirely
+        created_by = None if self._is_manager(role) else user_id
+        changed_ids = await self.tasks.set_subtree_archived(
+            task.id,
+            archived=archived,
+            user_id=user_id,
+            root_version=expected_version,
+            created_by=created_by,
+        )
+        # the root should have changed; with nothing changed at all, the guards may have
+        # stopped descendants of a root already in the target state
+        root_refused = task.id not in changed_ids and task.is_archived != archived
+        if root_refused or not changed_ids:
+            await self._check_subtree_guards(task, archived=archived, created_by=created_by)
+        if root_refused:
+            # the root was changed concurrently; rolling back undoes any descendants
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=VERSION_CONFLICT)
+        if not changed_ids:
+            return task
+        action = "ARCHIVED" if archived else "RESTORED"
+        # one record for the whole subtree
+        self.audit.add(
+            AuditEvent(
+                actor_user_id=user_id,
+                entity_type="TASK",
+                entity_id=task.id,
+                action=action,
+                details=f"subtree_count={len(changed_ids)}",
+            )
+        )
+        changed = await self.tasks.get_many(changed_ids)
+        self.events.publish_many(op=action, tasks=changed.values(), actor_user_id=user_id)
+        self.write_versions.bump()
+        return changed.get(task.id) or await self.tasks.get(task.id)
+
+    async def _check_subtree_guards(
+        self, task: Task, *, archived: bool, created_by: int | None
+    ) -> None:
+        """Raises the error for whichever guard of set_subtree_archived stopped it."""
+        has_outside_dependents, has_foreign = await self.tasks.subtree_guard(
+            task.id, created_by=created_by
         )
+        if has_foreign:
+            raise HTTPException(status_code=403, detail="Not allowed to modify every task in the subtree")
+        if archived and has_outside_dependents:
+            raise HTTPException(
+                status_code=400,
+                detail="Cannot archive task while other tasks depend on it",
+            )
 
-    task.is_archived = True
-    task.archived_at = datetime.now(timezone.utc)
-    task.archived_by_user_id = user_id
+    async def archive_task(
+        self, *, task_id: int, user_id: int, role: UserRole, expected_version: int | None = None
+    ) -> Task:
+        """Archives the task and every task below it."""
+        return await self._set_subtree_archived(
+            task_id=task_id, archived=True, user_id=user_id, role=role, expected_version=expected_version
+        )
 
-    await self.audit.add(
-        AuditEvent(
-            actor_user_id=user_id,
-            entity_type="TASK",
-            entity_id=task.id,
-            action="ARCHIVED",
+    async def restore_task(
+        self, *, task_id: int, user_id: int, role: UserRole, expected_version: int | None = None
+    ) -> Task:
+        """Restores the task and every archived task below it."""
+        return await self._set_subtree_archived(
+            task_id=task_id, archived=False, user_id=user_id, role=role, expected_version=expected_version
         )
-    )
 
-    await self.db.flush()
-    return task
+    async def move_task(
+        self,
+        *,
+        task_id: int,
+        parent_task_id: int | None,
+        user_id: int,
+        role: UserRole,
+        expected_version: int | None = None,
+    ) -> Task:
+        """Re-parents the task; its subtree moves with it."""
+        task = await self._require_modifiable(
+            task_id=task_id, user_id=user_id, role=role, expected_version=expected_version
+        )
+        if parent_task_id == task.parent_task_id:
+            return task
+        if parent_task_id is not None and not await self.tasks.existing_ids([parent_task_id]):
+            raise HTTPException(status_code=404, detail="Task not found")
+        if not await self.tasks.move_subtree(task.id, parent_task_id, root_version=expected_version):
+            if expected_version is not None and await self.tasks.version_of(task.id) != expected_version:
+                raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=VERSION_CONFLICT)
+            raise HTTPException(status_code=400, detail="Cannot move a task below itself")
 
+        self.audit.add(
+            AuditEvent(
+                actor_user_id=user_id,
+                entity_type="TASK",
+                entity_id=task.id,
+                action="MOVED",
+                details=f"parent_task_id={parent_task_id}",
+            )
+        )
+        task = await self.tasks.get(task.id)
+        self.events.publish(op="MOVED", task=task, actor_user_id=user_id)
+        self.write_versions.bump()
+        return task
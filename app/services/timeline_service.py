@@ -1,15 +1,68 @@
 from __future__ import annotations
 
+from datetime import datetime
+
+from fastapi import HTTPException
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.pagination import decode_cursor, encode_cursor
 from app.repositories.audit_repo import AuditRepository
-from app.schemas.audit import AuditEventOut
+from app.schemas.audit import AuditEventOut, AuditEventPage
+
+_events_adapter = TypeAdapter(list[AuditEventOut])
+
+
+def _decode_event_cursor(cursor: str | None) -> tuple[datetime, int] | None:
+    if cursor is None:
+        return None
+    created_at, event_id = decode_cursor(cursor, size=2)
+    try:
+        return datetime.fromisoformat(created_at), int(event_id)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+
+
+def _to_page(events: list, limit: int) -> AuditEventPage:
+    has_more = len(events) > limit
+    events = events[:limit]
+    next_cursor = (
+        encode_cursor(events[-1].created_at.isoformat(), events[-1].id) if has_more else None
+    )
+    return AuditEventPage(items=_events_adapter.validate_python(events), next_cursor=next_cursor)
 
 
 class TimelineService:
-    def __init__(self, db: AsyncSession):
-        self.audit = AuditRepository(db)
+    def __init__(self, db: AsyncSession, workspace_id: int):
+        self.audit = AuditRepository(db, workspace_id)
+
+    async def for_user(
+        self,
+        *,
+        user_id: int,
+        days: int,
+        limit: int,
+        cursor: str | None = None,
+        entity_type: str | None = None,
+        action: str | None = None,
+    ) -> AuditEventPage:
+        events = await self.audit.timeline_for_user(
+            user_id=user_id,
+            days=days,
+            limit=limit + 1,
+            before=_decode_event_cursor(cursor),
+            entity_type=entity_type,
+            action=action,
+        )
+        return _to_page(events, limit)
 
-    async def for_user(self, *, user_id: int, days: int) -> list[AuditEventOut]:
-        events = await self.audit.timeline_for_user(user_id=user_id, days=days)
-        return [AuditEventOut.model_validate(e) for e in events]
+    async def for_task(
+        self, *, task_id: int, limit: int, cursor: str | None = None
+    ) -> AuditEventPage:
+        events = await self.audit.history_for_entity(
+            entity_type="TASK",
+            entity_id=task_id,
+            limit=limit + 1,
+            before=_decode_event_cursor(cursor),
+        )
+        return _to_page(events, limit)
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.models.enums import TaskStatus
+from app.repositories.audit_repo import AuditRepository
+from app.repositories.task_repo import ChangeCursor, TaskRepository
+from app.repositories.user_repo import UserRepository
+from app.schemas.task import TaskFilter
+
+logger = logging.getLogger(__name__)
+
+_NO_WORKSPACE = 0
+
+
+async def prime_hot_queries(session: AsyncSession) -> None:
+    """Runs the statements behind the busiest endpoints once, matching nothing.
+
+    That compiles them into the engine's statement cache, prepares them in this
+    connection's asyncpg statement cache and makes asyncpg introspect the enum types.
+    The workspace is a bind parameter, so priming one primes them all.
+    """
+    users = UserRepository(session, _NO_WORKSPACE)
+    tasks = TaskRepository(session, _NO_WORKSPACE)
+    await users.get_by_id(0)
+    await users.get_by_email("")
+    await tasks.get(0)
+    await tasks.get_many([0])
+    accessible = await tasks.accessible_task_ids_for_user(0)
+    for f in (TaskFilter(), TaskFilter(status_in=[TaskStatus.TODO, TaskStatus.IN_PROGRESS])):
+        await tasks.filter_tasks(f=f, visible_to=0)
+    await tasks.change_snapshot()
+    since = ChangeCursor(seq=2**62, xmax=2**62)
+    await tasks.changed_since(since=since, limit=1, accessible_task_ids_subq=accessible)
+    await tasks.tombstones_since(since=since, limit=1, user_id=0)
+    await AuditRepository(session, _NO_WORKSPACE).timeline_for_user(user_id=0, days=1, limit=1)
+
+
+async def _prime_connection(conn) -> None:
+    async with AsyncSession(bind=conn) as session:
+        await prime_hot_queries(session)
+        await session.rollback()
+
+
+async def warm_up_engine(engine: AsyncEngine, *, connections: int) -> None:
+    """Opens ``connections`` pooled connections concurrently and primes each one."""
+    started = time.perf_counter()
+    async with contextlib.AsyncExitStack() as stack:
+        # hold every connection until all are open so the pool cannot hand back the same one
+        conns = await asyncio.gather(
+            *(stack.enter_async_context(engine.connect()) for _ in range(connections))
+        )
+        await asyncio.gather(*(_prime_connection(conn) for conn in conns))
+    logger.info(
+        "warmed %d connections to %s in %.2fs",
+        connections,
+        engine.url.render_as_string(hide_password=True),
+        time.perf_counter() - started,
+    )
@@ -0,0 +1,7 @@
+"""Performance tools: a synthetic dataset seeder, an HTTP load driver and micro-benchmarks.
+
+python -m benchmarks.seed --users 10000 --tasks 1000000 --reset
+python -m benchmarks.load --base-url http://localhost:8000 --duration 60 --out results.json
+python -m benchmarks.report results.json baseline.json
+python -m benchmarks.micro --sizes 1 100 1000 10000
+"""
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from app.models.enums import TaskPriority, TaskStatus, TaskUserRole, UserRole
+
+# every seeded user shares this password so the load driver can log in as any of them
+PASSWORD = "Bench@1234"
+
+_STATUS_WEIGHTS = {
+    TaskStatus.TODO: 35,
+    TaskStatus.IN_PROGRESS: 25,
+    TaskStatus.DONE: 35,
+    TaskStatus.BLOCKED: 5,
+}
+_PRIORITY_WEIGHTS = {
+    TaskPriority.LOW: 25,
+    TaskPriority.MEDIUM: 45,
+    TaskPriority.HIGH: 22,
+    TaskPriority.CRITICAL: 8,
+}
+_VERBS = (
+    "Fix",
+    "Review",
+    "Draft",
+    "Ship",
+    "Refactor",
+    "Plan",
+    "Test",
+    "Document",
+    "Migrate",
+    "Audit",
+)
+_NOUNS = (
+    "billing",
+    "onboarding",
+    "search",
+    "reports",
+    "exports",
+    "alerts",
+    "sync",
+    "dashboard",
+    "api",
+    "auth",
+)
+
+
+def user_email(user_id: int) -> str:
+    return f"bench-user-{user_id}@bench.local"
+
+
+def user_role(user_id: int) -> UserRole:
+    # user 1 is always an admin; roughly 1% admins and 9% managers overall
+    if user_id == 1 or user_id % 100 == 0:
+        return UserRole.ADMIN
+    if user_id % 10 == 0:
+        return UserRole.MANAGER
+    return UserRole.MEMBER
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    users: int = 10_000
+    tasks: int = 1_000_000
+    tags: int = 500
+    subtask_ratio: float = 0.2
+    dependency_ratio: float = 0.1
+    max_tags_per_task: int = 3
+    max_collaborators: int = 2
+    audit_events_per_task: int = 3
+    history_days: int = 365
+    seed: int = 42
+    workspace_id: int = 1
+
+
+@dataclass
+class TaskChunk:
+    tasks: list[tuple] = field(default_factory=list)
+    user_links: list[tuple] = field(default_factory=list)
+    tag_links: list[tuple] = field(default_factory=list)
+    dependencies: list[tuple] = field(default_factory=list)
+    audit_events: list[tuple] = field(default_factory=list)
+
+
+USER_COLUMNS = ("id", "workspace_id", "email", "full_name", "role", "password_hash", "created_at")
+TAG_COLUMNS = ("id", "workspace_id", "name")
+TASK_COLUMNS = (
+    "id",
+    "workspace_id",
+    "title",
+    "description",
+    "status",
+    "priority",
+    "due_date",
+    "is_archived",
+    "archived_at",
+    "archived_by_user_id",
+    "created_by_user_id",
+    "parent_task_id",
+    "created_at",
+    "updated_at",
+)
+USER_LINK_COLUMNS = ("task_id", "user_id", "role")
+TAG_LINK_COLUMNS = ("task_id", "tag_id")
+DEPENDENCY_COLUMNS = ("task_id", "depends_on_task_id")
+AUDIT_COLUMNS = (
+    "workspace_id",
+    "actor_user_id",
+    "entity_type",
+    "entity_id",
+    "action",
+    "details",
+    "created_at",
+)
+
+
+def user_rows(spec: DatasetSpec, *, password_hash: str, now: datetime) -> list[tuple]:
+    rng = random.Random(spec.seed)
+    return [
+        (
+            uid,
+            spec.workspace_id,
+            user_email(uid),
+            f"Bench User {uid}",
+            user_role(uid).value,
+            password_hash,
+            now - timedelta(days=rng.uniform(spec.history_days, spec.history_days * 2)),
+        )
+        for uid in range(1, spec.users + 1)
+    ]
+
+
+def tag_rows(spec: DatasetSpec) -> list[tuple]:
+    return [(tid, spec.workspace_id, f"tag-{tid:04d}") for tid in range(1, spec.tags + 1)]
+
+
+def task_chunk(spec: DatasetSpec, *, first_id: int, last_id: int, now: datetime) -> TaskChunk:
+    """Rows for tasks ``first_id..last_id`` and everything hanging off them.
+
+    Seeded per chunk so any chunk can be regenerated on its own. Parents and
+    dependencies only point at lower ids, which keeps subtask trees and the
+    dependency graph acyclic.
+    """
+    rng = random.Random(spec.seed * 1_000_003 + first_id)
+    statuses = list(_STATUS_WEIGHTS)
+    status_weights = list(_STATUS_WEIGHTS.values())
+    priorities = list(_PRIORITY_WEIGHTS)
+    priority_weights = list(_PRIORITY_WEIGHTS.values())
+    chunk = TaskChunk()
+
+    for task_id in range(first_id, last_id + 1):
+        creator = rng.randint(1, spec.users)
+        created_at = now - timedelta(days=rng.uniform(0, spec.history_days))
+        age = (now - created_at).total_seconds()
+        updated_at = created_at + timedelta(seconds=rng.uniform(0, min(age, 30 * 86400)))
+        status = rng.choices(statuses, status_weights)[0]
+        priority = rng.choices(priorities, priority_weights)[0]
+        due_date = (
+            (created_at + timedelta(days=rng.randint(1, 60))).date() if rng.random() < 0.7 else None
+        )
+        archived = status == TaskStatus.DONE and rng.random() < 0.15
+        parent = None
+        if task_id > 1 and rng.random() < spec.subtask_ratio:
+            parent = rng.randint(max(1, task_id - 5000), task_id - 1)
+
+        chunk.tasks.append(
+            (
+                task_id,
+                spec.workspace_id,
+                f"{rng.choice(_VERBS)} {rng.choice(_NOUNS)} #{task_id}",
+                f"Synthetic task {task_id}" if rng.random() < 0.5 else None,
+                status.value,
+                priority.value,
+                due_date,
+                archived,
+                updated_at if archived else None,
+                creator if archived else None,
+                creator,
+                parent,
+                created_at,
+                updated_at,
+            )
+        )
+
+        linked: set[int] = set()
+        if rng.random() < 0.9:
+            assignee = rng.randint(1, spec.users)
+            linked.add(assignee)
+            chunk.user_links.append((task_id, assignee, TaskUserRole.ASSIGNEE.value))
+        for _ in range(rng.randint(0, spec.max_collaborators)):
+            collaborator = rng.randint(1, spec.users)
+            if collaborator not in linked:
+                linked.add(collaborator)
+                chunk.user_links.append((task_id, collaborator, TaskUserRole.COLLABORATOR.value))
+
+        n_tags = min(rng.randint(0, spec.max_tags_per_task), spec.tags)
+        for tag_id in rng.sample(range(1, spec.tags + 1), n_tags):
+            chunk.tag_links.append((task_id, tag_id))
+
+        if task_id > 1 and rng.random() < spec.dependency_ratio:
+            n_deps = min(rng.randint(1, 2), task_id - 1)
+            for dep in rng.sample(range(max(1, task_id - 10_000), task_id), n_deps):
+                chunk.dependencies.append((task_id, dep))
+
+        chunk.audit_events.append(
+            (
+                spec.workspace_id,
+                creator,
+                "TASK",
+                task_id,
+                "CREATED",
+                f"title=#{task_id}",
+                created_at,
+            )
+        )
+        for _ in range(spec.audit_events_per_task - 1):
+            at = created_at + (updated_at - created_at) * rng.random()
+            actor = creator if rng.random() < 0.5 else rng.randint(1, spec.users)
+            chunk.audit_events.append(
+                (spec.workspace_id, actor, "TASK", task_id, "UPDATED", None, at)
+            )
+
+    return chunk
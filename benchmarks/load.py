@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+import httpx
+
+from app.models.enums import TaskPriority, TaskStatus, UserRole
+from benchmarks.dataset import PASSWORD, user_email, user_role
+from benchmarks.report import EndpointSamples, compare, summarize
+
+# relative request frequencies of the replayed endpoint mix
+DEFAULT_MIX = {
+    "filter": 30,
+    "get": 30,
+    "create": 10,
+    "bulk_patch": 5,
+    "analytics": 10,
+    "timeline": 15,
+}
+
+
+@dataclass(frozen=True)
+class LoadConfig:
+    base_url: str = "http://localhost:8000"
+    duration: float = 60.0
+    warmup: float = 5.0
+    concurrency: int = 32
+    accounts: int = 50
+    users: int = 10_000
+    tasks: int = 1_000_000
+    tags: int = 500
+    seed: int = 1
+
+
+@dataclass
+class Account:
+    user_id: int
+    role: UserRole
+    headers: dict[str, str]
+
+
+class Scenario:
+    """Builds one request per call for each endpoint of the mix."""
+
+    def __init__(self, client: httpx.AsyncClient, config: LoadConfig, accounts: list[Account]):
+        self.client = client
+        self.config = config
+        self.accounts = accounts
+        self.managers = [
+            a for a in accounts if a.role in (UserRole.ADMIN, UserRole.MANAGER)
+        ] or accounts
+
+    def _task_id(self, rng: random.Random) -> int:
+        return rng.randint(1, self.config.tasks)
+
+    def _tag(self, rng: random.Random) -> str:
+        return f"tag-{rng.randint(1, self.config.tags):04d}"
+
+    async def filter(self, rng: random.Random) -> httpx.Response:
+        body: dict = {"page": rng.randint(1, 3), "page_size": 20}
+        if rng.random() < 0.7:
+            body["status_in"] = rng.sample([s.value for s in TaskStatus], rng.randint(1, 2))
+        if rng.random() < 0.5:
+            body["priority_in"] = rng.sample([p.value for p in TaskPriority], rng.randint(1, 2))
+        if rng.random() < 0.3:
+            body["tag_names"] = [self._tag(rng)]
+        return await self.client.post(
+            "/tasks/filter", json=body, headers=rng.choice(self.accounts).headers
+        )
+
+    async def get(self, rng: random.Random) -> httpx.Response:
+        # mostly managers and admins, who can read any task; members often get 403
+        account = rng.choice(self.managers if rng.random() < 0.8 else self.accounts)
+        return await self.client.get(f"/tasks/{self._task_id(rng)}", headers=account.headers)
+
+    async def create(self, rng: random.Random) -> httpx.Response:
+        account = rng.choice(self.accounts)
+        body = {
+            "title": f"load test task {rng.randint(0, 10**9)}",
+            "priority": rng.choice([p.value for p in TaskPriority]),
+            "users": [{"user_id": rng.randint(1, self.config.users), "role": "ASSIGNEE"}],
+            "tags": [self._tag(rng) for _ in range(rng.randint(0, 3))],
+        }
+        return await self.client.post("/tasks", json=body, headers=account.headers)
+
+    async def bulk_patch(self, rng: random.Random) -> httpx.Response:
+        updates = [
+            {"id": task_id, "patch": {"priority": rng.choice([p.value for p in TaskPriority])}}
+            for task_id in {self._task_id(rng) for _ in range(10)}
+        ]
+        return await self.client.patch(
+            "/tasks/bulk", json={"updates": updates}, headers=rng.choice(self.managers).headers
+        )
+
+    async def analytics(self, rng: random.Random) -> httpx.Response:
+        path = rng.choice(("/analytics/task-distribution", "/analytics/overdue"))
+        return await self.client.get(path, headers=rng.choice(self.accounts).headers)
+
+    async def timeline(self, rng: random.Random) -> httpx.Response:
+        return await self.client.get(
+            "/timeline", params={"days": 30, "limit": 50}, headers=rng.choice(self.accounts).headers
+        )
+
+
+async def login(client: httpx.AsyncClient, config: LoadConfig) -> list[Account]:
+    step = max(config.users // config.accounts, 1)
+    user_ids = sorted({1, *range(step, config.users + 1, step)})[: config.accounts]
+    accounts = []
+    for uid in user_ids:
+        r = await client.post(
+            "/auth/token", data={"username": user_email(uid), "password": PASSWORD}
+        )
+        r.raise_for_status()
+        token = r.json()["access_token"]
+        accounts.append(Account(uid, user_role(uid), {"Authorization": f"Bearer {token}"}))
+    return accounts
+
+
+async def run(
+    config: LoadConfig,
+    mix: dict[str, int] = DEFAULT_MIX,
+    *,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> dict:
+    limits = httpx.Limits(
+        max_connections=config.concurrency, max_keepalive_connections=config.concurrency
+    )
+    async with httpx.AsyncClient(
+        base_url=config.base_url, timeout=30.0, limits=limits, transport=transport
+    ) as client:
+        scenario = Scenario(client, config, await login(client, config))
+        names = list(mix)
+        weights = list(mix.values())
+        actions: dict[str, Callable[[random.Random], Awaitable[httpx.Response]]] = {
+            name: getattr(scenario, name) for name in names
+        }
+        samples = {name: EndpointSamples() for name in names}
+
+        started = time.perf_counter()
+        measure_from = started + config.warmup
+        stop_at = measure_from + config.duration
+
+        async def worker(index: int) -> None:
+            rng = random.Random(config.seed * 10_007 + index)
+            while (now := time.perf_counter()) < stop_at:
+                name = rng.choices(names, weights)[0]
+                status = None
+                try:
+                    status = (await actions[name](rng)).status_code
+                except httpx.HTTPError:
+                    pass
+                if now >= measure_from:
+                    samples[name].record(latency=time.perf_counter() - now, status=status)
+
+        await asyncio.gather(*(worker(i) for i in range(config.concurrency)))
+
+    result = summarize(samples, duration=config.duration)
+    result["config"] = {**config.__dict__, "mix": mix}
+    result["finished_at"] = datetime.now(UTC).isoformat()
+    return result
+
+
+def main() -> None:
+    defaults = LoadConfig()
+    parser = argparse.ArgumentParser(
+        description="Replay a weighted endpoint mix against a running API."
+    )
+    parser.add_argument("--base-url", default=defaults.base_url)
+    parser.add_argument(
+        "--duration", type=float, default=defaults.duration, help="measured seconds"
+    )
+    parser.add_argument(
+        "--warmup", type=float, default=defaults.warmup, help="unmeasured seconds first"
+    )
+    parser.add_argument("--concurrency", type=int, default=defaults.concurrency)
+    parser.add_argument(
+        "--accounts", type=int, default=defaults.accounts, help="seeded users to log in as"
+    )
+    parser.add_argument(
+        "--users", type=int, default=defaults.users, help="users in the seeded dataset"
+    )
+    parser.add_argument(
+        "--tasks", type=int, default=defaults.tasks, help="tasks in the seeded dataset"
+    )
+    parser.add_argument(
+        "--tags", type=int, default=defaults.tags, help="tags in the seeded dataset"
+    )
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--mix", type=json.loads, default=DEFAULT_MIX, help="e.g. '{\"get\": 1}'")
+    parser.add_argument("--out", type=Path, help="write the JSON report here")
+    parser.add_argument("--baseline", type=Path, help="fail if slower than this stored report")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args()
+
+    config = LoadConfig(
+        base_url=args.base_url,
+        duration=args.duration,
+        warmup=args.warmup,
+        concurrency=args.concurrency,
+        accounts=args.accounts,
+        users=args.users,
+        tasks=args.tasks,
+        tags=args.tags,
+        seed=args.seed,
+    )
+    result = asyncio.run(run(config, args.mix))
+    report = json.dumps(result, indent=2)
+    if args.out:
+        args.out.write_text(report + "\n")
+    print(report)
+
+    if args.baseline:
+        regressions = compare(
+            result, json.loads(args.baseline.read_text()), tolerance=args.tolerance
+        )
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
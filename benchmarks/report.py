@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+@dataclass
+class EndpointSamples:
+    latencies: list[float] = field(default_factory=list)
+    statuses: Counter[str] = field(default_factory=Counter)
+    errors: int = 0
+
+    def record(self, *, latency: float, status: int | None) -> None:
+        self.latencies.append(latency)
+        self.statuses[str(status) if status is not None else "exception"] += 1
+        if status is None or status >= 500:
+            self.errors += 1
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def summarize(samples: dict[str, EndpointSamples], *, duration: float) -> dict:
+    endpoints = {}
+    for name, s in sorted(samples.items()):
+        endpoints[name] = {
+            "requests": len(s.latencies),
+            "errors": s.errors,
+            "throughput_rps": round(len(s.latencies) / duration, 2) if duration else 0.0,
+            "p50_ms": round(percentile(s.latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(s.latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(s.latencies, 99) * 1000, 2),
+            "statuses": dict(sorted(s.statuses.items())),
+        }
+    total = sum(e["requests"] for e in endpoints.values())
+    return {
+        "duration_seconds": round(duration, 2),
+        "requests": total,
+        "throughput_rps": round(total / duration, 2) if duration else 0.0,
+        "endpoints": endpoints,
+    }
+
+
+def compare(current: dict, baseline: dict, *, tolerance: float) -> list[str]:
+    """Regressions of ``current`` against ``baseline``; empty when within ``tolerance``."""
+    regressions: list[str] = []
+    for name, base in baseline["endpoints"].items():
+        cur = current["endpoints"].get(name)
+        if cur is None:
+            regressions.append(f"{name}: missing from current run")
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            if base[metric] and cur[metric] > base[metric] * (1 + tolerance):
+                regressions.append(f"{name}: {metric} {cur[metric]} > baseline {base[metric]}")
+        if base["throughput_rps"] and cur["throughput_rps"] < base["throughput_rps"] * (
+            1 - tolerance
+        ):
+            regressions.append(
+                f"{name}: throughput {cur['throughput_rps']} rps < baseline {base['throughput_rps']} rps"
+            )
+        base_error_rate = base["errors"] / max(base["requests"], 1)
+        cur_error_rate = cur["errors"] / max(cur["requests"], 1)
+        if cur_error_rate > base_error_rate + 0.001:
+            regressions.append(
+                f"{name}: error rate {cur_error_rate:.2%} > baseline {base_error_rate:.2%}"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare a load-test result with a stored baseline."
+    )
+    parser.add_argument("results", type=Path)
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed relative slowdown")
+    args = parser.parse_args()
+
+    regressions = compare(
+        json.loads(args.results.read_text()),
+        json.loads(args.baseline.read_text()),
+        tolerance=args.tolerance,
+    )
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if regressions:
+        sys.exit(1)
+    print("no regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from datetime import UTC, datetime
+
+import asyncpg
+
+from app.core.config import settings
+from app.core.security import hash_password
+from benchmarks.dataset import (
+    AUDIT_COLUMNS,
+    DEPENDENCY_COLUMNS,
+    PASSWORD,
+    TAG_COLUMNS,
+    TAG_LINK_COLUMNS,
+    TASK_COLUMNS,
+    USER_COLUMNS,
+    USER_LINK_COLUMNS,
+    DatasetSpec,
+    tag_rows,
+    task_chunk,
+    user_rows,
+)
+
+# same backfill as the migration that added the column: dependencies can point into
+# earlier chunks, so the counts are computed once everything is loaded
+_OPEN_DEPENDENCY_COUNTS = """
+UPDATE tasks
+SET open_dependency_count = counts.n
+FROM (
+    SELECT d.task_id, count(*) AS n
+    FROM task_dependencies d
+    JOIN tasks dep ON dep.id = d.depends_on_task_id
+    WHERE dep.status <> 'DONE'
+    GROUP BY d.task_id
+) AS counts
+WHERE tasks.id = counts.task_id
+"""
+
+_SEEDED_TABLES = (
+    "audit_events",
+    "task_tombstones",
+    "task_dependencies",
+    "task_tag_links",
+    "task_user_links",
+    "tasks",
+    "tags",
+    "users",
+)
+
+
+def asyncpg_dsn(database_url: str) -> str:
+    return database_url.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+
+async def seed(
+    dsn: str,
+    spec: DatasetSpec,
+    *,
+    reset: bool = False,
+    chunk_size: int = 20_000,
+    log=print,
+) -> dict[str, int]:
+    """Bulk-load ``spec`` with COPY; returns the number of rows written per table."""
+    now = datetime.now(UTC)
+    counts = dict.fromkeys(_SEEDED_TABLES, 0)
+    conn = await asyncpg.connect(dsn)
+    try:
+        if reset:
+            await conn.execute(f"TRUNCATE {', '.join(_SEEDED_TABLES)} RESTART IDENTITY CASCADE")
+        elif await conn.fetchval("SELECT EXISTS (SELECT 1 FROM users)"):
+            raise SystemExit("database already has users; pass --reset to replace them")
+
+        # one bcrypt hash shared by every user: hashing 10k passwords would dominate seeding
+        users = user_rows(spec, password_hash=hash_password(PASSWORD), now=now)
+        await conn.copy_records_to_table("users", records=users, columns=USER_COLUMNS)
+        await conn.copy_records_to_table("tags", records=tag_rows(spec), columns=TAG_COLUMNS)
+        counts["users"], counts["tags"] = spec.users, spec.tags
+
+        started = time.perf_counter()
+        for first_id in range(1, spec.tasks + 1, chunk_size):
+            last_id = min(first_id + chunk_size - 1, spec.tasks)
+            chunk = task_chunk(spec, first_id=first_id, last_id=last_id, now=now)
+            async with conn.transaction():
+                for table, rows, columns in (
+                    ("tasks", chunk.tasks, TASK_COLUMNS),
+                    ("task_user_links", chunk.user_links, USER_LINK_COLUMNS),
+                    ("task_tag_links", chunk.tag_links, TAG_LINK_COLUMNS),
+                    ("task_dependencies", chunk.dependencies, DEPENDENCY_COLUMNS),
+                    ("audit_events", chunk.audit_events, AUDIT_COLUMNS),
+                ):
+                    await conn.copy_records_to_table(table, records=rows, columns=columns)
+                    counts[table] += len(rows)
+            log(f"tasks {last_id}/{spec.tasks} ({time.perf_counter() - started:.1f}s)")
+        await conn.execute(_OPEN_DEPENDENCY_COUNTS)
+
+        # ids were written explicitly, so move the sequences past them
+        for table in ("users", "tags", "tasks"):
+            await conn.execute(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"(SELECT coalesce(max(id), 0) + 1 FROM {table}), false)"
+            )
+        await conn.execute("ANALYZE")
+    finally:
+        await conn.close()
+    return counts
+
+
+def main() -> None:
+    defaults = DatasetSpec()
+    parser = argparse.ArgumentParser(description="Seed Postgres with a synthetic task dataset.")
+    parser.add_argument("--database-url", default=settings.database_url)
+    parser.add_argument("--users", type=int, default=defaults.users)
+    parser.add_argument("--tasks", type=int, default=defaults.tasks)
+    parser.add_argument("--tags", type=int, default=defaults.tags)
+    parser.add_argument("--subtask-ratio", type=float, default=defaults.subtask_ratio)
+    parser.add_argument("--dependency-ratio", type=float, default=defaults.dependency_ratio)
+    parser.add_argument("--audit-events-per-task", type=int, default=defaults.audit_events_per_task)
+    parser.add_argument("--history-days", type=int, default=defaults.history_days)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--workspace-id", type=int, default=defaults.workspace_id)
+    parser.add_argument("--chunk-size", type=int, default=20_000)
+    parser.add_argument("--reset", action="store_true", help="truncate existing data first")
+    args = parser.parse_args()
+
+    spec = DatasetSpec(
+        users=args.users,
+        tasks=args.tasks,
+        tags=args.tags,
+        subtask_ratio=args.subtask_ratio,
+        dependency_ratio=args.dependency_ratio,
+        audit_events_per_task=args.audit_events_per_task,
+        history_days=args.history_days,
+        seed=args.seed,
+        workspace_id=args.workspace_id,
+    )
+    counts = asyncio.run(
+        seed(asyncpg_dsn(args.database_url), spec, reset=args.reset, chunk_size=args.chunk_size)
+    )
+    for table, n in counts.items():
+        print(f"{table:>20}: {n}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import asyncio
+import time
+
+import pytest
+
+from app.api.routes.analytics import analytics_cache, refresh_analytics_cache
+from app.core.cache import SingleFlightCache
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load():
+    cache = SingleFlightCache(ttl=60)
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    results = await asyncio.gather(*(cache.get_or_load("k", load) for _ in range(20)))
+    assert results == [1] * 20
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_served_while_refreshing():
+    cache = SingleFlightCache(ttl=0, stale_ttl=60)
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    assert await cache.get_or_load("k", load) == 1
+    # expired but within the stale window: old value now, refresh in background
+    assert await cache.get_or_load("k", load) == 1
+    await asyncio.sleep(0)
+    assert calls == 2
+    assert await cache.get_or_load("k", load) == 2
+
+
+@pytest.mark.asyncio
+async def test_refreshes_do_not_count_as_reads():
+    now = [0.0]
+    cache = SingleFlightCache(ttl=10, stale_ttl=10, clock=lambda: now[0])
+
+    async def load():
+        return now[0]
+
+    await cache.get_or_load("read", load)
+    await cache.refresh("never read", load)
+    assert cache.keys_read_within(5) == ["read"]
+    now[0] = 8
+    await cache.refresh("read", load)
+    assert cache.keys_read_within(5) == []
+    await cache.get_or_load("read", load)
+    assert cache.keys_read_within(5) == ["read"]
+
+
+@pytest.mark.asyncio
+async def test_refresh_rebuilds_recently_read_workspaces_once(
+    client, admin_headers, session_factory, monkeypatch
+):
+    for path in ("/analytics/task-distribution", "/analytics/overdue"):
+        r = await client.get(path, headers=admin_headers)
+        assert r.status_code == 200, r.text
+    # both endpoints are served by the same entry
+    assert len(analytics_cache.keys()) == 1
+
+    loads = []
+
+    def reads(*, workspace_id, **_):
+        loads.append(workspace_id)
+        return session_factory()
+
+    await refresh_analytics_cache(reads)
+    assert loads == [1]
+
+    # unread for longer than it could be served: left to expire
+    later = time.monotonic() + 1_000
+    monkeypatch.setattr(analytics_cache, "clock", lambda: later)
+    await refresh_analytics_cache(reads)
+    assert loads == [1]
+
+
+@pytest.mark.asyncio
+async def test_analytics_sets_cache_control(client, admin_headers):
+    r = await client.get("/analytics/task-distribution", headers=admin_headers)
+    assert r.status_code == 200, r.text
+    assert r.json() == []
+    assert "max-age" in r.headers["cache-control"]
+    assert "stale-while-revalidate" in r.headers["cache-control"]
@@ -0,0 +1,53 @@
+from datetime import UTC, date, datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+
+from app.models.enums import UserRole
+from app.models.user import User
+from app.repositories.audit_partition_repo import AuditPartitionRepository, partition_name
+
+
+@pytest.mark.asyncio
+async def test_monthly_partitions_prune_and_retention(db_session):
+    repo = AuditPartitionRepository(db_session)
+    today = datetime.now(UTC).date()
+    old_month = date(2020, 1, 1)
+
+    user = User(workspace_id=1, email="p@x.com", role=UserRole.ADMIN, password_hash="x")
+    db_session.add(user)
+    await db_session.flush()
+
+    # lands in the default partition, then moves when its month is created
+    await db_session.execute(
+        text(
+            "INSERT INTO audit_events "
+            "(workspace_id, actor_user_id, entity_type, entity_id, action, created_at) "
+            "VALUES (1, :uid, 'TASK', 1, 'CREATED', '2020-01-15 10:00:00+00')"
+        ),
+        {"uid": user.id},
+    )
+    await repo.create_monthly_partition(old_month)
+    created = await repo.ensure_monthly_partitions(start=today, months_ahead=1)
+    assert partition_name(today.replace(day=1)) in created
+
+    located = await db_session.execute(text("SELECT tableoid::regclass::text FROM audit_events"))
+    assert located.scalar_one() == partition_name(old_month)
+
+    since = datetime.now(UTC) - timedelta(days=7)
+    plan = await db_session.execute(
+        text(
+            "EXPLAIN SELECT * FROM audit_events "
+            "WHERE workspace_id = 1 AND actor_user_id = :uid AND created_at >= :since "
+            "ORDER BY created_at DESC, id DESC LIMIT 50"
+        ),
+        {"uid": user.id, "since": since},
+    )
+    plan_text = "\n".join(row[0] for row in plan.all())
+    assert partition_name(old_month) not in plan_text
+
+    removed = await repo.remove_partitions_before(today, detach_only=False)
+    assert removed == [partition_name(old_month)]
+    remaining = await repo.list_monthly_partitions()
+    assert old_month not in remaining
+    assert today.replace(day=1) in remaining
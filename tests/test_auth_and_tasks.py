@@ -69,4 +69,4 @@ async def test_register_login_and_task_flow(client):
     # timeline
     r = await client.get("/timeline?days=7", headers=headers)
     assert r.status_code == 200
-    assert len(r.json()) >= 1
+    assert len(r.json()["items"]) >= 1
@@ -0,0 +1,75 @@
+from httpx import ASGITransport
+from sqlalchemy import text
+
+from app.main import app
+from benchmarks import micro
+from benchmarks.dataset import DatasetSpec
+from benchmarks.load import DEFAULT_MIX, LoadConfig, run
+from benchmarks.report import compare
+from benchmarks.seed import asyncpg_dsn, seed
+from tests.conftest import TEST_DB_URL
+
+
+async def test_seed_and_replay_endpoint_mix(client, db_session):
+    spec = DatasetSpec(users=30, tasks=400, tags=20, seed=7)
+    counts = await seed(
+        asyncpg_dsn(TEST_DB_URL), spec, reset=True, chunk_size=150, log=lambda _: None
+    )
+    assert counts["users"] == 30
+    assert counts["tasks"] == 400
+    assert counts["audit_events"] == 400 * spec.audit_events_per_task
+    assert counts["task_user_links"] > 0 and counts["task_dependencies"] > 0
+    # open dependency counts are backfilled, not left at their default
+    stale = await db_session.scalar(
+        text(
+            "SELECT count(*) FROM tasks t WHERE t.open_dependency_count <> ("
+            "SELECT count(*) FROM task_dependencies d JOIN tasks dep ON dep.id = d.depends_on_task_id "
+            "WHERE d.task_id = t.id AND dep.status <> 'DONE')"
+        )
+    )
+    assert stale == 0
+    assert await db_session.scalar(
+        text("SELECT count(*) FROM tasks WHERE open_dependency_count > 0")
+    )
+
+    # the shared test session cannot serve concurrent requests, so replay with one worker
+    config = LoadConfig(
+        base_url="http://test",
+        duration=1.0,
+        warmup=0,
+        concurrency=1,
+        accounts=4,
+        users=spec.users,
+        tasks=spec.tasks,
+        tags=spec.tags,
+    )
+    result = await run(config, transport=ASGITransport(app=app))
+
+    assert set(result["endpoints"]) == set(DEFAULT_MIX)
+    assert result["requests"] > 0
+    for name, stats in result["endpoints"].items():
+        assert stats["errors"] == 0, (name, stats)
+        assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"]
+
+    assert compare(result, result, tolerance=0.1) == []
+    slower = {
+        **result,
+        "endpoints": {
+            n: {**s, "p95_ms": s["p95_ms"] * 2 + 1} for n, s in result["endpoints"].items()
+        },
+    }
+    assert any("p95_ms" in line for line in compare(slower, result, tolerance=0.1))
+
+
+def test_micro_benchmarks_cover_the_serialization_path():
+    results = micro.run(sizes=(3,), repeat=1)
+    assert [m.name for m in results] == [
+        "filter_parse",
+        "task_payload",
+        "task_out_build",
+        "response_model_validate",
+        "orjson_encode",
+        "end_to_end_response_model",
+        "end_to_end_fast_path",
+    ]
+    assert all(m.seconds_min > 0 and m.peak_bytes > 0 for m in results)
@@ -0,0 +1,149 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+
+from app.models.enums import TaskStatus, UserRole
+from app.schemas.task import TaskUpdate
+from app.services.task_service import TaskService
+
+
+async def _create(client, headers, title, status="TODO"):
+    r = await client.post("/tasks", headers=headers, json={"title": title, "status": status})
+    assert r.status_code == 200, r.text
+    return r.json()["id"]
+
+
+async def _blocked(client, headers):
+    r = await client.post("/tasks/filter", headers=headers, json={"is_blocked": True})
+    assert r.status_code == 200, r.text
+    return {t["title"]: t["open_dependency_count"] for t in r.json()["items"]}
+
+
+@pytest.mark.asyncio
+async def test_open_dependency_counts_follow_done_transitions(client, admin_headers):
+    a = await _create(client, admin_headers, "a")
+    d = await _create(client, admin_headers, "d")
+    done = await _create(client, admin_headers, "done", status="DONE")
+    b = await _create(client, admin_headers, "b")
+    c = await _create(client, admin_headers, "c")
+
+    r = await client.post(
+        f"/tasks/{b}/dependencies", headers=admin_headers, json={"depends_on_task_ids": [a, done]}
+    )
+    assert r.status_code == 200, r.text
+    assert (r.json()["open_dependency_count"], r.json()["is_blocked"]) == (1, True)
+    await client.post(
+        f"/tasks/{c}/dependencies", headers=admin_headers, json={"depends_on_task_ids": [a, d]}
+    )
+    assert await _blocked(client, admin_headers) == {"b": 1, "c": 2}
+
+    # only the dependents of a task that moved to or from DONE change
+    r = await client.patch(f"/tasks/{a}", headers=admin_headers, json={"status": "DONE"})
+    assert r.status_code == 200, r.text
+    assert await _blocked(client, admin_headers) == {"c": 1}
+    r = await client.patch(
+        f"/tasks/{a}", headers=admin_headers, json={"status": "DONE", "priority": "LOW"}
+    )
+    assert await _blocked(client, admin_headers) == {"c": 1}
+
+    r = await client.patch(
+        "/tasks/bulk",
+        headers=admin_headers,
+        json={
+            "updates": [
+                {"id": a, "patch": {"status": "IN_PROGRESS"}},
+                {"id": d, "patch": {"status": "DONE"}},
+            ]
+        },
+    )
+    assert r.status_code == 200, r.text
+    assert await _blocked(client, admin_headers) == {"b": 1, "c": 1}
+
+    r = await client.delete(f"/tasks/{a}", headers=admin_headers)
+    assert r.status_code == 200, r.text
+    assert await _blocked(client, admin_headers) == {}
+    r = await client.post("/tasks/filter", headers=admin_headers, json={"is_blocked": False})
+    assert {t["title"] for t in r.json()["items"]} == {"b", "c", "d", "done"}
+
+
+@pytest.mark.asyncio
+async def test_blocked_filter_can_use_the_partial_index(client, admin_headers, db_session):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT tasks."):
+            statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        await client.post("/tasks/filter", headers=admin_headers, json={"is_blocked": True})
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+    # a literal, so the planner can match it against the index predicate
+    assert "tasks.open_dependency_count > 0" in statements[0]
+
+    await db_session.execute(text("SET LOCAL enable_seqscan = off"))
+    plan = await db_session.execute(
+        text(
+            "EXPLAIN SELECT id FROM tasks WHERE workspace_id = 1 AND open_dependency_count > 0 "
+            "ORDER BY updated_at DESC LIMIT 20"
+        )
+    )
+    assert "ix_tasks_workspace_blocked_updated_at" in "\n".join(plan.scalars().all())
+
+
+@pytest.mark.asyncio
+async def test_dependency_count_does_not_race_a_done_transition(
+    client, admin_headers, session_factory
+):
+    dep = await _create(client, admin_headers, "dep")
+    task = await _create(client, admin_headers, "task")
+
+    async with session_factory() as finishing, session_factory() as linking:
+        await TaskService(finishing, 1).update_task(
+            task_id=dep, patch=TaskUpdate(status=TaskStatus.DONE), user_id=1, role=UserRole.ADMIN
+        )
+        # the new dependency row is invisible to the DONE transition's count update,
+        # so linking must wait for it and then count the dependency as done
+        link = asyncio.create_task(
+            TaskService(linking, 1).set_dependencies(
+                task_id=task, depends_on_ids=[dep], user_id=1, role=UserRole.ADMIN
+            )
+        )
+        await asyncio.sleep(0.2)
+        assert not link.done()
+        await finishing.commit()
+        assert (await link).open_dependency_count == 0
+        await linking.commit()
+
+    assert await _blocked(client, admin_headers) == {}
+
+
+@pytest.mark.asyncio
+async def test_deleting_a_parent_releases_dependents_of_its_subtasks(
+    client, admin_headers, session_factory
+):
+    parent = await _create(client, admin_headers, "parent")
+    r = await client.post(
+        "/tasks", headers=admin_headers, json={"title": "child", "parent_task_id": parent}
+    )
+    child = r.json()["id"]
+    dependent = await _create(client, admin_headers, "dependent")
+    await client.post(
+        f"/tasks/{dependent}/dependencies",
+        headers=admin_headers,
+        json={"depends_on_task_ids": [child]},
+    )
+    assert await _blocked(client, admin_headers) == {"dependent": 1}
+
+    r = await client.delete(f"/tasks/{parent}", headers=admin_headers)
+    assert r.status_code == 200, r.text
+    assert await _blocked(client, admin_headers) == {}
+    # the client shares one session across requests; read the dependent back fresh
+    async with session_factory() as session:
+        task = await TaskService(session, 1).get_task(
+            task_id=dependent, user_id=1, role=UserRole.ADMIN
+        )
+        assert (task.dependencies, task.open_dependency_count) == ([], 0)
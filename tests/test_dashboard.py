@@ -0,0 +1,65 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app.db.query_stats import track_queries
+
+
+async def _login(client, email):
+    r = await client.post("/auth/register", json={"email": email, "password": "Member@1234"})
+    user_id = r.json()["id"]
+    r = await client.post("/auth/token", data={"username": email, "password": "Member@1234"})
+    return user_id, {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+@pytest.mark.asyncio
+async def test_dashboard_sections(client, admin_headers):
+    member_id, member = await _login(client, "m@x.com")
+    yesterday = (date.today() - timedelta(days=1)).isoformat()
+    for title, status, due in [
+        ("late", "TODO", yesterday),
+        ("stuck", "BLOCKED", None),
+        ("doing", "IN_PROGRESS", None),
+        ("done", "DONE", yesterday),
+        ("more", "TODO", None),
+    ]:
+        r = await client.post(
+            "/tasks",
+            headers=admin_headers,
+            json={
+                "title": title,
+                "status": status,
+                "due_date": due,
+                "users": [{"user_id": member_id, "role": "ASSIGNEE"}],
+            },
+        )
+        assert r.status_code == 200, r.text
+    # not assigned to the member
+    await client.post("/tasks", headers=admin_headers, json={"title": "other"})
+    await client.post("/tasks", headers=member, json={"title": "own"})
+
+    with track_queries() as stats:
+        r = await client.get("/me/dashboard?limit=3", headers=member)
+    assert r.status_code == 200, r.text
+    body = r.json()
+    # 1 user lookup, 3 task sections with their relationship loads, timeline, counts
+    assert stats.statements <= 1 + 3 * 4 + 2
+
+    assert len(body["assigned"]["items"]) == 3 and body["assigned"]["has_more"]
+    assert {t["title"] for t in body["assigned"]["items"]} <= {"late", "stuck", "doing", "more"}
+    assert [t["title"] for t in body["overdue"]["items"]] == ["late"]
+    assert not body["overdue"]["has_more"]
+    assert [t["title"] for t in body["blocked"]["items"]] == ["stuck"]
+    assert [e["action"] for e in body["recent"]["items"]] == ["CREATED"]
+
+    distribution = body["distribution"]
+    assert distribution["total"] == 5
+    assert {c["value"]: c["count"] for c in distribution["status"]} == {
+        "TODO": 2,
+        "BLOCKED": 1,
+        "IN_PROGRESS": 1,
+        "DONE": 1,
+    }
+
+    r = await client.get("/me/dashboard?limit=51", headers=member)
+    assert r.status_code == 422
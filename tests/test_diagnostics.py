@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.api.routes import diagnostics
+from app.core.config import settings
+from app.db.session import engine_options
+from app.db.shards import ShardRouter
+
+
+@pytest.mark.asyncio
+async def test_pool_diagnostics_is_admin_only(client, admin_headers):
+    r = await client.get("/diagnostics/pool", headers=admin_headers)
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert body["settings"]["pool_size"] >= 1
+    assert [p["name"] for p in body["pools"]] == ["primary"]
+    assert {"checked_out", "overflow_events", "timeouts", "wait_seconds_p99"} <= body["pools"][
+        0
+    ].keys()
+
+    await client.post("/auth/register", json={"email": "m@x.com", "password": "Member@1234"})
+    r = await client.post("/auth/token", data={"username": "m@x.com", "password": "Member@1234"})
+    r = await client.get(
+        "/diagnostics/pool", headers={"Authorization": f"Bearer {r.json()['access_token']}"}
+    )
+    assert r.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_pool_diagnostics_report_every_engine(client, admin_headers, monkeypatch):
+    def new_engine(url=settings.database_url):
+        return create_async_engine(url, future=True, **engine_options())
+
+    primary, replica = new_engine(), new_engine()
+    shards = ShardRouter(
+        primary,
+        async_sessionmaker(primary, class_=AsyncSession),
+        {7: settings.database_url},
+        engine_factory=new_engine,
+    )
+    monkeypatch.setattr(diagnostics, "engine", primary)
+    monkeypatch.setattr(diagnostics, "replica_engine", replica)
+    monkeypatch.setattr(diagnostics, "shard_router", shards)
+
+    async def pools():
+        r = await client.get("/diagnostics/pool", headers=admin_headers)
+        assert r.status_code == 200, r.text
+        return {p["name"]: p for p in r.json()["pools"]}
+
+    try:
+        before = await pools()
+        assert before.keys() == {"primary", "replica", "shard"}
+        assert "taskapi:***@" in before["primary"]["url"]
+
+        async with primary.connect(), primary.connect(), replica.connect():
+            during = await pools()
+        after = await pools()
+    finally:
+        await shards.dispose_shards()
+        await primary.dispose()
+        await replica.dispose()
+
+    assert (during["primary"]["checked_out"], during["replica"]["checked_out"]) == (2, 1)
+    assert after["primary"]["checkouts"] == before["primary"]["checkouts"] + 2
+    assert after["primary"]["max_in_use"] == 2
+    assert after["replica"]["checkouts"] == before["replica"]["checkouts"] + 1
+    assert after["shard"]["checkouts"] == 0
+    assert after["primary"]["checked_out"] == 0
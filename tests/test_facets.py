@@ -0,0 +1,83 @@
+import pytest
+
+from app.db.query_stats import track_queries
+from app.models.enums import UserRole
+from app.schemas.task import TaskFacetsRequest
+from app.services.task_service import TaskService
+
+
+async def _login(client, email):
+    r = await client.post("/auth/register", json={"email": email, "password": "Member@1234"})
+    user_id = r.json()["id"]
+    r = await client.post("/auth/token", data={"username": email, "password": "Member@1234"})
+    return user_id, {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+@pytest.mark.asyncio
+async def test_facet_counts_match_filter_totals(client, admin_headers, db_session):
+    member_id, member = await _login(client, "m@x.com")
+
+    specs = [
+        ("TODO", "HIGH", ["ops", "api"], True),
+        ("TODO", "LOW", ["ops"], True),
+        ("DONE", "HIGH", ["api"], False),
+        ("IN_PROGRESS", "HIGH", [], False),
+    ]
+    for status, priority, tags, assigned in specs:
+        r = await client.post(
+            "/tasks",
+            headers=admin_headers,
+            json={
+                "title": f"{status} {priority}",
+                "status": status,
+                "priority": priority,
+                "tags": tags,
+                "users": [{"user_id": member_id, "role": "ASSIGNEE"}] if assigned else [],
+            },
+        )
+        assert r.status_code == 200, r.text
+
+    r = await client.post("/tasks/facets", headers=admin_headers, json={"priority_in": ["HIGH"]})
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert body["total"] == 3
+    assert body["items"] is None
+    facets = {
+        name: {c["value"]: c["count"] for c in counts} for name, counts in body["facets"].items()
+    }
+    assert facets == {
+        "status": {"TODO": 1, "DONE": 1, "IN_PROGRESS": 1},
+        "priority": {"HIGH": 3},
+        "tag": {"api": 2, "ops": 1},
+        "assignee": {str(member_id): 1},
+    }
+    # every count agrees with the equivalent /tasks/filter total
+    for status, n in facets["status"].items():
+        r = await client.post(
+            "/tasks/filter",
+            headers=admin_headers,
+            json={"priority_in": ["HIGH"], "status_in": [status]},
+        )
+        assert r.json()["total"] == n
+
+    # access-scoped: the member only sees the two tasks assigned to them
+    r = await client.post(
+        "/tasks/facets",
+        headers=member,
+        json={"facets": ["tag"], "facet_limit": 1, "include_items": True, "page_size": 1},
+    )
+    body = r.json()
+    assert body["total"] == 2
+    assert body["facets"] == {"tag": [{"value": "ops", "count": 2}]}
+    assert len(body["items"]) == 1
+
+    service = TaskService(db_session, 1)
+    with track_queries() as stats:
+        await service.facets(f=TaskFacetsRequest(), user_id=1, role=UserRole.ADMIN)
+    assert stats.statements == 1
+    with track_queries() as stats:
+        await service.facets(
+            f=TaskFacetsRequest(include_items=True), user_id=1, role=UserRole.ADMIN
+        )
+    # the page and its eager loads, without the separate count /tasks/filter runs
+    assert stats.statements == 1 + 5
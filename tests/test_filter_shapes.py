@@ -0,0 +1,62 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.repositories.filter_shapes import canonical_shape, filter_statements
+from app.schemas.task import TaskFilter
+
+
+def test_equivalent_filters_share_a_shape():
+    a, a_params = canonical_shape(
+        TaskFilter(status_in=["DONE", "TODO", "TODO"], tag_names=[" Ops", ""]), visible_to=None
+    )
+    b, b_params = canonical_shape(
+        TaskFilter(tag_names=["ops"], status_in=["TODO", "DONE"]), visible_to=None
+    )
+    assert a == b and a_params == b_params
+    assert a.predicates == ("tag", "status", "active")
+
+    # list lengths are values, not shape
+    c, _ = canonical_shape(
+        TaskFilter(status_in=["TODO"], tag_names=["x", "y", "z"]), visible_to=None
+    )
+    assert c == a
+    # OR over a single predicate is the AND statement; access scope is part of the shape
+    d, _ = canonical_shape(
+        TaskFilter(logic="OR", include_archived=True, status_in=["TODO"]), visible_to=7
+    )
+    assert (d.logic, d.predicates, d.scoped) == ("AND", ("status",), True)
+
+
+@pytest.mark.asyncio
+async def test_filter_statement_text_is_stable_across_list_lengths(client, admin_headers):
+    for status in ("TODO", "DONE", "IN_PROGRESS"):
+        await client.post("/tasks", headers=admin_headers, json={"title": status, "status": status})
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "FROM tasks" in statement:
+            statements.append(statement)
+
+    filter_statements.clear()
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        totals = []
+        for status_in in (["TODO"], ["TODO", "DONE"], ["TODO", "DONE", "IN_PROGRESS"]):
+            r = await client.post(
+                "/tasks/filter", headers=admin_headers, json={"status_in": status_in}
+            )
+            assert r.status_code == 200, r.text
+            totals.append(r.json()["total"])
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+    assert totals == [1, 2, 3]
+    # count and page statements, each with one SQL text for all three requests
+    assert len(set(statements)) == 2
+    assert all("= ANY (" in s for s in statements)
+    assert (filter_statements.misses, filter_statements.hits) == (2, 4)
+
+    r = await client.get("/diagnostics/filter-statements", headers=admin_headers)
+    assert r.json()["hit_ratio"] == pytest.approx(4 / 6)
@@ -0,0 +1,105 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.repositories.filter_shapes import canonical_shape
+from app.schemas.task import MAX_FILTER_DEPTH, MAX_FILTER_NODES, TaskFilter
+
+URGENT_OR_TODO_HIGH = {
+    "op": "OR",
+    "items": [
+        {"op": "AND", "items": [{"status_in": ["TODO"]}, {"priority_in": ["HIGH"]}]},
+        {"tag_names": ["urgent"]},
+    ],
+}
+
+
+@pytest.mark.asyncio
+async def test_nested_expression_uses_semi_joins(client, admin_headers):
+    for title, status, priority, tags in [
+        ("a", "TODO", "HIGH", []),
+        ("b", "TODO", "LOW", []),
+        ("c", "DONE", "LOW", ["urgent"]),
+        ("d", "DONE", "HIGH", ["later"]),
+    ]:
+        r = await client.post(
+            "/tasks",
+            headers=admin_headers,
+            json={"title": title, "status": status, "priority": priority, "tags": tags},
+        )
+        assert r.status_code == 200, r.text
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "FROM tasks" in statement:
+            statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        r = await client.post(
+            "/tasks/filter", headers=admin_headers, json={"where": URGENT_OR_TODO_HIGH}
+        )
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+    assert r.status_code == 200, r.text
+    assert sorted(t["title"] for t in r.json()["items"]) == ["a", "c"]
+    assert all("EXISTS" in s and " IN (" not in s for s in statements)
+
+    # ANDed with the flat fields
+    r = await client.post(
+        "/tasks/filter",
+        headers=admin_headers,
+        json={"priority_in": ["LOW"], "where": URGENT_OR_TODO_HIGH},
+    )
+    assert [t["title"] for t in r.json()["items"]] == ["c"]
+
+
+def test_trees_are_canonicalized():
+    reordered = {
+        "op": "OR",
+        "items": [
+            {"tag_names": ["Urgent"]},
+            {
+                "op": "AND",
+                "items": [
+                    {"priority_in": ["HIGH"]},
+                    {"op": "AND", "items": [{"status_in": ["TODO"]}]},
+                ],
+            },
+        ],
+    }
+    a, a_params = canonical_shape(TaskFilter(where=URGENT_OR_TODO_HIGH), visible_to=None)
+    b, b_params = canonical_shape(TaskFilter.model_validate({"where": reordered}), visible_to=None)
+    assert a == b and a_params == b_params
+    # OR tries the likelier branch (status and priority) first; equal estimates go by name
+    assert a.where == (
+        "OR",
+        (
+            ("AND", (("leaf", "w0_", ("priority",)), ("leaf", "w1_", ("status",)))),
+            ("leaf", "w2_", ("tag",)),
+        ),
+    )
+
+
+@pytest.mark.asyncio
+async def test_tree_size_guardrails(client, admin_headers):
+    deep = {"status_in": ["TODO"]}
+    for _ in range(MAX_FILTER_DEPTH):
+        deep = {"op": "AND", "items": [deep, {"priority_in": ["HIGH"]}]}
+    r = await client.post("/tasks/filter", headers=admin_headers, json={"where": deep})
+    assert r.status_code == 422
+    assert "deeper" in r.text
+
+    wide = {"op": "OR", "items": [{"assignee_user_ids": [i]} for i in range(MAX_FILTER_NODES)]}
+    r = await client.post("/tasks/filter", headers=admin_headers, json={"where": wide})
+    assert r.status_code == 422
+
+    r = await client.post(
+        "/tasks/filter", headers=admin_headers, json={"where": {"op": "AND", "items": [{}]}}
+    )
+    assert r.status_code == 422
+    # blank tag names normalize away, leaving a leaf that would match every task
+    blank = {"op": "OR", "items": [{"tag_names": ["  "]}, {"status_in": ["DONE"]}]}
+    r = await client.post("/tasks/filter", headers=admin_headers, json={"where": blank})
+    assert r.status_code == 422
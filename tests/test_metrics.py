@@ -0,0 +1,48 @@
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from app.db.query_stats import track_queries
+
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+async def test_metrics_report_route_latency_and_db_statements(client, admin_headers):
+    labels = {"method": "GET", "route": "/tasks/{task_id}"}
+    before_count = _sample("http_request_duration_seconds_count", **labels)
+    before_statements = _sample("http_request_db_statements_sum", **labels)
+    before_404 = _sample("http_requests_total", status="404", **labels)
+
+    r = await client.get("/tasks/999999", headers=admin_headers)
+    assert r.status_code == 404
+
+    assert _sample("http_request_duration_seconds_count", **labels) == before_count + 1
+    assert _sample("http_requests_total", status="404", **labels) == before_404 + 1
+    # user lookup plus the task lookup, all attributed to the route template
+    assert _sample("http_request_db_statements_sum", **labels) >= before_statements + 2
+    assert _sample("http_request_db_seconds_count", **labels) == before_count + 1
+
+    r = await client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    assert (
+        'http_request_db_seconds_bucket{le="0.005",method="GET",route="/tasks/{task_id}"}' in r.text
+    )
+    assert "http_requests_in_progress" in r.text
+
+
+async def test_failed_statements_leave_nothing_on_the_pooled_connection(session_factory):
+    engine = session_factory.kw["bind"]
+    with track_queries() as stats:
+        async with engine.connect() as conn:
+            for _ in range(3):
+                with pytest.raises(DBAPIError):
+                    await conn.execute(text("SELECT 1 / 0"))
+                await conn.rollback()
+            await conn.execute(text("SELECT 1"))
+            info = dict(conn.info)
+    assert stats.statements == 1
+    assert not info.get("query_start")
@@ -0,0 +1,114 @@
+import pytest
+from fastapi import HTTPException
+
+from app.models.enums import UserRole
+from app.schemas.task import TaskUpdate
+from app.services.task_service import TaskService
+
+
+@pytest.mark.asyncio
+async def test_if_match_and_expected_version(client, admin_headers):
+    r = await client.post("/tasks", headers=admin_headers, json={"title": "Versioned"})
+    task_id = r.json()["id"]
+    assert r.json()["version"] == 1
+    assert r.headers["ETag"] == '"1"'
+
+    r = await client.patch(
+        f"/tasks/{task_id}",
+        headers={**admin_headers, "If-Match": '"1"'},
+        json={"status": "IN_PROGRESS"},
+    )
+    assert r.status_code == 200, r.text
+    assert r.headers["ETag"] == '"2"'
+
+    # a second writer still holding version 1 is told to reload
+    r = await client.patch(
+        f"/tasks/{task_id}", headers={**admin_headers, "If-Match": '"1"'}, json={"status": "DONE"}
+    )
+    assert r.status_code == 409
+    r = await client.patch(
+        f"/tasks/{task_id}", headers={**admin_headers, "If-Match": "v2"}, json={}
+    )
+    assert r.status_code == 400
+
+    r = await client.post("/tasks", headers=admin_headers, json={"title": "Other"})
+    other_id = r.json()["id"]
+    r = await client.patch(
+        "/tasks/bulk",
+        headers=admin_headers,
+        json={
+            "updates": [
+                {"id": other_id, "patch": {"priority": "LOW"}, "expected_version": 1},
+                {"id": task_id, "patch": {"priority": "LOW"}, "expected_version": 1},
+            ]
+        },
+    )
+    assert r.status_code == 409
+    r = await client.get(f"/tasks/{other_id}", headers=admin_headers)
+    assert r.json()["priority"] == "MEDIUM"
+
+    r = await client.patch(
+        "/tasks/bulk",
+        headers=admin_headers,
+        json={
+            "updates": [
+                {"id": other_id, "patch": {"priority": "LOW"}, "expected_version": 1},
+                {"id": task_id, "patch": {"priority": "LOW"}, "expected_version": 2},
+            ]
+        },
+    )
+    assert r.status_code == 200, r.text
+    assert r.json()["versions"] == {str(other_id): 2, str(task_id): 3}
+
+    # one patch per task: a second one would conflict with the version the first wrote
+    r = await client.patch(
+        "/tasks/bulk",
+        headers=admin_headers,
+        json={
+            "updates": [
+                {"id": task_id, "patch": {"title": "A"}},
+                {"id": task_id, "patch": {"title": "B"}},
+            ]
+        },
+    )
+    assert r.status_code == 422
+    assert str(task_id) in r.text
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_conflict_without_locks(client, admin_headers, session_factory):
+    r = await client.post("/tasks", headers=admin_headers, json={"title": "Contended"})
+    task_id = r.json()["id"]
+
+    async with session_factory() as slow, session_factory() as fast:
+        slow_service = TaskService(slow, 1)
+        # both writers read version 1; neither holds a row lock (kept referenced: the
+        # identity map is weak, and a re-select would otherwise load the new version)
+        stale = await slow_service.get_task(task_id=task_id, user_id=1, role=UserRole.ADMIN)
+
+        await TaskService(fast, 1).update_task(
+            task_id=task_id, patch=TaskUpdate(title="Fast"), user_id=1, role=UserRole.ADMIN
+        )
+        await fast.commit()
+
+        with pytest.raises(HTTPException) as single:
+            await slow_service.update_task(
+                task_id=task_id, patch=TaskUpdate(title="Slow"), user_id=1, role=UserRole.ADMIN
+            )
+        assert single.value.status_code == 409
+        await slow.rollback()
+
+        stale = await slow_service.get_task(task_id=task_id, user_id=1, role=UserRole.ADMIN)
+        await TaskService(fast, 1).update_task(
+            task_id=task_id, patch=TaskUpdate(title="Faster"), user_id=1, role=UserRole.ADMIN
+        )
+        await fast.commit()
+        with pytest.raises(HTTPException) as bulk:
+            await slow_service.bulk_update(
+                updates=[(task_id, TaskUpdate(title="Slow"), None)], user_id=1, role=UserRole.ADMIN
+            )
+        assert bulk.value.status_code == 409
+        assert stale.version == 2
+
+    r = await client.get(f"/tasks/{task_id}", headers=admin_headers)
+    assert (r.json()["title"], r.json()["version"]) == ("Faster", 3)
@@ -0,0 +1,105 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core.query_budget import QueryBudgetExceededError, check_query_budget, query_budget
+from app.db.query_stats import QueryStats, statement_shape
+from app.main import app
+
+
+def test_statement_shapes_ignore_parameters_and_in_list_length():
+    a = statement_shape("SELECT users.id FROM users WHERE users.id IN ($1, $2)")
+    b = statement_shape("SELECT users.id\n FROM users WHERE users.id IN ($1, $2, $3, $4)")
+    assert a == b == "SELECT users.id FROM users WHERE users.id IN (...)"
+
+
+def test_budget_and_repeated_shapes_are_reported():
+    stats = QueryStats(budget=2)
+    for _ in range(5):
+        stats.statements += 1
+        stats.shapes["SELECT tags.id FROM tags WHERE tags.name = ?"] += 1
+    problems = check_query_budget(stats)
+    assert any("exceed the budget of 2" in p for p in problems)
+    assert any("repeated 5 times" in p for p in problems)
+
+
+async def test_write_paths_issue_a_constant_number_of_statements(client, admin_headers):
+    # conftest runs with QUERY_BUDGET_MODE=raise, so any budget overrun or N+1 fails the request
+    user_ids = []
+    for i in range(8):
+        r = await client.post(
+            "/auth/register",
+            json={"email": f"member{i}@x.com", "password": "Member@1234", "full_name": f"M{i}"},
+        )
+        assert r.status_code == 200, r.text
+        user_ids.append(r.json()["id"])
+
+    r = await client.post(
+        "/tasks",
+        json={
+            "title": "wide",
+            "users": [{"user_id": uid, "role": "COLLABORATOR"} for uid in user_ids],
+            "tags": [f"tag-{i}" for i in range(12)],
+        },
+        headers=admin_headers,
+    )
+    assert r.status_code == 200, r.text
+    assert len(r.json()["tags"]) == 12
+
+    r = await client.post(
+        "/tasks",
+        json={"title": "bad user", "users": [{"user_id": 999999, "role": "ASSIGNEE"}]},
+        headers=admin_headers,
+    )
+    assert r.status_code == 400
+    assert r.json()["detail"] == "User not found: 999999"
+
+    task_ids = []
+    for i in range(15):
+        r = await client.post(
+            "/tasks", json={"title": f"t{i}", "tags": ["tag-1"]}, headers=admin_headers
+        )
+        assert r.status_code == 200, r.text
+        task_ids.append(r.json()["id"])
+
+    r = await client.patch(
+        "/tasks/bulk",
+        json={"updates": [{"id": tid, "patch": {"priority": "HIGH"}} for tid in task_ids]},
+        headers=admin_headers,
+    )
+    assert r.status_code == 200, r.text
+    assert sorted(r.json()["updated_ids"]) == sorted(task_ids)
+
+    r = await client.post(
+        f"/tasks/{task_ids[0]}/dependencies",
+        json={"depends_on_task_ids": task_ids[1:]},
+        headers=admin_headers,
+    )
+    assert r.status_code == 200, r.text
+    assert sorted(r.json()["dependencies"]) == sorted(task_ids[1:])
+
+    r = await client.post(
+        f"/tasks/{task_ids[1]}/dependencies",
+        json={"depends_on_task_ids": [task_ids[0]]},
+        headers=admin_headers,
+    )
+    assert r.status_code == 400
+
+
+async def test_budget_overrun_raises_in_tests(client, admin_headers):
+    r = await client.post("/tasks", json={"title": "t"}, headers=admin_headers)
+    task_id = r.json()["id"]
+
+    route = next(r for r in app.routes if r.path == "/tasks/{task_id}" and "GET" in r.methods)
+    declared = next(
+        d.call for d in route.dependant.dependencies if "query_budget" in d.call.__qualname__
+    )
+    app.dependency_overrides[declared] = query_budget(1)
+
+    with pytest.raises(QueryBudgetExceededError, match="exceed the budget of 1"):
+        await client.get(f"/tasks/{task_id}", headers=admin_headers)
+
+    # checked before the response starts: the client sees the failure, not a 200
+    transport = ASGITransport(app=app, raise_app_exceptions=False)
+    async with AsyncClient(transport=transport, base_url="http://test") as raw:
+        r = await raw.get(f"/tasks/{task_id}", headers=admin_headers)
+    assert r.status_code == 500
@@ -0,0 +1,154 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.db import session as db_session_module
+from app.db.replica import ReplicaRouter, primary_wal_lsn
+from app.db.session import READ_AFTER_COOKIE, ReadSessionFactory, engine, get_db, get_read_db
+from app.main import app
+from tests.conftest import TEST_DB_URL
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class UnreachableEngine:
+    def connect(self):
+        raise OSError("connection refused")
+
+
+def make_router(clock: FakeClock) -> ReplicaRouter:
+    return ReplicaRouter(
+        UnreachableEngine(),
+        primary_engine=UnreachableEngine(),
+        max_lag_seconds=5.0,
+        check_interval_seconds=1.0,
+        retry_after_seconds=30.0,
+        clock=clock,
+    )
+
+
+async def test_replica_lag_guard_and_read_your_writes():
+    clock = FakeClock()
+    router = make_router(clock)
+
+    router.record_lag(lag=0.5, replayed_lsn=1_000)
+    assert await router.use_replica()
+    # a write committed past the replica's replay point must go to the primary
+    assert not await router.use_replica(read_after=1_200)
+    assert await router.use_replica(read_after=1_000)
+
+    router.record_lag(lag=12.0, replayed_lsn=2_000)
+    assert not await router.use_replica()
+
+
+async def test_unreachable_replica_is_skipped_until_retry():
+    clock = FakeClock()
+    router = make_router(clock)
+
+    assert not await router.use_replica()
+    assert router.lag_seconds is None
+
+    # inside the retry window the replica is not probed again
+    clock.now += 10
+    router.record_lag(lag=0.0, replayed_lsn=0)
+    assert not await router.use_replica()
+
+    clock.now += 25
+    router.record_lag(lag=0.0, replayed_lsn=0)
+    assert await router.use_replica()
+
+
+@pytest.mark.asyncio
+async def test_reads_follow_the_replicas_wal_position(session_factory):
+    # a second engine stands in for the replica; not being a standby, it has replayed
+    # everything the primary wrote as of each check
+    clock = FakeClock()
+    replica_engine = create_async_engine(TEST_DB_URL)
+    router = ReplicaRouter(
+        replica_engine,
+        primary_engine=engine,
+        max_lag_seconds=5.0,
+        check_interval_seconds=60.0,
+        retry_after_seconds=30.0,
+        clock=clock,
+    )
+    reads = ReadSessionFactory(
+        async_sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False), router
+    )
+
+    async def read_only_bind(read_after=None):
+        async with reads(read_after=read_after) as session:
+            read_only = (await session.execute(text("SHOW transaction_read_only"))).scalar_one()
+            assert read_only == "on"
+            return session.bind
+
+    try:
+        assert await read_only_bind() is replica_engine
+        assert router.lag_seconds == 0.0
+
+        async with session_factory() as writer:
+            await writer.execute(
+                text("INSERT INTO tags (workspace_id, name) VALUES (1, 'replicated')")
+            )
+            await writer.commit()
+            marker = await primary_wal_lsn(writer)
+        # the replica position was read before that commit: the writer's reads stay on the primary
+        assert marker > router.replayed_lsn
+        assert await read_only_bind(read_after=marker) is engine
+        assert await read_only_bind() is replica_engine
+
+        clock.now += 60
+        assert await read_only_bind(read_after=marker) is replica_engine
+        assert router.replayed_lsn >= marker
+    finally:
+        await replica_engine.dispose()
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_read_after_cookie_round_trip(client, admin_headers, monkeypatch):
+    # the real session dependencies, with a replica configured and reads recorded
+    app.dependency_overrides.pop(get_db)
+    app.dependency_overrides.pop(get_read_db)
+    monkeypatch.setattr(db_session_module, "replica_router", make_router(FakeClock()))
+    primary_reads = ReadSessionFactory(None, None)
+    seen = []
+
+    def recording_reads(*, read_after=None, workspace_id=None):
+        seen.append(read_after)
+        return primary_reads(read_after=read_after, workspace_id=workspace_id)
+
+    monkeypatch.setattr(db_session_module, "read_sessions", recording_reads)
+
+    try:
+        r = await client.post("/tasks", headers=admin_headers, json={"title": "written"})
+        assert r.status_code == 200, r.text
+        cookie = r.cookies[READ_AFTER_COOKIE]
+        set_cookie = r.headers["set-cookie"]
+        assert f"Max-Age={settings.read_after_write_window_seconds}" in set_cookie
+        assert "HttpOnly" in set_cookie
+        task_id = r.json()["id"]
+
+        # the client sends the cookie back; the read waits for that WAL position
+        r = await client.get(f"/tasks/{task_id}/history", headers=admin_headers)
+        assert r.status_code == 200, r.text
+        assert seen == [int(cookie)]
+
+        # reads do not commit, so they set no marker
+        assert READ_AFTER_COOKIE not in r.cookies
+
+        # once the window has passed the browser drops the cookie
+        monkeypatch.setattr(settings, "read_after_write_window_seconds", 0)
+        r = await client.patch(f"/tasks/{task_id}", headers=admin_headers, json={"title": "again"})
+        assert r.status_code == 200, r.text
+        await client.get(f"/tasks/{task_id}/history", headers=admin_headers)
+        assert seen[-1] is None
+    finally:
+        await engine.dispose()
@@ -0,0 +1,50 @@
+import pytest
+
+from app.schemas.task import TaskFilter
+from app.services.saved_filter_service import canonical_filter, filter_hash
+
+
+def test_equivalent_filters_hash_the_same():
+    a = TaskFilter(status_in=["DONE", "TODO", "TODO"], tag_names=[" Ops", "api"], page=3)
+    b = TaskFilter(tag_names=["api", "ops"], status_in=["TODO", "DONE"], assignee_user_ids=[])
+    assert canonical_filter(a) == {"status_in": ["DONE", "TODO"], "tag_names": ["api", "ops"]}
+    assert filter_hash(canonical_filter(a)) == filter_hash(canonical_filter(b))
+    assert filter_hash(canonical_filter(a)) != filter_hash(canonical_filter(TaskFilter(logic="OR")))
+
+
+@pytest.mark.asyncio
+async def test_saved_filter_first_page_is_cached_until_a_task_write(client, admin_headers):
+    r = await client.post(
+        "/filters",
+        headers=admin_headers,
+        json={"name": "High", "filter": {"priority_in": ["HIGH"], "page": 4}},
+    )
+    assert r.status_code == 200, r.text
+    saved = r.json()
+    assert saved["definition"] == {"priority_in": ["HIGH"]}
+    r = await client.post("/filters", headers=admin_headers, json={"name": "High", "filter": {}})
+    assert r.status_code == 409
+
+    r = await client.post("/tasks", headers=admin_headers, json={"title": "A", "priority": "HIGH"})
+    task_id = r.json()["id"]
+
+    url = f"/filters/{saved['id']}/tasks"
+    r = await client.get(url, headers=admin_headers)
+    assert (r.headers["X-Cache"], r.json()["total"]) == ("MISS", 1)
+    r = await client.get(url, headers=admin_headers)
+    assert (r.headers["X-Cache"], r.json()["total"]) == ("HIT", 1)
+    r = await client.get(url, headers=admin_headers, params={"page": 2})
+    assert r.headers["X-Cache"] == "BYPASS"
+
+    # any task write in the workspace moves the version on
+    r = await client.patch(f"/tasks/{task_id}", headers=admin_headers, json={"priority": "LOW"})
+    assert r.status_code == 200, r.text
+    r = await client.get(url, headers=admin_headers)
+    assert (r.headers["X-Cache"], r.json()["total"]) == ("MISS", 0)
+
+    r = await client.get("/filters", headers=admin_headers)
+    assert [f["name"] for f in r.json()] == ["High"]
+    r = await client.delete(f"/filters/{saved['id']}", headers=admin_headers)
+    assert r.status_code == 200
+    r = await client.get(url, headers=admin_headers)
+    assert r.status_code == 404
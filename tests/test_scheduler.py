@@ -0,0 +1,70 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.scheduler import Scheduler, advisory_lock_key
+from tests.conftest import TEST_DB_URL
+
+
+def test_lock_keys_are_stable_and_distinct():
+    key = advisory_lock_key("audit_partition_maintenance")
+    assert key == advisory_lock_key("audit_partition_maintenance")
+    assert advisory_lock_key("a") != advisory_lock_key("b")
+    assert -(2**63) <= advisory_lock_key("a") < 2**63
+
+
+async def test_one_leader_per_job_across_workers(session_factory):
+    other_engine = create_async_engine(TEST_DB_URL)
+    runs: list[str] = []
+
+    def make_worker(name, engine):
+        scheduler = Scheduler(engine)
+
+        async def job():
+            runs.append(name)
+
+        scheduler.add_job("rollup", job, interval=60)
+        return scheduler
+
+    first = make_worker("first", session_factory.kw["bind"])
+    second = make_worker("second", other_engine)
+    try:
+        assert await first.run_once("rollup") == "success"
+        assert await second.run_once("rollup") == "not_leader"
+        assert await first.run_once("rollup") == "success"
+
+        # the leader goes away: its session ends, the lock is released and the other worker takes over
+        await first.stop()
+        assert await second.run_once("rollup") == "success"
+        assert runs == ["first", "first", "second"]
+    finally:
+        await second.stop()
+        await other_engine.dispose()
+
+
+async def test_jobs_time_out_fail_and_repeat(session_factory):
+    scheduler = Scheduler(session_factory.kw["bind"])
+    ticks = 0
+
+    async def slow():
+        await asyncio.sleep(1)
+
+    async def broken():
+        raise RuntimeError("boom")
+
+    async def tick():
+        nonlocal ticks
+        ticks += 1
+
+    scheduler.add_job("slow", slow, interval=60, timeout=0.05, leader_only=False)
+    scheduler.add_job("broken", broken, interval=60, leader_only=False)
+    scheduler.add_job("tick", tick, interval=0.02, jitter=0.5, leader_only=False, initial_delay=0)
+    assert await scheduler.run_once("slow") == "timeout"
+    assert await scheduler.run_once("broken") == "error"
+
+    scheduler.jobs.pop("slow")
+    scheduler.jobs.pop("broken")
+    scheduler.start()
+    await asyncio.sleep(0.2)
+    await scheduler.stop()
+    assert ticks >= 3
@@ -0,0 +1,20 @@
+import orjson
+
+from app.api.serialization import json_response, task_payload
+from app.main import app
+from app.schemas.task import TaskOut
+from benchmarks.micro import make_tasks
+
+
+def test_fast_path_matches_pydantic_serialization():
+    for task in make_tasks(25):
+        fast = orjson.loads(json_response(task_payload(task)).body)
+        assert fast == TaskOut(**task_payload(task)).model_dump(mode="json")
+
+
+def test_openapi_still_documents_task_out():
+    schema = app.openapi()
+    get_task = schema["paths"]["/tasks/{task_id}"]["get"]["responses"]["200"]["content"]
+    assert get_task["application/json"]["schema"]["$ref"].endswith("/TaskOut")
+    filter_page = schema["components"]["schemas"]["TaskFilterResponse"]
+    assert filter_page["properties"]["items"]["items"]["$ref"].endswith("/TaskOut")
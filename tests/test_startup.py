@@ -0,0 +1,39 @@
+import asyncio
+
+from httpx import ASGITransport, AsyncClient
+
+from app.db.session import engine
+from app.main import create_app
+from app.services.warmup_service import warm_up_engine
+
+
+async def test_warm_up_opens_and_primes_pooled_connections(session_factory):
+    test_engine = session_factory.kw["bind"]
+    await warm_up_engine(test_engine, connections=3)
+
+    assert test_engine.pool.checkedin() == 3
+    assert len(test_engine.sync_engine._compiled_cache) > 0
+
+
+async def test_ready_only_after_lifespan_warm_up(session_factory):
+    app = create_app()
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        r = await client.get("/ready")
+        assert r.status_code == 503
+
+        try:
+            async with app.router.lifespan_context(app):
+                assert (await client.get("/health")).status_code == 200
+                for _ in range(100):
+                    r = await client.get("/ready")
+                    if r.status_code == 200:
+                        break
+                    await asyncio.sleep(0.05)
+                assert r.status_code == 200
+                assert r.json() == {"ready": True}
+                assert app.openapi_schema is not None
+                assert engine.pool.checkedin() >= 1
+        finally:
+            # the app engine's connections belong to this test's event loop
+            await engine.dispose()
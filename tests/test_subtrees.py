@@ -0,0 +1,197 @@
+import pytest
+from fastapi import HTTPException
+
+from app.db.query_stats import track_queries
+from app.models.enums import UserRole
+from app.schemas.task import TaskUpdate
+from app.services.task_service import TaskService
+
+
+async def _create(client, headers, title, parent=None):
+    r = await client.post(
+        "/tasks", headers=headers, json={"title": title, "parent_task_id": parent}
+    )
+    assert r.status_code == 200, r.text
+    return r.json()["id"]
+
+
+async def _archived(client, headers):
+    r = await client.post(
+        "/tasks/filter", headers=headers, json={"include_archived": True, "page_size": 100}
+    )
+    return {t["title"]: t["is_archived"] for t in r.json()["items"]}
+
+
+async def _depend(client, headers, task_id, on):
+    r = await client.post(
+        f"/tasks/{task_id}/dependencies", headers=headers, json={"depends_on_task_ids": on}
+    )
+    assert r.status_code == 200, r.text
+
+
+async def _history(client, headers, task_id):
+    r = await client.get(f"/tasks/{task_id}/history", headers=headers)
+    return [(e["action"], e["details"]) for e in r.json()["items"]]
+
+
+@pytest.mark.asyncio
+async def test_archive_and_restore_whole_subtrees(client, admin_headers):
+    project = await _create(client, admin_headers, "project")
+    child = await _create(client, admin_headers, "child", project)
+    leaf = await _create(client, admin_headers, "leaf", child)
+    other = await _create(client, admin_headers, "other")
+    for i in range(20):
+        await _create(client, admin_headers, f"bulk {i}", child)
+
+    # a task outside the subtree depends on the leaf
+    await _depend(client, admin_headers, other, [leaf])
+    r = await client.patch(f"/tasks/{project}/archive", headers=admin_headers)
+    assert r.status_code == 400
+    await _depend(client, admin_headers, other, [])
+    # dependencies inside the subtree do not block it
+    await _depend(client, admin_headers, child, [leaf])
+
+    # a stale If-Match is refused before anything is touched
+    r = await client.patch(
+        f"/tasks/{project}/archive", headers={**admin_headers, "If-Match": '"9"'}
+    )
+    assert r.status_code == 409
+
+    with track_queries() as stats:
+        r = await client.patch(f"/tasks/{project}/archive", headers=admin_headers)
+    assert r.status_code == 200, r.text
+    assert (r.json()["is_archived"], r.json()["version"]) == (True, 2)
+    # independent of the subtree's size
+    assert stats.statements <= 14
+    archived = await _archived(client, admin_headers)
+    assert sum(archived.values()) == 23 and not archived["other"]
+    assert await _history(client, admin_headers, project) == [
+        ("ARCHIVED", "subtree_count=23"),
+        ("CREATED", "title=project"),
+    ]
+
+    r = await client.patch(f"/tasks/{child}/restore", headers=admin_headers)
+    assert r.status_code == 200, r.text
+    archived = await _archived(client, admin_headers)
+    assert archived["project"] and not archived["child"] and not archived["leaf"]
+
+
+@pytest.mark.asyncio
+async def test_move_refuses_cycles(client, admin_headers):
+    root = await _create(client, admin_headers, "root")
+    child = await _create(client, admin_headers, "child", root)
+    grandchild = await _create(client, admin_headers, "grandchild", child)
+    other = await _create(client, admin_headers, "other")
+
+    for parent in (grandchild, root):
+        r = await client.patch(
+            f"/tasks/{root}/move", headers=admin_headers, json={"parent_task_id": parent}
+        )
+        assert r.status_code == 400
+    r = await client.patch(
+        f"/tasks/{root}/move", headers=admin_headers, json={"parent_task_id": 999999}
+    )
+    assert r.status_code == 404
+
+    r = await client.patch(
+        f"/tasks/{child}/move", headers=admin_headers, json={"parent_task_id": other}
+    )
+    assert r.status_code == 200, r.text
+    assert (r.json()["parent_task_id"], r.json()["version"]) == (other, 2)
+    r = await client.get(f"/tasks/{grandchild}", headers=admin_headers)
+    assert r.json()["parent_task_id"] == child
+
+    r = await client.patch(
+        f"/tasks/{child}/move", headers=admin_headers, json={"parent_task_id": None}
+    )
+    assert r.json()["parent_task_id"] is None
+
+
+@pytest.mark.asyncio
+async def test_delete_removes_the_whole_subtree_in_a_fixed_number_of_statements(
+    client, admin_headers
+):
+    project = await _create(client, admin_headers, "project")
+    for i in range(5):
+        child = await _create(client, admin_headers, f"child {i}", project)
+        r = await client.post(
+            "/tasks",
+            headers=admin_headers,
+            json={
+                "title": f"leaf {i}",
+                "parent_task_id": child,
+                "tags": ["x"],
+                "users": [{"user_id": 1, "role": "ASSIGNEE"}],
+            },
+        )
+        assert r.status_code == 200, r.text
+    other = await _create(client, admin_headers, "other")
+    await _depend(client, admin_headers, child, [other])
+
+    with track_queries() as stats:
+        r = await client.delete(f"/tasks/{project}", headers=admin_headers)
+    assert r.status_code == 200, r.text
+    assert stats.statements <= 14
+    assert await _archived(client, admin_headers) == {"other": False}
+    r = await client.get(f"/tasks/{child}", headers=admin_headers)
+    assert r.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_members_only_change_subtrees_they_created(client, admin_headers):
+    r = await client.post("/auth/register", json={"email": "m@x.com", "password": "Member@1234"})
+    r = await client.post("/auth/token", data={"username": "m@x.com", "password": "Member@1234"})
+    member = {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+    mine = await _create(client, member, "mine")
+    await _create(client, admin_headers, "admin's", mine)
+    r = await client.patch(f"/tasks/{mine}/archive", headers=member)
+    assert r.status_code == 403
+    assert not any((await _archived(client, admin_headers)).values())
+
+
+@pytest.mark.asyncio
+async def test_subtree_guards_hold_against_concurrent_writes(
+    client, admin_headers, session_factory
+):
+    root = await _create(client, admin_headers, "root")
+    leaf = await _create(client, admin_headers, "leaf", root)
+    other = await _create(client, admin_headers, "other")
+
+    async with session_factory() as slow, session_factory() as fast:
+        slow_service = TaskService(slow, 1)
+        # read at version 1 (kept referenced: the identity map is weak)
+        stale = await slow_service.get_task(task_id=root, user_id=1, role=UserRole.ADMIN)
+
+        await TaskService(fast, 1).update_task(
+            task_id=root, patch=TaskUpdate(title="renamed"), user_id=1, role=UserRole.ADMIN
+        )
+        await fast.commit()
+        with pytest.raises(HTTPException) as conflict:
+            await slow_service.archive_task(
+                task_id=root, user_id=1, role=UserRole.ADMIN, expected_version=1
+            )
+        assert conflict.value.status_code == 409
+        with pytest.raises(HTTPException) as moved:
+            await slow_service.move_task(
+                task_id=root,
+                parent_task_id=other,
+                user_id=1,
+                role=UserRole.ADMIN,
+                expected_version=1,
+            )
+        assert moved.value.status_code == 409
+        await slow.rollback()
+
+        stale = await slow_service.get_task(task_id=root, user_id=1, role=UserRole.ADMIN)
+        await TaskService(fast, 1).set_dependencies(
+            task_id=other, depends_on_ids=[leaf], user_id=1, role=UserRole.ADMIN
+        )
+        await fast.commit()
+        with pytest.raises(HTTPException) as depended_on:
+            await slow_service.archive_task(task_id=root, user_id=1, role=UserRole.ADMIN)
+        assert depended_on.value.status_code == 400
+        assert stale.version == 2
+        await slow.rollback()
+
+    assert not any((await _archived(client, admin_headers)).values())
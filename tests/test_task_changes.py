@@ -0,0 +1,113 @@
+import pytest
+from sqlalchemy import update
+
+from app.models.task import Task
+
+
+@pytest.mark.asyncio
+async def test_delta_sync_returns_only_churn_and_tombstones(client, admin_headers):
+    ids = []
+    for i in range(3):
+        r = await client.post("/tasks", headers=admin_headers, json={"title": f"S{i}"})
+        ids.append(r.json()["id"])
+
+    r = await client.get("/tasks/changes", headers=admin_headers, params={"limit": 2})
+    assert r.status_code == 200, r.text
+    first = r.json()
+    assert [t["id"] for t in first["items"]] == ids[:2]
+    assert first["has_more"] is True
+
+    r = await client.get(
+        "/tasks/changes", headers=admin_headers, params={"since": first["next_cursor"]}
+    )
+    synced = r.json()
+    assert [t["id"] for t in synced["items"]] == ids[2:]
+    assert synced["has_more"] is False
+    cursor = synced["next_cursor"]
+
+    # nothing changed: empty page, cursor stays put
+    r = await client.get("/tasks/changes", headers=admin_headers, params={"since": cursor})
+    assert r.json()["items"] == [] and r.json()["next_cursor"] == cursor
+
+    await client.patch(f"/tasks/{ids[0]}", headers=admin_headers, json={"status": "DONE"})
+    await client.patch(f"/tasks/{ids[1]}", headers=admin_headers, json={"is_archived": True})
+    await client.delete(f"/tasks/{ids[2]}", headers=admin_headers)
+
+    r = await client.get("/tasks/changes", headers=admin_headers, params={"since": cursor})
+    delta = r.json()
+    assert [t["id"] for t in delta["items"]] == [ids[0]]
+    assert {(t["task_id"], t["reason"]) for t in delta["tombstones"]} == {
+        (ids[1], "ARCHIVED"),
+        (ids[2], "DELETED"),
+    }
+
+
+@pytest.mark.asyncio
+async def test_delta_sync_does_not_skip_late_commits(client, admin_headers, session_factory):
+    ids = []
+    for title in ("slow", "fast"):
+        r = await client.post("/tasks", headers=admin_headers, json={"title": title})
+        ids.append(r.json()["id"])
+    r = await client.get("/tasks/changes", headers=admin_headers)
+    cursor = r.json()["next_cursor"]
+
+    async with session_factory() as slow, session_factory() as fast:
+        # the slow writer draws the lower change_seq but commits last
+        await slow.execute(update(Task).where(Task.id == ids[0]).values(title="slow 2"))
+        await fast.execute(update(Task).where(Task.id == ids[1]).values(title="fast 2"))
+        await fast.commit()
+
+        r = await client.get("/tasks/changes", headers=admin_headers, params={"since": cursor})
+        assert [t["title"] for t in r.json()["items"]] == ["fast 2"]
+        cursor = r.json()["next_cursor"]
+        await slow.commit()
+
+    r = await client.get("/tasks/changes", headers=admin_headers, params={"since": cursor})
+    assert [t["title"] for t in r.json()["items"]] == ["slow 2"]
+    cursor = r.json()["next_cursor"]
+    r = await client.get("/tasks/changes", headers=admin_headers, params={"since": cursor})
+    assert r.json()["items"] == []
+
+
+@pytest.mark.asyncio
+async def test_deleting_a_parent_tombstones_its_subtasks(client, admin_headers):
+    r = await client.post("/auth/register", json={"email": "m@x.com", "password": "Member@1234"})
+    member_id = r.json()["id"]
+    r = await client.post("/auth/token", data={"username": "m@x.com", "password": "Member@1234"})
+    member = {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+    r = await client.post("/tasks", headers=admin_headers, json={"title": "parent"})
+    parent = r.json()["id"]
+    r = await client.post(
+        "/tasks",
+        headers=admin_headers,
+        json={
+            "title": "child",
+            "parent_task_id": parent,
+            "users": [{"user_id": member_id, "role": "ASSIGNEE"}],
+        },
+    )
+    child = r.json()["id"]
+    r = await client.post(
+        "/tasks", headers=admin_headers, json={"title": "grandchild", "parent_task_id": child}
+    )
+    grandchild = r.json()["id"]
+    cursors = {}
+    for name, headers in (("admin", admin_headers), ("member", member)):
+        r = await client.get("/tasks/changes", headers=headers)
+        cursors[name] = r.json()["next_cursor"]
+
+    r = await client.delete(f"/tasks/{parent}", headers=admin_headers)
+    assert r.status_code == 200, r.text
+
+    r = await client.get(
+        "/tasks/changes", headers=admin_headers, params={"since": cursors["admin"]}
+    )
+    assert {(t["task_id"], t["reason"]) for t in r.json()["tombstones"]} == {
+        (parent, "DELETED"),
+        (child, "DELETED"),
+        (grandchild, "DELETED"),
+    }
+    # each tombstone goes to the users who could see its own task
+    r = await client.get("/tasks/changes", headers=member, params={"since": cursors["member"]})
+    assert [t["task_id"] for t in r.json()["tombstones"]] == [child]
@@ -0,0 +1,81 @@
+import asyncio
+
+import orjson
+import pytest
+
+from app.services.task_events import TaskEventHub
+
+
+async def _register(client, email):
+    r = await client.post("/auth/register", json={"email": email, "password": "Member@1234"})
+    return r.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_committed_task_changes_reach_only_permitted_subscribers(
+    client, admin_headers, session_factory
+):
+    assignee_id = await _register(client, "a@x.com")
+    outsider_id = await _register(client, "o@x.com")
+
+    hub = TaskEventHub(session_factory.kw["bind"], session_factory)
+    async with (
+        hub.subscribe(user_id=assignee_id, is_admin=False, workspace_id=1) as assignee_q,
+        hub.subscribe(user_id=outsider_id, is_admin=False, workspace_id=1) as outsider_q,
+        hub.subscribe(user_id=assignee_id, is_admin=True, workspace_id=2) as other_workspace_q,
+    ):
+        await asyncio.sleep(0.3)  # let the LISTEN connection come up
+
+        r = await client.post(
+            "/tasks",
+            headers=admin_headers,
+            json={"title": "Live", "users": [{"user_id": assignee_id, "role": "ASSIGNEE"}]},
+        )
+        task_id = r.json()["id"]
+
+        event = orjson.loads(await asyncio.wait_for(assignee_q.get(), timeout=5))
+        assert event == {"op": "CREATED", "task_id": task_id, "actor_user_id": 1}
+        assert outsider_q.empty()
+        assert other_workspace_q.empty()
+
+    await hub.close()
+
+
+@pytest.mark.asyncio
+async def test_deleting_a_parent_publishes_every_deleted_subtask(
+    client, admin_headers, session_factory
+):
+    assignee_id = await _register(client, "a@x.com")
+    r = await client.post("/tasks", headers=admin_headers, json={"title": "parent"})
+    parent = r.json()["id"]
+    r = await client.post(
+        "/tasks",
+        headers=admin_headers,
+        json={
+            "title": "child",
+            "parent_task_id": parent,
+            "users": [{"user_id": assignee_id, "role": "ASSIGNEE"}],
+        },
+    )
+    child = r.json()["id"]
+
+    hub = TaskEventHub(session_factory.kw["bind"], session_factory)
+    async with (
+        hub.subscribe(user_id=1, is_admin=True, workspace_id=1) as admin_q,
+        hub.subscribe(user_id=assignee_id, is_admin=False, workspace_id=1) as assignee_q,
+    ):
+        await asyncio.sleep(0.3)  # let the LISTEN connection come up
+
+        r = await client.delete(f"/tasks/{parent}", headers=admin_headers)
+        assert r.status_code == 200, r.text
+
+        deleted = set()
+        for _ in range(2):
+            event = orjson.loads(await asyncio.wait_for(admin_q.get(), timeout=5))
+            deleted.add((event["op"], event["task_id"]))
+        assert deleted == {("DELETED", parent), ("DELETED", child)}
+        event = orjson.loads(await asyncio.wait_for(assignee_q.get(), timeout=5))
+        assert (event["op"], event["task_id"]) == ("DELETED", child)
+        assert assignee_q.empty()
+
+    await hub.close()
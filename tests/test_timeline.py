@@ -0,0 +1,96 @@
+import pytest
+
+from app.models.enums import UserRole
+from app.schemas.task import TaskUpdate
+from app.services.task_service import TaskService
+
+
+@pytest.mark.asyncio
+async def test_timeline_keyset_pagination(client, admin_headers):
+    for i in range(5):
+        r = await client.post("/tasks", headers=admin_headers, json={"title": f"T{i}"})
+        assert r.status_code == 200, r.text
+    r = await client.patch(
+        f"/tasks/{r.json()['id']}", headers=admin_headers, json={"status": "DONE"}
+    )
+    assert r.status_code == 200, r.text
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        r = await client.get("/timeline", headers=admin_headers, params=params)
+        assert r.status_code == 200, r.text
+        page = r.json()
+        assert len(page["items"]) <= 2
+        seen.extend(e["id"] for e in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == 6
+    assert len(set(seen)) == 6
+
+    r = await client.get("/timeline", headers=admin_headers, params={"action": "UPDATED"})
+    assert [e["action"] for e in r.json()["items"]] == ["UPDATED"]
+
+    r = await client.get("/timeline", headers=admin_headers, params={"cursor": "not-a-cursor"})
+    assert r.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_records_one_event_per_task(client, admin_headers, db_session):
+    ids = []
+    for i in range(3):
+        r = await client.post("/tasks", headers=admin_headers, json={"title": f"B{i}"})
+        ids.append(r.json()["id"])
+
+    r = await client.patch(
+        "/tasks/bulk",
+        headers=admin_headers,
+        json={"updates": [{"id": i, "patch": {"priority": "LOW"}} for i in ids]},
+    )
+    assert r.status_code == 200, r.text
+
+    r = await client.get("/timeline", headers=admin_headers, params={"action": "BULK_UPDATED"})
+    assert sorted(e["entity_id"] for e in r.json()["items"]) == sorted(ids)
+
+    # events are buffered on the session until commit; a rollback discards them
+    await TaskService(db_session, 1).bulk_update(
+        updates=[(ids[0], TaskUpdate(priority="HIGH"), None)], user_id=1, role=UserRole.ADMIN
+    )
+    assert db_session.info["pending_audit_events"]
+    await db_session.rollback()
+    assert "pending_audit_events" not in db_session.info
+    await db_session.commit()
+    r = await client.get("/timeline", headers=admin_headers, params={"action": "BULK_UPDATED"})
+    assert len(r.json()["items"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_task_history_is_paginated_and_permission_checked(client, admin_headers):
+    r = await client.post("/tasks", headers=admin_headers, json={"title": "H"})
+    task_id = r.json()["id"]
+    for status in ("IN_PROGRESS", "DONE"):
+        await client.patch(f"/tasks/{task_id}", headers=admin_headers, json={"status": status})
+    await client.post("/tasks", headers=admin_headers, json={"title": "other"})
+
+    r = await client.get(f"/tasks/{task_id}/history", headers=admin_headers, params={"limit": 2})
+    assert r.status_code == 200, r.text
+    page = r.json()
+    assert [e["action"] for e in page["items"]] == ["UPDATED", "UPDATED"]
+    r = await client.get(
+        f"/tasks/{task_id}/history",
+        headers=admin_headers,
+        params={"limit": 2, "cursor": page["next_cursor"]},
+    )
+    assert [e["action"] for e in r.json()["items"]] == ["CREATED"]
+    assert r.json()["next_cursor"] is None
+
+    await client.post("/auth/register", json={"email": "m@x.com", "password": "Member@1234"})
+    r = await client.post("/auth/token", data={"username": "m@x.com", "password": "Member@1234"})
+    member = {"Authorization": f"Bearer {r.json()['access_token']}"}
+    r = await client.get(f"/tasks/{task_id}/history", headers=member)
+    assert r.status_code == 403
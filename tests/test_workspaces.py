@@ -0,0 +1,110 @@
+import asyncpg
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.base import Base
+from app.db.session import shard_router
+from app.main import app
+from app.models.task import Task
+from app.models.user import User
+from benchmarks.seed import asyncpg_dsn
+from tests.conftest import TEST_DB_URL
+
+SHARD_DB_URL = TEST_DB_URL.rsplit("/", 1)[0] + "/taskapi_shard"
+
+
+async def _reset_shard_database() -> None:
+    conn = await asyncpg.connect(asyncpg_dsn(TEST_DB_URL))
+    try:
+        if not await conn.fetchval("SELECT 1 FROM pg_database WHERE datname = 'taskapi_shard'"):
+            await conn.execute("CREATE DATABASE taskapi_shard")
+    finally:
+        await conn.close()
+    engine = create_async_engine(SHARD_DB_URL)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    await engine.dispose()
+
+
+async def _count(session, model, workspace_id):
+    return (
+        await session.execute(select(func.count()).where(model.workspace_id == workspace_id))
+    ).scalar_one()
+
+
+async def test_workspaces_are_isolated(client, admin_headers):
+    r = await client.post(
+        "/tasks", headers=admin_headers, json={"title": "Workspace one", "tags": ["ops"]}
+    )
+    assert r.status_code == 200, r.text
+
+    # same email, different workspace: a separate account
+    ws2 = {"X-Workspace-Id": "2"}
+    r = await client.post(
+        "/auth/register",
+        headers=ws2,
+        json={"email": "admin@x.com", "password": "Other@1234", "role": "ADMIN"},
+    )
+    assert r.status_code == 200, r.text
+    r = await client.post(
+        "/auth/token", headers=ws2, data={"username": "admin@x.com", "password": "Other@1234"}
+    )
+    other = {"Authorization": f"Bearer {r.json()['access_token']}"}
+    # the old password belongs to workspace 1
+    r = await client.post(
+        "/auth/token", headers=ws2, data={"username": "admin@x.com", "password": "Admin@1234"}
+    )
+    assert r.status_code == 401
+
+    r = await client.post("/tasks/filter", headers=other, json={})
+    assert r.json()["total"] == 0
+    r = await client.get("/tasks/1", headers=other)
+    assert r.status_code == 404
+
+    r = await client.post("/tasks", headers=other, json={"title": "Workspace two", "tags": ["ops"]})
+    assert r.status_code == 200, r.text
+    r = await client.post("/tasks/filter", headers=admin_headers, json={"tag_names": ["ops"]})
+    assert [t["title"] for t in r.json()["items"]] == ["Workspace one"]
+
+    r = await client.post(
+        "/auth/register",
+        headers={"X-Workspace-Id": "x"},
+        json={"email": "y@x.com", "password": "Member@1234"},
+    )
+    assert r.status_code == 400
+
+
+async def test_mapped_workspace_lives_in_its_own_database(session_factory):
+    await _reset_shard_database()
+    shard_router.workspace_urls[2] = SHARD_DB_URL
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            ws2 = {"X-Workspace-Id": "2"}
+            r = await ac.post(
+                "/auth/register",
+                headers=ws2,
+                json={"email": "s@x.com", "password": "Shard@1234", "role": "ADMIN"},
+            )
+            assert r.status_code == 200, r.text
+            r = await ac.post(
+                "/auth/token", headers=ws2, data={"username": "s@x.com", "password": "Shard@1234"}
+            )
+            headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+            # the token carries the workspace, so no header is needed from here on
+            r = await ac.post("/tasks", headers=headers, json={"title": "Sharded"})
+            assert r.status_code == 200, r.text
+            r = await ac.post("/tasks/filter", headers=headers, json={})
+            assert [t["title"] for t in r.json()["items"]] == ["Sharded"]
+
+        async with shard_router.sessionmaker_for(2)() as session:
+            assert await _count(session, User, 2) == 1
+            assert await _count(session, Task, 2) == 1
+        async with session_factory() as session:
+            assert await _count(session, User, 2) == 0
+            assert await _count(session, Task, 2) == 0
+    finally:
+        shard_router.workspace_urls.pop(2, None)
+        await shard_router.dispose_shards()